@@ -1,4 +1,6 @@
 from __future__ import annotations
+import os
+from collections import OrderedDict
 from typing import Optional
 from a2_support import UserInterface, TextInterface
 from constants import *
@@ -172,8 +174,53 @@ class Water(Item):
         player.change_thirst(WATER_AMOUNT)
 
 
+class ItemStack:
+    """ A read-only, list-like view of the items of one type in an inventory.
+        Items of the same type are interchangeable, so a stack holds a count and
+        one instance of the type rather than an instance per item.
+    """
+    def __init__(self, item: Item, count: int) -> None:
+        """ Sets up a stack of count copies of item.
+
+        Parameters:
+            item: The instance which represents every item in the stack.
+            count: The number of items in the stack.
+        """
+        self._item = item
+        self._count = count
+
+    def __len__(self) -> int:
+        """ Returns the number of items in the stack. """
+        return self._count
+
+    def __getitem__(self, index: int) -> Item:
+        """ Returns the item at the given index, following list indexing. """
+        if not -self._count <= index < self._count:
+            raise IndexError('item stack index out of range')
+        return self._item
+
+    def __iter__(self):
+        """ Yields every item in the stack. """
+        for _ in range(self._count):
+            yield self._item
+
+    def __eq__(self, other: object) -> bool:
+        """ Returns True iff other holds the same items, in a stack or list. """
+        if isinstance(other, (ItemStack, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """ Returns a computer representation of this stack. The items share
+            one instance, so no position is shown for them.
+        """
+        return f'ItemStack({self._item.get_name()!r}, {self._count})'
+
+
 class Inventory:
-    """ A collection of items. """
+    """ A collection of items. Items are counted per type, so holding many
+        items of one type costs no more than holding one.
+    """
     def __init__(self, initial_items: Optional[list[Item]] = None) -> None:
         """ Sets up this inventory with the initial items (if provided). Else
             sets up a new empty inventory.
@@ -181,26 +228,39 @@ class Inventory:
         Parameters:
             initial_items: An optional list of initial items to put in inventory
         """
-        self._items = {}
+        self._counts = {} # Maps item names to the number held
+        self._items = {} # Maps item names to the instance used for their stack
         if initial_items is not None:
             for item in initial_items:
                 self.add_item(item)
     
-    def add_item(self, item: Item) -> None:
+    def add_item(self, item: Item, count: int = 1) -> None:
         """ Adds the given item to the inventory.
         
         Parameters:
             item: The item to add
+            count: The number of copies of the item to add
         """
-        items = self._items.get(item.get_name(), [])
-        items.append(item)
-        self._items[item.get_name()] = items
+        name = item.get_name()
+        if name not in self._counts:
+            self._counts[name] = 0
+            self._items[name] = item
+        self._counts[name] += count
 
-    def get_items(self) -> dict[str, list[Item]]:
+    def get_items(self) -> dict[str, ItemStack]:
         """ Returns the a dictionary mapping item names to the instances of the
             item with that name in the inventory.
         """
-        return self._items
+        return {name: ItemStack(self._items[name], count)
+                for name, count in self._counts.items()}
+
+    def count(self, item_name: str) -> int:
+        """ Returns the number of items with the given name in the inventory.
+
+        Parameters:
+            item_name: The name of the item to count.
+        """
+        return self._counts.get(item_name, 0)
 
     def remove_item(self, item_name: str) -> Optional['Item']:
         """ Removes one instance of the item with the given name from inventory,
@@ -213,24 +273,43 @@ class Inventory:
             The removed item, if one exists, else None.
 
         """
-        items = self._items.get(item_name)
-        if items is None or items == []:
+        item = self._items.get(item_name)
+        if item is not None and not self.spend(1, item_name):
             return None
+        return item
+
+    def spend(self, amount: int, item_name: str = 'Coin') -> bool:
+        """ Removes several items with the given name at once, if there are
+            enough of them.
+
+        Parameters:
+            amount: The number of items to remove.
+            item_name: The name of the items to remove.
+
+        Returns:
+            True iff the inventory held enough items, and they were removed.
+        """
+        if amount < 0:
+            raise ValueError(f'cannot spend a negative amount: {amount}')
+        if amount == 0:
+            return True
+        count = self._counts.get(item_name, 0)
+        if count < amount:
+            return False
+        if count == amount:
+            del self._counts[item_name]
+            del self._items[item_name]
         else:
-            item = items.pop(0)
-            if self._items.get(item_name) == []:
-                del self._items[item_name]
-            return item
+            self._counts[item_name] = count - amount
+        return True
     
     def __str__(self):
-        text = [f'{name}: {len(items)}' for name, items in self._items.items()]
+        text = [f'{name}: {count}' for name, count in self._counts.items()]
         return '\n'.join(text)
     
     def __repr__(self):
-        items = []
-        for name in self._items:
-            items.extend(self._items.get(name))
-        return f'Inventory(initial_items={items})'
+        # Items are only counted, so where each was picked up is not known
+        return f'Inventory(counts={self._counts})'
 
 
 class DynamicEntity(Entity):
@@ -329,6 +408,69 @@ class Player(DynamicEntity):
         return self._inventory
 
 
+class GameCache:
+    """ A least recently used cache of opened game files. Entries are keyed by
+        the file's path, modification time and size, so a file which changes
+        on disk is opened again rather than served stale.
+    """
+    def __init__(self, capacity: int) -> None:
+        """ Sets up an empty cache.
+
+        Parameters:
+            capacity: The maximum number of game files to keep open
+        """
+        self._capacity = capacity
+        self._entries = OrderedDict()
+
+    def get_levels(self, filename: str) -> 'LevelIndex':
+        """ Returns the index for a game file, opening it only if it is not
+            already cached.
+
+        Parameters:
+            filename: The path to the game file
+        """
+        stat = os.stat(filename)
+        key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+        levels = self._entries.get(key)
+        if levels is not None:
+            self._entries.move_to_end(key)
+            return levels
+
+        with open(filename, 'rb') as file:
+            magic = file.read(len(PACK_MAGIC))
+        if magic == PACK_MAGIC:
+            from levelpack import LevelPack
+            levels = LevelPack(filename)
+        else:
+            levels = LevelIndex(filename)
+        self._entries[key] = levels
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+        return levels
+
+    def clear(self) -> None:
+        """ Forgets every cached game file. """
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """ Returns the number of game files in the cache. """
+        return len(self._entries)
+
+
+def load_levels(filename: str) -> 'LevelIndex':
+    """ Opens a game file for lazy loading, in either the text format or the
+        binary level pack format. Game files are shared through a cache, so
+        opening the same unchanged file again does not read it again.
+
+    Parameters:
+        filename: The path to the game file
+
+    Returns:
+        An index which loads each level on demand
+    """
+    return GAME_CACHE.get_levels(filename)
+
+
 def load_game(filename: str) -> list['Level']:
     """ Reads a game file and creates a list of all the levels in order.
     
@@ -341,18 +483,119 @@ def load_game(filename: str) -> list['Level']:
     levels = []
     with open(filename, 'r') as file:
         for line in file:
+            # Rows may start or end with Empty tiles, so only strip the newline
+            row = line.rstrip('\r\n')
             line = line.strip()
             if line.startswith('Maze'):
                 _, _, dimensions = line[5:].partition(' - ')
                 dimensions = [int(item) for item in dimensions.split()]
                 levels.append(Level(dimensions))
             elif len(line) > 0 and len(levels) > 0:
-                levels[-1].add_row(line)
+                levels[-1].add_row(row)
     return levels
 
+
+class LevelIndex:
+    """ A lazily loaded game file. Only the byte offset and dimensions of each
+        level are read up front, from the 'Maze N - R C' headers, and a level
+        is parsed only when it is requested. Templates of the most recently
+        used levels are kept, so loading one of them again needs no parsing.
+    """
+    def __init__(self, filename: str) -> None:
+        """ Indexes the levels in a game file.
+
+        Parameters:
+            filename: The path to the game file
+        """
+        self._filename = filename
+        self._templates = OrderedDict()
+        self._offsets = []
+        self._dimensions = []
+        self._read_index()
+
+    def _read_index(self) -> None:
+        """ Scans the game file for level headers. """
+        with open(self._filename, 'rb') as file:
+            offset = 0
+            for line in file:
+                stripped = line.strip()
+                if stripped.startswith(b'Maze'):
+                    _, _, dimensions = stripped[5:].decode().partition(' - ')
+                    self._offsets.append(offset)
+                    self._dimensions.append(
+                        tuple(int(item) for item in dimensions.split())
+                    )
+                offset += len(line)
+            self._offsets.append(offset)
+
+    def get_filename(self) -> str:
+        """ Returns the path to the indexed game file. """
+        return self._filename
+
+    def get_dimensions(self, level_num: int) -> tuple[int, int]:
+        """ Returns the (#rows, #columns) of the level at the given index. """
+        return self._dimensions[level_num]
+
+    def get_template(self, level_num: int) -> 'LevelTemplate':
+        """ Returns the template of a single level, parsing the level only if
+            its template is not already cached.
+
+        Parameters:
+            level_num: The index of the level
+        """
+        template = self._templates.get(level_num)
+        if template is not None:
+            self._templates.move_to_end(level_num)
+            return template
+        template = self._parse_template(level_num)
+        self._templates[level_num] = template
+        if len(self._templates) > LEVEL_CACHE_SIZE:
+            self._templates.popitem(last=False)
+        return template
+
+    def load_level(self, level_num: int) -> 'Level':
+        """ Returns a new copy of a single level from the game file.
+
+        Parameters:
+            level_num: The index of the level to load
+
+        Returns:
+            A new Level instance for the requested level
+        """
+        return self.get_template(level_num).create_level()
+
+    def _parse_template(self, level_num: int) -> 'LevelTemplate':
+        """ Reads and parses a single level from the game file. """
+        if not 0 <= level_num < len(self._dimensions):
+            raise IndexError(f'level {level_num} is not in {self._filename}')
+        start, end = self._offsets[level_num], self._offsets[level_num + 1]
+        with open(self._filename, 'rb') as file:
+            file.seek(start)
+            lines = file.read(end - start).decode().splitlines()
+
+        level = Level(self._dimensions[level_num])
+        for line in lines[1:]:
+            # Rows may start or end with Empty tiles, so are not stripped
+            if len(line.strip()) > 0:
+                level.add_row(line)
+        return level.create_template()
+
+    def __len__(self) -> int:
+        """ Returns the number of levels in the game file. """
+        return len(self._dimensions)
+
+    def __repr__(self) -> str:
+        """ Returns a computer representation of this index. """
+        return f'LevelIndex({self._filename!r})'
+
 class Maze:
     """ Models a single map for one level. Only includes ground information,
-        excluding information about entities. """
+        excluding information about entities.
+
+        Tiles are stored compactly as one byte (the tile ID) per cell. Stateless
+        tiles are shared flyweight instances, while doors are stateful and are
+        kept in a side table keyed by position.
+    """
     TILES = {
         WALL: Wall,
         EMPTY: Empty,
@@ -360,6 +603,19 @@ class Maze:
         LAVA: Lava,
     }
 
+    # Shared instances of the stateless tiles, keyed by tile code
+    _FLYWEIGHTS = {
+        ord(tile_id): tile() for tile_id, tile in TILES.items()
+        if tile is not Door
+    }
+    _DOOR_CODE = ord(DOOR)
+
+    # Maps every byte to its tile code; entities are assumed to stand on Empty
+    _CODES = bytes(
+        code if chr(code) in (WALL, EMPTY, DOOR, LAVA) else ord(EMPTY)
+        for code in range(256)
+    )
+
     def __init__(self, dimensions: tuple[int, int]) -> None:
         """Sets up an empty maze of given dimensions.
         
@@ -367,11 +623,19 @@ class Maze:
             dimensions: (#rows, #columns)
         """
         self._dimensions = dimensions
-        self._tiles = []
+        self._width = dimensions[1]
+        self._num_rows = 0
+        self._grid = bytearray()
+        self._doors = {} # Maps positions to Door instances
+        self._unlocked = False
     
     def get_dimensions(self) -> tuple[int, int]:
         """ Returns the dimensions of this maze. """
         return self._dimensions
+
+    def get_num_rows(self) -> int:
+        """ Returns the number of rows which have been added to this maze. """
+        return self._num_rows
     
     def add_row(self, row: str) -> None:
         """ Adds a row of tiles to the maze.
@@ -379,21 +643,78 @@ class Maze:
         Parameters:
             row: String of the tile IDs from which to construct Tile instances.
         """
-        # If there is an entity in a spot, assume the ground underneath is empty
-        self._tiles.append([self.TILES.get(tile, Empty)() for tile in row])
+        if len(row) != self._width:
+            raise ValueError(f'row {self._num_rows} has {len(row)} tiles, '
+                             f'not {self._width}: {row!r}')
+        row_num = self._num_rows
+        codes = row.encode('latin-1', 'replace').translate(self._CODES)
+        col = codes.find(self._DOOR_CODE)
+        while col != -1:
+            self._doors[(row_num, col)] = Door()
+            col = codes.find(self._DOOR_CODE, col + 1)
+        self._grid.extend(codes)
+        self._num_rows += 1
+
+    def load_grid(
+        self,
+        grid: bytes | memoryview,
+        door_positions: list[tuple[int, int]]
+    ) -> None:
+        """ Fills the whole maze from a buffer of tile IDs in one step. The
+            buffer is kept as-is rather than copied, so it may be a view into a
+            memory-mapped file, and must not change afterwards.
+
+        Parameters:
+            grid: The tile ID of every cell as bytes, row by row.
+            door_positions: The (row, column) positions of the doors in grid.
+        """
+        self._grid = grid
+        self._num_rows = len(grid) // self._width
+        self._doors = {position: Door() for position in door_positions}
+
+    def _get_tile_at(self, row: int, col: int) -> Tile:
+        """ Returns the tile at the given in-range position. """
+        code = self._grid[row * self._width + col]
+        if code == self._DOOR_CODE:
+            return self._doors[(row, col)]
+        return self._FLYWEIGHTS[code]
 
     def get_tiles(self) -> list[list[Tile]]:
         """ Returns the Tile instances in this maze. Each element is a row of
             Tile instances in order.
+
+            The lists are built on every call, so code which runs every frame
+            should use get_tile or get_grid instead.
         """
-        return self._tiles
+        return [
+            [self._get_tile_at(row, col) for col in range(self._width)]
+            for row in range(self._num_rows)
+        ]
     
+    def get_grid(self) -> bytes | memoryview:
+        """ Returns the tile ID of every cell as bytes, row by row. Doors are
+            included whether or not they have been unlocked. A grid given to
+            load_grid is returned as-is rather than copied.
+        """
+        if isinstance(self._grid, bytearray):
+            return bytes(self._grid)
+        return self._grid
+
+    def get_door_positions(self) -> list[tuple[int, int]]:
+        """ Returns the (row, column) positions of every door in the maze. """
+        return list(self._doors)
+
+    def is_unlocked(self) -> bool:
+        """ Returns True iff the doors in this maze have been unlocked. """
+        return self._unlocked
+
     def unlock_door(self) -> None:
         """ Unlocks any doors that exist in the maze. """
-        for row in self._tiles:
-            for tile in row:
-                if isinstance(tile, Door):
-                    tile.unlock()
+        if self._unlocked:
+            return
+        for door in self._doors.values():
+            door.unlock()
+        self._unlocked = True
     
     def get_tile(self, position: tuple[int, int]) -> Tile:
         """ Returns the Tile instance at the given position.
@@ -402,12 +723,25 @@ class Maze:
             position: The (row, column) position from which to find the tile.
         """
         row, col = position
-        return self._tiles[row][col]
+        num_rows, width = self._num_rows, self._width
+        # Follow list indexing semantics, including negative indices
+        if not (-num_rows <= row < num_rows and -width <= col < width):
+            raise IndexError(f'maze position out of range: {position}')
+        row, col = row % num_rows, col % width
+        code = self._grid[row * width + col]
+        if code == self._DOOR_CODE:
+            return self._doors[(row, col)]
+        return self._FLYWEIGHTS[code]
     
     def __str__(self) -> str:
         """ Returns the string representation of this maze. """
+        grid = bytearray(self._grid)
+        for (row, col), door in self._doors.items():
+            grid[row * self._width + col] = ord(door.get_id())
+        text = grid.decode('latin-1')
         return '\n'.join(
-            [''.join([tile.get_id() for tile in row]) for row in self._tiles]
+            text[start:start + self._width]
+            for start in range(0, len(text), self._width)
         )
     
     def __repr__(self) -> str:
@@ -433,6 +767,7 @@ class Level:
         """
         self._maze = Maze(dimensions)
         self._items = {} # Maps positions to Item instances
+        self._num_coins = 0
         self._player_start = None
     
     def get_maze(self) -> Maze:
@@ -441,7 +776,7 @@ class Level:
     
     def _contains_coins(self) -> bool:
         """ Returns True iff there are any more coins left in this level. """
-        return any([item.get_id() == COIN for item in self._items.values()])
+        return self._num_coins > 0
 
     def attempt_unlock_door(self) -> None:
         """ Unlocks the doors in the maze if there are no coins remaining. """
@@ -454,7 +789,7 @@ class Level:
         Parameters:
             row: A string of tile or entity IDs.
         """
-        row_num = len(self._maze.get_tiles())
+        row_num = self._maze.get_num_rows()
         self._maze.add_row(row)
         for col_num, char in enumerate(row):
             self.add_entity((row_num, col_num), char)
@@ -467,7 +802,11 @@ class Level:
             entity_id: The ID of the entity to add.
         """
         if self.ENTITIES.get(entity_id) is not None:
+            if position in self._items:
+                self.remove_item(position)
             self._items[position] = self.ENTITIES.get(entity_id)(position)
+            if entity_id == COIN:
+                self._num_coins += 1
         if entity_id == PLAYER:
             self.add_player_start(position)
 
@@ -490,7 +829,8 @@ class Level:
         Parameters:
             position: the (row, column) position from which to delete an item.
         """
-        del self._items[position]
+        if self._items.pop(position).get_id() == COIN:
+            self._num_coins -= 1
     
     def add_player_start(self, position: tuple[int, int]) -> None:
         """ Adds the start position for the player in this level.
@@ -504,6 +844,16 @@ class Level:
         """ Returns the starting position of the player for this level. """
         return self._player_start
 
+    def create_template(self) -> 'LevelTemplate':
+        """ Returns an immutable template of this level in its current state. """
+        maze = self._maze
+        entities = tuple(
+            (position, item.get_id()) for position, item in self._items.items()
+        )
+        return LevelTemplate(self.get_dimensions(), maze.get_grid(),
+                             tuple(maze.get_door_positions()), entities,
+                             self._player_start)
+
     def __str__(self):
         """ Returns a string representation of this level. """
         maze, items, player_start = self._maze, self._items, self._player_start
@@ -514,6 +864,58 @@ class Level:
         return f"Level({self.get_dimensions()})"
 
 
+class LevelTemplate:
+    """ An immutable copy of a level as it was loaded, from which fresh copies
+        of the level can be made without reading the game file again.
+    """
+    def __init__(
+        self,
+        dimensions: tuple[int, int],
+        grid: bytes | memoryview,
+        door_positions: tuple[tuple[int, int], ...],
+        entities: tuple[tuple[tuple[int, int], str], ...],
+        player_start: Optional[tuple[int, int]]
+    ) -> None:
+        """ Sets up a template from the parts of a level. Every level is
+            parsed into a template before it is played, so a level which
+            cannot be played is rejected here with a ValueError.
+
+        Parameters:
+            dimensions: The (#rows, #columns) in the level's maze.
+            grid: The tile ID of every cell, row by row, as for Maze.load_grid.
+            door_positions: The (row, column) positions of the doors.
+            entities: The (position, ID) of every item in the level.
+            player_start: The starting position of the player.
+        """
+        rows, cols = dimensions
+        if len(grid) != rows * cols:
+            raise ValueError(f'a {rows}x{cols} level needs {rows * cols} '
+                             f'tiles, not {len(grid)}')
+        if player_start is None:
+            raise ValueError('level has no player')
+        self._dimensions = dimensions
+        self._grid = grid
+        self._door_positions = door_positions
+        self._entities = entities
+        self._player_start = player_start
+
+    def create_level(self) -> Level:
+        """ Returns a new copy of the level. The copy's maze shares this
+            template's tile grid, which is never modified, and has its own
+            doors and items.
+        """
+        level = Level(self._dimensions)
+        level.get_maze().load_grid(self._grid, self._door_positions)
+        for position, entity_id in self._entities:
+            level.add_entity(position, entity_id)
+        level.add_player_start(self._player_start)
+        return level
+
+    def __repr__(self) -> str:
+        """ Returns a computer representation of this template. """
+        return f"LevelTemplate({self._dimensions})"
+
+
 class Model:
     """ The overall model for a game of MazeRunner """
     def __init__(self, game_file: str) -> None:
@@ -522,9 +924,12 @@ class Model:
         Parameters:
             game_file: The file containing the levels for this game.
         """
-        self._levels = load_game(game_file)
+        self._levels = load_levels(game_file)
         self._level_num = 0
+        self._template = self._levels.get_template(0)
+        self._level = self._template.create_level()
         self._player = Player(self.get_level().get_player_start())
+        self._start_inventory = []
         self._won = False
         self._did_level_up = False
         self._num_moves = 0
@@ -546,7 +951,44 @@ class Model:
 
     def get_level(self) -> Level:
         """ Returns the current level. """
-        return self._levels[self._level_num]
+        return self._level
+
+    def get_levels(self) -> LevelIndex:
+        """ Returns the index of all levels in the game file. """
+        return self._levels
+
+    def get_level_num(self) -> int:
+        """ Returns the index of the current level. """
+        return self._level_num
+
+    def get_num_moves(self) -> int:
+        """ Returns the number of successful moves the player has made. """
+        return self._num_moves
+
+    def set_num_moves(self, num_moves: int) -> None:
+        """ Sets the number of successful moves the player has made, e.g.
+            when restoring a saved game.
+
+        Parameters:
+            num_moves: The number of moves already made
+        """
+        self._num_moves = num_moves
+
+    def get_start_inventory(self) -> list[tuple[Item, int]]:
+        """ Returns the (item, count) of each stack of items the player held
+            when the current level was started, which restart gives back.
+        """
+        return list(self._start_inventory)
+
+    def set_start_inventory(self, stacks: list[tuple[Item, int]]) -> None:
+        """ Sets the items restart gives back, e.g. when restoring a saved
+            game.
+
+        Parameters:
+            stacks: The (item, count) of each stack of items held when the
+                current level was started
+        """
+        self._start_inventory = list(stacks)
     
     def did_level_up(self) -> True:
         """ Returns True if the player just moved to the next level on the
@@ -562,9 +1004,48 @@ class Model:
         if self._level_num >= len(self._levels):
             self._won = True
         else:
-            self._player.set_position(self.get_level().get_player_start())
+            self._start_level(self._level_num)
             self._did_level_up = True
 
+    def _start_level(self, level_num: int) -> None:
+        """ Loads a fresh copy of the given level, and remembers its template
+            and the player's inventory so that the level can be restarted.
+
+        Parameters:
+            level_num: The index of the level to start
+        """
+        self._template = self._levels.get_template(level_num)
+        self._level = self._template.create_level()
+        self._player.set_position(self._level.get_player_start())
+        self._start_inventory = [
+            (items[0], len(items))
+            for items in self.get_player_inventory().get_items().values()
+        ]
+
+    def restart(self) -> None:
+        """ Restarts the current level from a fresh copy of it, with a new
+            player who holds the inventory the level was started with.
+        """
+        self._level = self._template.create_level()
+        self._player = Player(self._level.get_player_start())
+        for item, count in self._start_inventory:
+            self._player.get_inventory().add_item(item, count)
+        self._num_moves = 0
+        self._won = False
+        self._did_level_up = False
+
+    def goto_level(self, level_num: int) -> None:
+        """ Jumps straight to the start of the given level, discarding the
+            current one. The player's stats and inventory are kept.
+
+        Parameters:
+            level_num: The index of the level to play
+        """
+        self._start_level(level_num)
+        self._level_num = level_num
+        self._did_level_up = False
+        self._won = False
+
     def move_player(self, delta: tuple[int, int]) -> None:
         """ Tries to move the player by the requested amount. Levels up if the
             user finishes the maze, """
@@ -634,6 +1115,10 @@ class Model:
         return str(self)
 
 
+# Game files opened by load_levels
+GAME_CACHE = GameCache(GAME_CACHE_SIZE)
+
+
 class MazeRunner:
     """ Controller class for a game of MazeRunner """
     def __init__(self, game_file: str, view: UserInterface) -> None:
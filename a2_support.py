@@ -1,3 +1,6 @@
+import shutil
+import sys
+from typing import Optional, TextIO
 from constants import PLAYER
 
 class UserInterface:
@@ -55,7 +58,168 @@ class UserInterface:
         raise NotImplementedError
 
 class TextInterface(UserInterface):
-    """ A MazeRunner interface that uses ascii to present information. """
+    """ A MazeRunner interface that uses ascii to present information.
+
+        When the output is a terminal, only the characters which changed since
+        the last frame are rewritten, using ANSI cursor movement. The maze rows
+        on screen are mirrored in a byte buffer (one byte per cell, and a
+        newline after each row) which is built once per level and then patched
+        cell by cell, so the cost of a frame does not grow with the size of the
+        maze. Otherwise every frame is printed in full.
+    """
+    _ESCAPE = '\x1b['
+
+    def __init__(self, output: Optional[TextIO] = None) -> None:
+        """ Sets up an interface which writes to the given output.
+
+        Parameters:
+            output: The stream to draw to, defaulting to standard output
+        """
+        self._output = sys.stdout if output is None else output
+        self._buffer = bytearray() # The maze rows currently on the terminal
+        self._maze = None # The maze in the buffer, None if the screen is stale
+        self._item_positions = set() # Positions of the items in the buffer
+        self._player_position = None # Position of the player in the buffer
+        self._footer = [] # Lines below the maze currently on the terminal
+
+    def draw(
+        self,
+        maze: 'Maze',
+        items: dict[tuple[int, int], 'Item'],
+        player_position: tuple[int, int],
+        inventory: 'Inventory',
+        player_stats: tuple[int, int, int]
+    ) -> None:
+        footer = None
+        if self._output.isatty():
+            footer = self._build_footer(inventory, player_stats)
+        num_rows = maze.get_dimensions()[0]
+        # The terminal must not scroll, or the last frame's rows would move
+        if footer is None \
+                or num_rows + len(footer) + 3 > shutil.get_terminal_size().lines:
+            self._maze = None
+            super().draw(maze, items, player_position, inventory, player_stats)
+            return
+
+        escape = self._ESCAPE
+        changes = self._update_buffer(maze, items, player_position)
+        if changes is None:
+            # Clear the screen and draw everything from the top left
+            output = [f'{escape}H{escape}2J', self._buffer.decode('latin-1'),
+                      '\n'.join(footer), '\n']
+        else:
+            output = [f'{escape}{row + 1};{col + 1}H{char}'
+                      for row, col, char in changes]
+            output.extend(self._diff_lines(self._footer, footer, num_rows))
+        # Leave the cursor below the frame, clearing the previous prompt
+        output.append(f'{escape}{num_rows + len(footer) + 1};1H{escape}J')
+        self._output.write(''.join(output))
+        self._output.flush()
+        self._footer = footer
+
+    def _update_buffer(
+        self,
+        maze: 'Maze',
+        items: dict[tuple[int, int], 'Item'],
+        player_position: tuple[int, int]
+    ) -> Optional[list[tuple[int, int, str]]]:
+        """ Brings the buffer up to date with a frame.
+
+            Within a level, items are only removed by the player collecting
+            them, so the only cells which can change are the player's old and
+            new positions and the doors. Only those are rewritten. A new level,
+            or items changing any other way, rebuilds the whole buffer.
+
+        Returns:
+            The (row, column, character) of every cell which changed, or None
+            if the whole buffer was rebuilt.
+        """
+        num_cols = maze.get_dimensions()[1]
+        stride = num_cols + 1
+        buffer = self._buffer
+        changes = []
+        if maze is self._maze:
+            cells = [self._player_position, player_position]
+            cells.extend(maze.get_door_positions())
+            for position in cells[:2]:
+                if position in self._item_positions and position not in items:
+                    self._item_positions.remove(position)
+            if len(self._item_positions) != len(items):
+                self._maze = None
+
+        if maze is not self._maze:
+            grid = maze.get_grid()
+            rows = [bytes(grid[start:start + num_cols])
+                    for start in range(0, len(grid), num_cols)]
+            # Same-length assignment reuses the buffer's memory between levels
+            buffer[:] = b'\n'.join(rows) + b'\n'
+            self._maze = maze
+            self._item_positions = set(items)
+            cells = list(items)
+            cells.append(player_position)
+            cells.extend(maze.get_door_positions())
+            changes = None
+
+        for position in cells:
+            if position == player_position:
+                char = PLAYER
+            elif position in items:
+                char = items[position].get_id()
+            else:
+                char = maze.get_tile(position).get_id()
+            row, col = position
+            index = row * stride + col
+            if buffer[index] != ord(char):
+                buffer[index] = ord(char)
+                if changes is not None:
+                    changes.append((row, col, char))
+        self._player_position = player_position
+        return changes
+
+    def _build_footer(
+        self,
+        inventory: 'Inventory',
+        player_stats: tuple[int, int, int]
+    ) -> list[str]:
+        """ Returns the lines of text shown below the maze. """
+        text = str(inventory) if inventory.get_items() != {} else 'Empty'
+        lines = ['---------------', 'Inventory']
+        lines.extend(text.split('\n'))
+        lines.append('---------------')
+        hp, hunger, thirst = player_stats
+        lines.extend([f'HP: {hp}', f'hunger: {hunger}', f'thirst: {thirst}'])
+        return lines
+
+    def _diff_lines(
+        self,
+        old_lines: list[str],
+        lines: list[str],
+        first_row: int
+    ) -> list[str]:
+        """ Returns the terminal output which turns old_lines into lines, where
+            both start on the row with index first_row.
+        """
+        escape = self._ESCAPE
+        output = []
+        for index, line in enumerate(lines):
+            row = first_row + index
+            old = old_lines[index] if index < len(old_lines) else ''
+            if line == old:
+                continue
+            col, length = 0, len(line)
+            while col < length:
+                if col < len(old) and old[col] == line[col]:
+                    col += 1
+                    continue
+                end = col + 1
+                while end < length and (end >= len(old) or old[end] != line[end]):
+                    end += 1
+                output.append(f'{escape}{row + 1};{col + 1}H{line[col:end]}')
+                col = end
+            if length < len(old):
+                output.append(f'{escape}{row + 1};{length + 1}H{escape}K')
+        return output
+
     def _draw_level(
         self,
         maze: 'Maze',
@@ -72,12 +236,13 @@ class TextInterface(UserInterface):
                     row_str += items.get((row, col)).get_id()
                 else:
                     row_str += maze.get_tile((row, col)).get_id()
-            print(row_str)
+            print(row_str, file=self._output)
     
     def _draw_inventory(self, inventory: 'Inventory') -> None:
         text = str(inventory) if inventory.get_items() != {} else 'Empty'
-        print('---------------\nInventory\n' + text + '\n' + '---------------')
+        print('---------------\nInventory\n' + text + '\n' + '---------------',
+              file=self._output)
     
     def _draw_player_stats(self, player_stats: tuple[int, int, int]) -> None:
         hp, hunger, thirst = player_stats
-        print(f'HP: {hp}\nhunger: {hunger}\nthirst: {thirst}')
+        print(f'HP: {hp}\nhunger: {hunger}\nthirst: {thirst}', file=self._output)
@@ -1,17 +1,160 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
+from collections import OrderedDict, deque
 from typing import Callable
 from PIL import Image, ImageTk
 from a2_solution import *
 from a3_support import *
+from solver import DistanceFieldCache
+from snapshot import load_snapshot, save_snapshot
+from headless import HeadlessRunner
+from journal import Journal, recover
+from gameloop import GameLoop
+from instrumentation import MODEL_TARGETS, Instrumentation, get_rss
 from constants import GAME_FILE, TASK
 import time, os
 
 
 # Write your classes here
 
+class ImageCache:
+    """ A cache of images scaled to different sizes, shared by every view in the process.
+
+        Each image file is decoded once, each (image, size) pair is resized once, and the least recently used
+        scaled images are evicted once more than capacity of them are cached.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """ Sets up an empty cache.
+
+        Parameters:
+            capacity: The maximum number of scaled images to keep.
+        """
+        self._capacity = capacity
+        self._sources = {}  # Maps image names to the decoded image
+        self._scaled = OrderedDict()  # Maps (image name, size) to [scaled image, PhotoImage or None]
+        self._hits = 0
+        self._misses = 0
+
+    def _get_entry(self, name: str, size: tuple[int, int]) -> list:
+        """ Returns the cache entry for the image scaled to size, creating it on a miss.
+
+        Parameters:
+            name: The file name of the image in the images directory.
+            size: The (width, height) to scale the image to.
+        """
+        key = (name, tuple(size))
+        entry = self._scaled.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._scaled.move_to_end(key)
+            return entry
+
+        self._misses += 1
+        source = self._sources.get(name)
+        if source is None:
+            source = self._sources[name] = Image.open("images/" + name)
+            source.load()
+        entry = self._scaled[key] = [source.resize(key[1]), None]
+        if len(self._scaled) > self._capacity:
+            self._scaled.popitem(last=False)
+        return entry
+
+    def get_image(self, name: str, size: tuple[int, int]) -> Image.Image:
+        """ Returns the PIL image with the given name scaled to size.
+
+        Parameters:
+            name: The file name of the image in the images directory.
+            size: The (width, height) to scale the image to.
+        """
+        return self._get_entry(name, size)[0]
+
+    def get_photo(self, name: str, size: tuple[int, int]) -> ImageTk.PhotoImage:
+        """ Returns a tkinter image of the image with the given name scaled to size.
+
+        Parameters:
+            name: The file name of the image in the images directory.
+            size: The (width, height) to scale the image to.
+        """
+        entry = self._get_entry(name, size)
+        if entry[1] is None:
+            entry[1] = ImageTk.PhotoImage(entry[0])
+        return entry[1]
+
+    def get_hits(self) -> int:
+        """ Returns the number of lookups which found their scaled image in the cache. """
+        return self._hits
+
+    def get_misses(self) -> int:
+        """ Returns the number of lookups which had to resize an image. """
+        return self._misses
+
+    def __len__(self) -> int:
+        """ Returns the number of scaled images in the cache. """
+        return len(self._scaled)
+
+
 class LevelView(AbstractGrid):
-    """ Manages all the view elements for every level """
+    """ Manages all the view elements for every level.
+
+        Canvas items are retained between draws: the IDs of the items drawn for
+        each tile, item and the player are kept, so that redraw only has to
+        update the cells which changed since the previous frame.
+
+        Cells are never drawn smaller than MIN_CELL_SIZE. A maze too large to fit the view at that size is shown
+        through a camera which follows the player: the canvas is scrolled to keep the player in the middle of the
+        window, and only the cells within CAMERA_MARGIN cells of the window have canvas items, so drawing costs
+        depend on the size of the view rather than the maze.
+    """
+
+    _dimensions = None
+    _maze = None
+    _drawn = None  # The (top, left, bottom, right) cells with canvas items in camera mode, None when all are drawn
+    _window = None  # The (top, left, bottom, right) cells inside the window in camera mode
+
+    def __init__(self, master: Union[tk.Tk, tk.Frame], dimensions: tuple[int, int], size: tuple[int, int],
+                 **kwargs) -> None:
+        """ Sets up a new LevelView in the master frame with the given size.
+
+        Parameters:
+            master: The root tkinter frame
+            dimensions: The number of rows & columns of the maze
+            size: Max height & width of the maze
+        """
+        super().__init__(master, dimensions, size, **kwargs)
+        self.clear()
+
+    def set_dimensions(self, dimensions: tuple[int, int]) -> None:
+        """ Sets the dimensions of the grid. Changing them forces the next redraw to rebuild the level.
+
+        Parameters:
+            dimensions: (#rows, #columns)
+        """
+        if dimensions != self._dimensions:
+            self._maze = None
+        super().set_dimensions(dimensions)
+
+    def get_cell_size(self) -> tuple[int, int]:
+        """ Returns the size of the cells (width, height) in pixels, which is at least MIN_CELL_SIZE. """
+        cell_width, cell_height = super().get_cell_size()
+        return max(cell_width, MIN_CELL_SIZE), max(cell_height, MIN_CELL_SIZE)
+
+    def uses_camera(self) -> bool:
+        """ Returns True iff the maze is too large to fit the view, so only part of it is shown. """
+        rows, cols = self._dimensions
+        cell_width, cell_height = self.get_cell_size()
+        return cols * cell_width > self._size[0] or rows * cell_height > self._size[1]
+
+    def clear(self) -> None:
+        """ Clears the canvas and forgets all the retained canvas items. """
+        super().clear()
+        self._maze = None
+        self._drawn = None
+        self._window = None
+        self._tiles = {}  # Maps positions to (canvas ID, tile ID)
+        self._items = {}  # Maps positions to the canvas IDs drawn for the item
+        self._player = ()
+        self._player_pos = None
 
     def draw(self, tiles: list[list['Tile']], items: dict[tuple[int, int], 'Item'],
              player_pos: tuple[int, int]) -> None:
@@ -27,14 +170,181 @@ class LevelView(AbstractGrid):
         self._place_items(items)
         self._place_player(player_pos)
 
+    def redraw(self, maze: 'Maze', items: dict[tuple[int, int], 'Item'], player_pos: tuple[int, int]) -> None:
+        """ Updates only the cells which changed since the last redraw. The whole level is rebuilt if the maze
+            changed (e.g. on level up) or the view was resized.
+
+        Parameters:
+            maze: The Maze instance to draw.
+            items: A dictionary of Items with their position as keys.
+            player_pos: A tuple denoting the co-ordinates of the player.
+        """
+        if maze is not self._maze:
+            if self.uses_camera():
+                self._draw_camera(maze, items, player_pos)
+            else:
+                rows, cols = maze.get_dimensions()
+                self.clear()
+                self._draw_tile_range(maze, (0, 0, rows, cols))
+                self._place_items(items)
+                self._place_player(player_pos)
+                self.configure(scrollregion=(0, 0) + self._size)
+                self.xview_moveto(0)
+                self.yview_moveto(0)
+            self._maze = maze
+            return
+        self.delete("hint")
+
+        # Doors are the only tiles which can change during a level
+        for position in maze.get_door_positions():
+            if position in self._tiles:
+                self._update_tile(position, maze.get_tile(position))
+
+        if self._drawn is None:
+            for position in self._items.keys() - items.keys():
+                self.delete(*self._items.pop(position))
+            added = items.keys() - self._items.keys()
+            for position in added:
+                self._items[position] = self._create_item(position, items[position])
+            if added:
+                self.tag_raise("player")
+        else:
+            # Items are only ever removed during a level, so only the drawn ones need checking
+            for position in [position for position in self._items if position not in items]:
+                self.delete(*self._items.pop(position))
+
+        if player_pos != self._player_pos:
+            old_x, old_y = self.get_midpoint(self._player_pos)
+            new_x, new_y = self.get_midpoint(player_pos)
+            self.move("player", new_x - old_x, new_y - old_y)
+            self._player_pos = player_pos
+            if self._drawn is not None:
+                self._follow(maze, items, player_pos)
+
+    def _draw_camera(self, maze: 'Maze', items: dict[tuple[int, int], 'Item'], player_pos: tuple[int, int]) -> None:
+        """ Starts showing a new level through the camera, centred on the player.
+
+        Parameters:
+            maze: The Maze instance to draw.
+            items: A dictionary of Items with their position as keys.
+            player_pos: A tuple denoting the co-ordinates of the player.
+        """
+        self.clear()
+        rows, cols = self._dimensions
+        cell_width, cell_height = self.get_cell_size()
+        self.configure(scrollregion=(0, 0, cols * cell_width, rows * cell_height))
+        self._drawn = (0, 0, 0, 0)
+        self._place_player(player_pos)
+        self._follow(maze, items, player_pos)
+
+    def _follow(self, maze: 'Maze', items: dict[tuple[int, int], 'Item'], player_pos: tuple[int, int]) -> None:
+        """ Scrolls the camera to the player, drawing the cells around the window again once it has moved past
+            the margin.
+
+        Parameters:
+            maze: The Maze instance being drawn.
+            items: A dictionary of Items with their position as keys.
+            player_pos: A tuple denoting the co-ordinates of the player.
+        """
+        rows, cols = self._dimensions
+        cell_width, cell_height = self.get_cell_size()
+        view_rows = min(rows, -(-self._size[1] // cell_height))
+        view_cols = min(cols, -(-self._size[0] // cell_width))
+        top = min(max(player_pos[0] - view_rows // 2, 0), rows - view_rows)
+        left = min(max(player_pos[1] - view_cols // 2, 0), cols - view_cols)
+        window = (top, left, top + view_rows, left + view_cols)
+        if window == self._window:
+            return
+        self.xview_moveto(left / cols)
+        self.yview_moveto(top / rows)
+        self._window = window
+
+        drawn_top, drawn_left, drawn_bottom, drawn_right = self._drawn
+        if not (drawn_top <= top and drawn_left <= left
+                and window[2] <= drawn_bottom and window[3] <= drawn_right):
+            self._draw_range(maze, items, (max(top - CAMERA_MARGIN, 0), max(left - CAMERA_MARGIN, 0),
+                                           min(window[2] + CAMERA_MARGIN, rows),
+                                           min(window[3] + CAMERA_MARGIN, cols)))
+
+    def _draw_range(self, maze: 'Maze', items: dict[tuple[int, int], 'Item'],
+                    drawn: tuple[int, int, int, int]) -> None:
+        """ Makes the canvas items match the given range of cells, deleting those of cells outside it and creating
+            those of cells inside it which have none yet.
+
+        Parameters:
+            maze: The Maze instance being drawn.
+            items: A dictionary of Items with their position as keys.
+            drawn: The (top, left, bottom, right) cells to draw, with bottom and right excluded.
+        """
+        top, left, bottom, right = drawn
+        for position in [position for position in self._items
+                         if not (top <= position[0] < bottom and left <= position[1] < right)]:
+            self.delete(*self._items.pop(position))
+        self._draw_tile_range(maze, drawn)
+        for row in range(top, bottom):
+            for col in range(left, right):
+                if (row, col) in items and (row, col) not in self._items:
+                    self._items[(row, col)] = self._create_item((row, col), items[(row, col)])
+        self.tag_raise("item")
+        self.tag_raise("player")
+        self._drawn = drawn
+
+    def _draw_tile_range(self, maze: 'Maze', drawn: tuple[int, int, int, int]) -> None:
+        """ Makes the tile canvas items match the given range of cells.
+
+        Parameters:
+            maze: The Maze instance being drawn.
+            drawn: The (top, left, bottom, right) cells to draw, with bottom and right excluded.
+        """
+        top, left, bottom, right = drawn
+        for position in [position for position in self._tiles
+                         if not (top <= position[0] < bottom and left <= position[1] < right)]:
+            self.delete(self._tiles.pop(position)[0])
+        for row in range(top, bottom):
+            for col in range(left, right):
+                if (row, col) not in self._tiles:
+                    tile_id = maze.get_tile((row, col)).get_id()
+                    self._tiles[(row, col)] = (self._create_tile((row, col), tile_id), tile_id)
+
+    def get_position(self, pixel: tuple[int, int]) -> tuple[int, int]:
+        """ Returns the (row, column) position of the cell containing the given pixel.
+
+        Parameters:
+            pixel: The (x, y) pixel position on the canvas.
+        """
+        cell_width, cell_height = self.get_cell_size()
+        # Event positions are relative to the window, which may be scrolled
+        x, y = int(self.canvasx(pixel[0])), int(self.canvasy(pixel[1]))
+        return y // cell_height, x // cell_width
+
+    def draw_path(self, positions: list[tuple[int, int]]) -> None:
+        """ Draws a path through the given cells above the level, until the next redraw.
+
+        Parameters:
+            positions: The (row, column) positions along the path, in order.
+        """
+        self.delete("hint")
+        if len(positions) > 1:
+            points = [self.get_midpoint(position) for position in positions]
+            self.create_line(points, fill=HINT_COLOUR, width=4, arrow=tk.LAST, tags="hint")
+
     def _place_player(self, player_pos: tuple[int, int]) -> None:
         """ Assigns the player to current position in the Maze.
 
         Parameters:
             player_pos: A tuple denoting the co-ordinates of the player.
         """
-        self.create_oval(self.get_bbox(player_pos), fill=ENTITY_COLOURS[PLAYER])
-        self.create_text(self.get_midpoint(player_pos), font=TEXT_FONT, text=PLAYER)
+        self._player = self._create_player(player_pos)
+        self._player_pos = player_pos
+
+    def _create_player(self, player_pos: tuple[int, int]) -> tuple[int, ...]:
+        """ Creates the canvas items for the player and returns their IDs.
+
+        Parameters:
+            player_pos: A tuple denoting the co-ordinates of the player.
+        """
+        return (self.create_oval(self.get_bbox(player_pos), fill=ENTITY_COLOURS[PLAYER], tags="player"),
+                self.create_text(self.get_midpoint(player_pos), font=TEXT_FONT, text=PLAYER, tags="player"))
 
     def _place_items(self, items: dict[tuple[int, int], 'Item']) -> None:
         """ Assigns all the available items to their respective position in the Maze.
@@ -42,18 +352,18 @@ class LevelView(AbstractGrid):
         Parameters:
             items: A dictionary of Items with their position as keys.
         """
-        for item in items:
-            self.create_oval(self.get_bbox(items[item].get_position()), fill=ENTITY_COLOURS[items[item].get_id()])
-            if items[item].get_id() == COIN:
-                self.create_text(self.get_midpoint(items[item].get_position()), font=TEXT_FONT, text=COIN)
-            elif items[item].get_id() == POTION:
-                self.create_text(self.get_midpoint(items[item].get_position()), font=TEXT_FONT, text=POTION)
-            elif items[item].get_id() == HONEY:
-                self.create_text(self.get_midpoint(items[item].get_position()), font=TEXT_FONT, text=HONEY)
-            elif items[item].get_id() == APPLE:
-                self.create_text(self.get_midpoint(items[item].get_position()), font=TEXT_FONT, text=APPLE)
-            elif items[item].get_id() == WATER:
-                self.create_text(self.get_midpoint(items[item].get_position()), font=TEXT_FONT, text=WATER)
+        for position, item in items.items():
+            self._items[position] = self._create_item(position, item)
+
+    def _create_item(self, position: tuple[int, int], item: 'Item') -> tuple[int, ...]:
+        """ Creates the canvas items for an item and returns their IDs.
+
+        Parameters:
+            position: The (row, column) position of the item.
+            item: The item to draw.
+        """
+        return (self.create_oval(self.get_bbox(position), fill=ENTITY_COLOURS[item.get_id()], tags="item"),
+                self.create_text(self.get_midpoint(position), font=TEXT_FONT, text=item.get_id(), tags="item"))
 
     def _draw_tiles(self, tiles: list[list['Tile']]) -> None:
         """ Assigns all the tiles to their respective position in the Maze.
@@ -61,24 +371,51 @@ class LevelView(AbstractGrid):
         Parameters:
             tiles: A list of lists of Tiles denoting the whole Maze.
         """
-        y = -1
-        for y_tile in tiles:
-            x = 0
-            y += 1
-            for x_tile in y_tile:
-                if x_tile.get_id() == LAVA:
-                    self.create_rectangle(self.get_bbox((y, x)), fill=TILE_COLOURS[LAVA])
-                elif x_tile.get_id() == WALL:
-                    self.create_rectangle(self.get_bbox((y, x)), fill=TILE_COLOURS[WALL])
-                elif x_tile.get_id() == DOOR:
-                    self.create_rectangle(self.get_bbox((y, x)), fill=TILE_COLOURS[DOOR])
-                elif x_tile.get_id() == EMPTY:
-                    self.create_rectangle(self.get_bbox((y, x)), fill=TILE_COLOURS[EMPTY])
-                x += 1
+        for y, row in enumerate(tiles):
+            for x, tile in enumerate(row):
+                tile_id = tile.get_id()
+                self._tiles[(y, x)] = (self._create_tile((y, x), tile_id), tile_id)
+
+    def _update_tile(self, position: tuple[int, int], tile: 'Tile') -> None:
+        """ Updates the canvas item drawn for the tile at position if the tile's appearance changed.
+
+        Parameters:
+            position: The (row, column) position of the tile.
+            tile: The tile currently at that position.
+        """
+        canvas_id, tile_id = self._tiles[position]
+        if tile.get_id() != tile_id:
+            self._configure_tile(canvas_id, tile.get_id())
+            self._tiles[position] = (canvas_id, tile.get_id())
+
+    def _create_tile(self, position: tuple[int, int], tile_id: str) -> int:
+        """ Creates the canvas item for a tile and returns its ID.
+
+        Parameters:
+            position: The (row, column) position of the tile.
+            tile_id: The ID of the tile to draw.
+        """
+        return self.create_rectangle(self.get_bbox(position), fill=TILE_COLOURS[tile_id], tags="tile")
+
+    def _configure_tile(self, canvas_id: int, tile_id: str) -> None:
+        """ Changes an existing tile canvas item to show a different tile.
+
+        Parameters:
+            canvas_id: The ID of the canvas item drawn for the tile.
+            tile_id: The ID of the tile to show.
+        """
+        self.itemconfig(canvas_id, fill=TILE_COLOURS[tile_id])
 
 
 class ImageLevelView(LevelView):
-    """ A child class of LevelView, which also manager view object of each level with Images """
+    """ A child class of LevelView, which also manager view object of each level with Images.
+
+        The tiles are composited into a single background image once per level, shown as one canvas item below the
+        "item" and "player" layers. Tiles which change later (unlocked doors) are patched with their own canvas item.
+    """
+
+    LEVEL_IMAGES = dict(TILE_IMAGES, **{entity_id: ENTITY_IMAGES[entity_id]
+                                        for entity_id in (COIN, POTION, HONEY, APPLE, WATER, PLAYER)})
 
     def __init__(self, master: Union[tk.Tk, tk.Frame], dimensions: tuple[int, int], size: tuple[int, int],
                  **kwargs) -> None:
@@ -94,77 +431,115 @@ class ImageLevelView(LevelView):
 
     def update_images(self) -> None:
         """ Reinitialize all the images & resizes according to the given dimension """
-        self._lavaImage = ImageTk.PhotoImage(Image.open("images/" + TILE_IMAGES[LAVA]).resize(self.get_cell_size()))
-        self._wallImage = ImageTk.PhotoImage(Image.open("images/" + TILE_IMAGES[WALL]).resize(self.get_cell_size()))
-        self._doorImage = ImageTk.PhotoImage(Image.open("images/" + TILE_IMAGES[DOOR]).resize(self.get_cell_size()))
-        self._emptyImage = ImageTk.PhotoImage(Image.open("images/" + TILE_IMAGES[EMPTY]).resize(self.get_cell_size()))
-        self._coinImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[COIN]).resize(self.get_cell_size()))
-        self._appleImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[APPLE]).resize(self.get_cell_size()))
-        self._honeyImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[HONEY]).resize(self.get_cell_size()))
-        self._waterImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[WATER]).resize(self.get_cell_size()))
-        self._potionImage = ImageTk.PhotoImage(
-            Image.open("images/" + ENTITY_IMAGES[POTION]).resize(self.get_cell_size()))
-        self._playerImage = ImageTk.PhotoImage(
-            Image.open("images/" + ENTITY_IMAGES[PLAYER]).resize(self.get_cell_size()))
+        self._images = {image_id: IMAGE_CACHE.get_photo(image, self.get_cell_size())
+                        for image_id, image in self.LEVEL_IMAGES.items()}
+        # Existing canvas items still show the old images, so rebuild on the next redraw
+        self._maze = None
 
-    def _draw_tiles(self, tiles: list[list['Tile']]) -> None:
-        """ Assigns all the tiles at their respective position with images in the Maze.
+    def _create_photo(self, image: Image.Image) -> ImageTk.PhotoImage:
+        """ Returns a Tk image showing the given image.
 
         Parameters:
-            tiles: A list of lists of Tiles denoting the whole Maze.
+            image: The composited image to show.
         """
-        y = -1
-        for y_tile in tiles:
-            x = 0
-            y += 1
-            for x_tile in y_tile:
-                if x_tile.get_id() == LAVA:
-                    self.create_image(self.get_midpoint((y, x))[0], self.get_midpoint((y, x))[1], anchor="center",
-                                      image=self._lavaImage)
-                elif x_tile.get_id() == WALL:
-                    self.create_image(self.get_midpoint((y, x))[0], self.get_midpoint((y, x))[1], anchor="center",
-                                      image=self._wallImage)
-                elif x_tile.get_id() == DOOR:
-                    self.create_image(self.get_midpoint((y, x))[0], self.get_midpoint((y, x))[1], anchor="center",
-                                      image=self._doorImage)
-                elif x_tile.get_id() == EMPTY:
-                    self.create_image(self.get_midpoint((y, x))[0], self.get_midpoint((y, x))[1], anchor="center",
-                                      image=self._emptyImage)
-                x += 1
+        return ImageTk.PhotoImage(image)
 
-    def _place_items(self, items: dict[tuple[int, int], 'Item']) -> None:
-        """ Assigns all the available items at their respective position with images in the Maze.
+    def _draw_tiles(self, tiles: list[list['Tile']], origin: tuple[int, int] = (0, 0)) -> None:
+        """ Composites all the tiles into one background image and draws it in the Maze.
 
         Parameters:
-            items: A dictionary of Items with their position as keys.
+            tiles: A list of lists of Tiles denoting the whole Maze, or the part of it starting at origin.
+            origin: The (row, column) position of the first tile.
         """
-        for item in items:
-            if items[item].get_id() == COIN:
-                self.create_image(self.get_midpoint(items[item].get_position()), anchor="center", image=self._coinImage)
-            elif items[item].get_id() == POTION:
-                self.create_image(self.get_midpoint(items[item].get_position()), anchor="center",
-                                  image=self._potionImage)
-            elif items[item].get_id() == HONEY:
-                self.create_image(self.get_midpoint(items[item].get_position()), anchor="center",
-                                  image=self._honeyImage)
-            elif items[item].get_id() == APPLE:
-                self.create_image(self.get_midpoint(items[item].get_position()), anchor="center",
-                                  image=self._appleImage)
-            elif items[item].get_id() == WATER:
-                self.create_image(self.get_midpoint(items[item].get_position()), anchor="center",
-                                  image=self._waterImage)
+        cell_width, cell_height = self.get_cell_size()
+        top, left = origin
+        background = Image.new("RGBA", (cell_width * len(tiles[0]) if tiles else 0, cell_height * len(tiles)))
+        images = {tile_id: IMAGE_CACHE.get_image(image, (cell_width, cell_height))
+                  for tile_id, image in TILE_IMAGES.items()}
+        for y, row in enumerate(tiles):
+            for x, tile in enumerate(row):
+                background.paste(images[tile.get_id()], (x * cell_width, y * cell_height))
+                if isinstance(tile, Door):
+                    # Only doors can change, so only they need to be tracked for patching
+                    self._tiles[(top + y, left + x)] = (None, tile.get_id())
+        self._background = self._create_photo(background)
+        self.create_image(left * cell_width, top * cell_height, anchor="nw", image=self._background,
+                          tags="background")
+
+    def _draw_tile_range(self, maze: 'Maze', drawn: tuple[int, int, int, int]) -> None:
+        """ Composites the tiles in the given range of cells into a new background image.
 
-    def _place_player(self, player_pos: tuple[int, int]) -> None:
-        """ Assigns the player at the given position with image.
+        Parameters:
+            maze: The Maze instance being drawn.
+            drawn: The (top, left, bottom, right) cells to draw, with bottom and right excluded.
+        """
+        top, left, bottom, right = drawn
+        self.delete("background", "tile")
+        self._tiles = {}
+        self._draw_tiles([[maze.get_tile((row, col)) for col in range(left, right)] for row in range(top, bottom)],
+                         (top, left))
+
+    def _update_tile(self, position: tuple[int, int], tile: 'Tile') -> None:
+        """ Patches the background with a canvas item for the tile at position if its appearance changed.
+
+        Parameters:
+            position: The (row, column) position of the tile.
+            tile: The tile currently at that position.
+        """
+        canvas_id, tile_id = self._tiles[position]
+        if tile.get_id() == tile_id:
+            return
+        if canvas_id is None:
+            canvas_id = self._create_tile(position, tile.get_id())
+            self.tag_raise(canvas_id, "background")
+        else:
+            self._configure_tile(canvas_id, tile.get_id())
+        self._tiles[position] = (canvas_id, tile.get_id())
+
+    def _create_tile(self, position: tuple[int, int], tile_id: str) -> int:
+        """ Creates the image canvas item for a tile and returns its ID.
+
+        Parameters:
+            position: The (row, column) position of the tile.
+            tile_id: The ID of the tile to draw.
+        """
+        return self.create_image(self.get_midpoint(position), anchor="center", image=self._images[tile_id],
+                                 tags="tile")
+
+    def _configure_tile(self, canvas_id: int, tile_id: str) -> None:
+        """ Changes an existing tile canvas item to show a different tile image.
+
+        Parameters:
+            canvas_id: The ID of the canvas item drawn for the tile.
+            tile_id: The ID of the tile to show.
+        """
+        self.itemconfig(canvas_id, image=self._images[tile_id])
+
+    def _create_item(self, position: tuple[int, int], item: 'Item') -> tuple[int, ...]:
+        """ Creates the image canvas item for an item and returns its ID.
+
+        Parameters:
+            position: The (row, column) position of the item.
+            item: The item to draw.
+        """
+        return self.create_image(self.get_midpoint(position), anchor="center", image=self._images[item.get_id()],
+                                 tags="item"),
+
+    def _create_player(self, player_pos: tuple[int, int]) -> tuple[int, ...]:
+        """ Creates the image canvas item for the player and returns its ID.
 
          Parameters:
             player_pos: A tuple denoting the players current position
          """
-        self.create_image(self.get_midpoint(player_pos), anchor="center", image=self._playerImage)
+        return self.create_image(self.get_midpoint(player_pos), anchor="center", image=self._images[PLAYER],
+                                 tags="player"),
 
 
 class StatsView(AbstractGrid):
-    """ This view class is to show the current stats of the player. """
+    """ This view class is to show the current stats of the player.
+
+        The value texts are created once and updated in place, and only when the value they show has changed.
+    """
 
     def __init__(self, master: Union[tk.Tk, tk.Frame], width: int) -> None:
         """  Sets up a new StatsView in the master frame with the given width.
@@ -178,7 +553,19 @@ class StatsView(AbstractGrid):
         self.create_text(self.get_midpoint((0, 1)), font=TEXT_FONT, text="Hunger")
         self.create_text(self.get_midpoint((0, 2)), font=TEXT_FONT, text="Thirst")
         self.create_text(self.get_midpoint((0, 3)), font=TEXT_FONT, text="Coins")
-        self._values = []
+        self._values = [self.create_text(self.get_midpoint((1, col)), font=TEXT_FONT, text="") for col in range(4)]
+        self._shown = [""] * len(self._values)  # The text currently shown by each value
+
+    def _set_value(self, index: int, text: str) -> None:
+        """ Shows text in the value at the given index, if it is not already shown there.
+
+        Parameters:
+            index: The column of the value (0: HP, 1: hunger, 2: thirst, 3: coins)
+            text: The text to show
+        """
+        if self._shown[index] != text:
+            self.itemconfig(self._values[index], text=text)
+            self._shown[index] = text
 
     def draw_stats(self, stats: tuple[int, int, int]) -> None:
         """ Draws the player's stats (hp, hunger, thirst).
@@ -186,9 +573,8 @@ class StatsView(AbstractGrid):
         Parameters:
             stats: A tuple consisting of the player stats
         """
-        self._values.append(self.create_text(self.get_midpoint((1, 0)), font=TEXT_FONT, text=str(stats[0])))
-        self._values.append(self.create_text(self.get_midpoint((1, 1)), font=TEXT_FONT, text=str(stats[1])))
-        self._values.append(self.create_text(self.get_midpoint((1, 2)), font=TEXT_FONT, text=str(stats[2])))
+        for index, stat in enumerate(stats):
+            self._set_value(index, str(stat))
 
     def draw_coins(self, coin_count: int) -> None:
         """ Draws the number of coins.
@@ -196,17 +582,21 @@ class StatsView(AbstractGrid):
         Parameters:
             coin_count: Denotes number of coins the player has.
         """
-        self._values.append(self.create_text(self.get_midpoint((1, 3)), font=TEXT_FONT, text=str(coin_count)))
+        self._set_value(3, str(coin_count))
 
     def clear(self) -> None:
         """ Clears all the player stat values """
-        for value in self._values:
-            self.itemconfig(value, text="")
+        for index in range(len(self._values)):
+            self._set_value(index, "")
 
 
 class InventoryView(tk.Frame):
     """ InventoryView is a view class which inherits from tk.Frame, and displays the items the player
-        has in their inventory """
+        has in their inventory.
+
+        A label is kept for each item type which has been held, along with the count it shows. Drawing compares
+        those counts with the inventory and only updates the labels which changed, appeared or ran out.
+    """
 
     _callback = None
 
@@ -217,12 +607,14 @@ class InventoryView(tk.Frame):
         """
         super().__init__(master, width=INVENTORY_WIDTH, **kw)
         tk.Label(self, text="Inventory", font=HEADING_FONT + ("bold",)).pack(fill=tk.X)
-        self._labels = {}
+        self._labels = {}  # Maps item names to their label
+        self._shown = {}  # Maps the names of the items on display to the count shown
 
     def clear(self) -> None:
         """ Removes all the items from inventory """
-        # for label in self._labels.values():
-        #     label.pack_forget()
+        for name in self._shown:
+            self._labels[name].pack_forget()
+        self._shown.clear()
 
     def set_click_callback(self, callback: Callable[[str], None]) -> None:
         """ Assigns the function to be called when a label is clicked.
@@ -232,35 +624,95 @@ class InventoryView(tk.Frame):
         """
         self._callback = callback
 
+    def _click(self, name: str) -> None:
+        """ Passes a click on the label of the given item to the click callback, if there is one.
+
+        Parameters:
+            name: Name of the clicked item
+        """
+        if self._callback:
+            self._callback(name)
+
     def _draw_item(self, name: str, num: int, colour: str) -> None:
-        """ Draws and binds a tk.Label with mouse click in the InventoryView frame.
+        """ Shows the number of an item held, creating and binding its tk.Label the first time it is held.
 
         Parameters:
             name: Name of the item
             num: Number of the item available in players inventory
             colour: Background colour of the label for the given item
         """
-        if name in self._labels:
-            self._labels[name].config(text=name + ": " + str(num))
-        else:
-            self._labels[name] = tk.Label(self, text=name + ": " + str(num), bg=colour, font=TEXT_FONT,
-                                          relief=tk.RAISED,
-                                          borderwidth=1)
-        self._labels[name].pack(side=tk.TOP, fill=tk.X)
-        if not self._callback:
-            return
-        self._labels[name].bind("<Button-1>", lambda event: self._callback(name))
+        if name not in self._labels:
+            self._labels[name] = tk.Label(self, bg=colour, font=TEXT_FONT, relief=tk.RAISED, borderwidth=1)
+            self._labels[name].bind("<Button-1>", lambda event: self._click(name))
+        if name not in self._shown:
+            self._labels[name].pack(side=tk.TOP, fill=tk.X)
+        self._labels[name].config(text=name + ": " + str(num))
+        self._shown[name] = num
 
     def draw_inventory(self, inventory: 'Inventory') -> None:
-        """ Draws any non-coin item from the players inventory to InventoryView
+        """ Draws any non-coin item from the players inventory to InventoryView, touching only the rows whose
+            counts changed.
 
         Parameters:
             inventory: The instance of the players inventory
         """
-        for items in inventory.get_items():
-            if items != "Coin" and len(inventory.get_items()[items]) > 0:
-                self._draw_item(items, len(inventory.get_items()[items]),
-                                ENTITY_COLOURS[inventory.get_items()[items][0].get_id()])
+        items = inventory.get_items()
+        for name in [name for name in self._shown if not items.get(name)]:
+            self._labels[name].pack_forget()
+            del self._shown[name]
+        for name, stack in items.items():
+            if name != "Coin" and stack and self._shown.get(name) != len(stack):
+                self._draw_item(name, len(stack), ENTITY_COLOURS[stack[0].get_id()])
+
+
+class PerformanceOverlay(tk.Label):
+    """ A panel over the top left of the window which shows the frame times, canvas item count and memory use
+        while the game is instrumented. """
+
+    def __init__(self, master: Union[tk.Tk, tk.Frame], instrumentation: Instrumentation,
+                 canvases: list[tk.Canvas]) -> None:
+        """ Creates a hidden overlay in master.
+
+        Parameters:
+            master: the root master frame.
+            instrumentation: The timing hooks whose frame times are shown.
+            canvases: The canvases whose items are counted.
+        """
+        super().__init__(master, font=OVERLAY_FONT, justify=tk.LEFT, bg="black", fg="white")
+        self._instrumentation = instrumentation
+        self._canvases = canvases
+        self._since_update = 0.0
+        self._text = None
+
+    def show(self) -> None:
+        """ Shows the overlay, updating it on the next tick. """
+        self._since_update = OVERLAY_INTERVAL
+        self.place(x=0, y=0)
+        self.lift()
+
+    def hide(self) -> None:
+        """ Hides the overlay. """
+        self.place_forget()
+
+    def update_stats(self, step: float) -> None:
+        """ Updates the shown figures every OVERLAY_INTERVAL seconds. Subscribed to the game loop's simulation tick.
+
+        Parameters:
+            step: The length of the simulation step in seconds
+        """
+        self._since_update += step
+        if self._since_update < OVERLAY_INTERVAL:
+            return
+        self._since_update = 0.0
+        frame_times = [self._instrumentation.get_percentile("GameLoop._render", percent) for percent in (50, 99)]
+        p50, p99 = ("-" if time_taken is None else f"{time_taken * 1000:.1f} ms" for time_taken in frame_times)
+        rss = get_rss()
+        text = f"frame p50 {p50} p99 {p99}\n" \
+               f"canvas items {sum(len(canvas.find_all()) for canvas in self._canvases)}\n" \
+               f"RSS {'-' if rss is None else f'{rss / 2 ** 20:.1f} MB'}"
+        if text != self._text:
+            self.config(text=text)
+            self._text = text
 
 
 class ControlsFrame(tk.Frame):
@@ -281,6 +733,7 @@ class ControlsFrame(tk.Frame):
         self._elapsed_time = 0.0
         self._running = 0
         self.time_str = tk.StringVar()
+        self._time_text = None
         global ITEM_PRICE
         self._price = ITEM_PRICE
         self._makeWidgets()
@@ -324,11 +777,11 @@ class ControlsFrame(tk.Frame):
 
         self._shop = tk.Toplevel(self.master)
         self._shop.title('Shop')
-        self._appleImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[APPLE]).resize((200, 200)))
-        self._waterImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[WATER]).resize((200, 200)))
-        self._honeyImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[HONEY]).resize((200, 200)))
-        self._potionImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[POTION]).resize((200, 200)))
-        self._candyImage = ImageTk.PhotoImage(Image.open("images/" + ENTITY_IMAGES[CANDY]).resize((200, 200)))
+        self._appleImage = IMAGE_CACHE.get_photo(ENTITY_IMAGES[APPLE], SHOP_IMAGE_SIZE)
+        self._waterImage = IMAGE_CACHE.get_photo(ENTITY_IMAGES[WATER], SHOP_IMAGE_SIZE)
+        self._honeyImage = IMAGE_CACHE.get_photo(ENTITY_IMAGES[HONEY], SHOP_IMAGE_SIZE)
+        self._potionImage = IMAGE_CACHE.get_photo(ENTITY_IMAGES[POTION], SHOP_IMAGE_SIZE)
+        self._candyImage = IMAGE_CACHE.get_photo(ENTITY_IMAGES[CANDY], SHOP_IMAGE_SIZE)
 
         tk.Label(self._shop, text="Shop", font=BANNER_FONT + ("bold",), bg=THEME_COLOUR).pack(fill='x')
         frame = tk.Frame(self._shop)
@@ -358,11 +811,15 @@ class ControlsFrame(tk.Frame):
 
         self._shop.mainloop()
 
-    def _update(self) -> None:
-        """ Update the label with elapsed time. """
-        self._elapsed_time = time.time() - self._start
-        self._setTime(self._elapsed_time)
-        self._timer = self.after(50, self._update)
+    def update_timer(self, step: float) -> None:
+        """ Updates the elapsed time while the stopwatch is running. Subscribed to the game loop's simulation tick.
+
+        Parameters:
+            step: The length of the simulation step in seconds
+        """
+        if self._running:
+            self._elapsed_time = time.time() - self._start
+            self._setTime(self._elapsed_time)
 
     def _setTime(self, elap: float) -> None:
         """ Set the time string to Minutes:Seconds:Hundreths
@@ -372,19 +829,20 @@ class ControlsFrame(tk.Frame):
         """
         minutes = int(elap / 60)
         seconds = int(elap - minutes * 60.0)
-        self.time_str.set('%01dm %01ds' % (minutes, seconds))
+        text = '%01dm %01ds' % (minutes, seconds)
+        if text != self._time_text:
+            self.time_str.set(text)
+            self._time_text = text
 
     def start_timer(self) -> None:
         """ Start the stopwatch, ignore if running. """
         if not self._running:
             self._start = time.time() - self._elapsed_time
-            self._update()
             self._running = 1
 
     def stop_timer(self) -> None:
         """ Stop the stopwatch, ignore if stopped. """
         if self._running:
-            self.after_cancel(self._timer)
             self._elapsed_time = time.time() - self._start
             self._setTime(self._elapsed_time)
             self._running = 0
@@ -412,10 +870,12 @@ class ControlsFrame(tk.Frame):
 
     def _open_file(self) -> None:
         """ Opens up a file explorer window & takes in the game file, also validates that file """
+        global CUSTOM_GAME_FILE
         global LOCAL_GAME_FILE
         file = filedialog.askopenfile(mode='r', filetypes=[('Text Files', '*.txt')])
         if file and is_game_valid(file.name):
             self._dir.config(text=file.name)
+            CUSTOM_GAME_FILE = False
             LOCAL_GAME_FILE = file.name
         else:
             tk.messagebox.showwarning("Alert", "Enter Valid File")
@@ -489,6 +949,14 @@ class GraphicalInterface(UserInterface):
         """ Updates the dimensions of the maze in the level. """
         self.level_view.set_dimensions(dimensions)
 
+    def bind_click(self, command: Callable[[tuple[int, int]], None]) -> None:
+        """ Binds the given command to clicks on the level.
+
+        Parameters:
+            command: A callback function which takes the (row, column) position of the clicked cell.
+        """
+        self.level_view.bind("<Button-1>", lambda event: command(self.level_view.get_position((event.x, event.y))))
+
     def bind_keypress(self, command: Callable[[tk.Event], None]) -> None:
         """ Binds the given command to the general keypress event.
 
@@ -526,8 +994,6 @@ class GraphicalInterface(UserInterface):
             inventory: The player's current inventory
             player_stats: The (HP, hunger, thirst) of the player
         """
-        self.clear_all()
-
         self._draw_level(maze, items, player_position)
 
         self._draw_inventory(inventory)
@@ -541,10 +1007,7 @@ class GraphicalInterface(UserInterface):
             inventory: The player's current inventory
         """
         self.inventory_view.draw_inventory(inventory)
-        if "Coin" in inventory.get_items():
-            self.stats_view.draw_coins(len(inventory.get_items()["Coin"]))
-        else:
-            self.stats_view.draw_coins(0)
+        self.stats_view.draw_coins(inventory.count("Coin"))
 
     def _draw_player_stats(self, player_stats: tuple[int, int, int]) -> None:
         """ Draws the players stats.
@@ -563,7 +1026,7 @@ class GraphicalInterface(UserInterface):
             player_position: The current position of the player
         """
         self.level_view.set_dimensions(maze.get_dimensions())
-        self.level_view.draw(maze.get_tiles(), items, player_position)
+        self.level_view.redraw(maze, items, player_position)
 
 
 class MenuBar:
@@ -607,27 +1070,15 @@ class MenuBar:
         self._load_game_callback = load_callback
 
     def load_game(self) -> None:
-        """ Loads up the game files saved in the directory chosen by user. It will use two text files,
-            naming maze.txt & stats.txt to load all the necessary information like player stats,
-            player inventory, maze status in
-        """
+        """ Loads up a game saved by save_current_game, from the snapshot file chosen by the user. """
         global CUSTOM_GAME_FILE
-        global CUSTOM_GAME_STATS
-        global LOCAL_GAME_FILE
-
-        selected_dir = filedialog.askdirectory()
-        maze = selected_dir + "/maze.txt"
-        if not os.path.isfile(maze):
-            tk.messagebox.showwarning("Alert", "Select Valid Game Directory!")
-            return
-        LOCAL_GAME_FILE = maze
+        global SAVED_GAME_FILE
 
-        stat = selected_dir + "/stats.txt"
-        if not os.path.isfile(stat):
-            tk.messagebox.showwarning("Alert", "Select Valid Game Directory!")
+        filename = filedialog.askopenfilename(filetypes=[('Saved Games', '*' + SNAPSHOT_EXTENSION)])
+        if not filename:
             return
         CUSTOM_GAME_FILE = True
-        CUSTOM_GAME_STATS = stat
+        SAVED_GAME_FILE = filename
 
         self._load_game_callback()
 
@@ -637,118 +1088,174 @@ class MenuBar:
         self._restart_callback()
 
     def save_current_game(self) -> None:
-        """ Saves the current instance of the game in the directory chosen by the user, it will save all the
-            necessary information like player stats, player inventory, maze status in two text files,
-            naming maze.txt & stats.txt
-        """
-        selected_dir = filedialog.askdirectory()
-        levels = self._model._levels
-        curr_level = levels.index(self._model.get_level())
-        lvl = 1
-        maze = selected_dir + "/maze.txt"
-        f = open(maze, "w")
-        for i in range(curr_level, len(levels)):
-            f.write("Maze " + str(lvl) + " - " + str(levels[i].get_dimensions()[0]) + " " + str(
-                levels[i].get_dimensions()[1]) + "\n")
-            if curr_level == i:
-                f.write(get_maze_in_text(levels[i].get_maze(), levels[i].get_items(),
-                                         self._model.get_player().get_position()))
-            else:
-                f.write(get_maze_in_text(levels[i].get_maze(), levels[i].get_items(), levels[i].get_player_start()))
-            lvl += 1
-        f.close()
-
-        # storing inventory & stats
-        stats = selected_dir + "/stats.txt"
-        f = open(stats, "w")
-        f.write("Stats : " + str(self._model.get_player_stats()[0]) + "-" + str(
-            self._model.get_player_stats()[1]) + "-" + str(self._model.get_player_stats()[2]) + " \n")
-
-        f.write("Inventory\n")
-        for i in self._model.get_player_inventory().get_items().values():
-            for j in i:
-                f.write(j.get_name() + "-" + str(j.get_position()[0]) + "-" + str(j.get_position()[1]) + " \n")
-        f.close()
+        """ Saves the current state of the game (the level, player stats and inventory, collected items and
+            door state) as a snapshot file chosen by the user.
+        """
+        filename = filedialog.asksaveasfilename(defaultextension=SNAPSHOT_EXTENSION,
+                                                filetypes=[('Saved Games', '*' + SNAPSHOT_EXTENSION)])
+        if not filename:
+            return
+        try:
+            save_snapshot(self._model, filename)
+        except OSError:
+            tk.messagebox.showwarning("Alert", "Could not save the game!")
 
 
 class GraphicalMazeRunner(MazeRunner):
     """ It operates the game to enable use of GraphicalInterface instead of a TextInterface, """
 
+    # Maps the names of the items which can be bought to their (ID, class)
+    SHOP_ITEMS = {**HeadlessRunner.SHOP_ITEMS, 'Candy': (CANDY, Candy)}
+
+    # The functions timed while the game is instrumented, as (owner, attribute)
+    INSTRUMENTED = MODEL_TARGETS + [
+        (GameLoop, '_render'),
+        (GraphicalInterface, 'draw'),
+        (LevelView, 'draw'),
+        (LevelView, 'redraw'),
+        (ImageLevelView, 'update_images'),
+        (StatsView, 'draw_stats'),
+        (StatsView, 'draw_coins'),
+        (InventoryView, 'draw_inventory'),
+    ]
+
     def __init__(self, game_file: str, root: tk.Tk) -> None:
-        """ Creates a new Graphical-MazeRunner game, with the view inside the given root widget.
+        """ Creates a new Graphical-MazeRunner game, with the view inside the given root widget. If a previous
+            game was interrupted, it is recovered from the autosave journal instead.
 
         Parameters:
             game_file: Game file to load the game.
             root: the root tk.Tk frame.
         """
+        global LOCAL_GAME_FILE
         self.root = root
         self.interface = GraphicalInterface(root)
-        self._model = Model(game_file)
         super(GraphicalMazeRunner, self).__init__(game_file, self.interface)
-
-    def _update_player_stats(self) -> None:
-        """ If the game is loaded from directory or where the game was saved, then the player status will be updated """
-        f = open(CUSTOM_GAME_STATS, "r")
-        inv = False
-        for line in f:
-            line.split()
-            if inv:
-                item = line.split('-')
-                if item[0] == "Coin":
-                    self._model.get_player_inventory().add_item(Coin((int(item[1]), int(item[2]))))
-                elif item[0] == "Honey":
-                    self._model.get_player_inventory().add_item(Honey((int(item[1]), int(item[2]))))
-                elif item[0] == "Potion":
-                    self._model.get_player_inventory().add_item(Potion((int(item[1]), int(item[2]))))
-                elif item[0] == "Apple":
-                    self._model.get_player_inventory().add_item(Apple((int(item[1]), int(item[2]))))
-                elif item[0] == "Water":
-                    self._model.get_player_inventory().add_item(Water((int(item[1]), int(item[2]))))
-                elif item[0] == "Candy":
-                    self._model.get_player_inventory().add_item(Candy((int(item[1]), int(item[2]))))
-                else:
-                    break
-
-            if line.startswith('Stats'):
-                stats = line[8:].split('-')
-                stats = [int(stat) for stat in stats]
-                self._model.get_player().change_health(-(100 - stats[0]))
-                self._model.get_player().change_hunger(stats[1])
-                self._model.get_player().change_thirst(stats[2])
-            elif line.startswith('Inventory'):
-                inv = True
+        self._pending_moves = deque()  # Keys pressed and cells clicked since the last frame, applied in one batch
+        self._input_time = None  # When the oldest pending key was pressed
+        self._input_latencies = deque(maxlen=INPUT_LATENCY_SAMPLES)
+        self._instrumentation = Instrumentation(self.INSTRUMENTED)
+        self._overlay = None
+        self._loop = GameLoop(root)
+        self._loop.subscribe_render(self._apply_moves)
+        self._loop.subscribe_render(self._redraw)
+        self._loop.subscribe_render(self._record_input_latency)
+        self._distances = DistanceFieldCache()
+        self._journal = Journal(AUTOSAVE_DIRECTORY)
+        recovered = recover(AUTOSAVE_DIRECTORY, ITEM_PRICE, self.SHOP_ITEMS)
+        if recovered is not None and not recovered.has_lost():
+            self._model = recovered
+            LOCAL_GAME_FILE = recovered.get_levels().get_filename()
+        self._journal.start(self._model)
 
     def _handle_keypress(self, e: tk.Event) -> None:
-        """ Handles a keypress. If the key pressed was one of [`w', `a', `s', or `d'] a move is attempted.
+        """ Handles a keypress. If the key pressed was one of [`w', `a', `s', or `d'] the move is queued, to be
+            attempted along with any other moves made before the next frame.
 
         Parameters:
             e: A tk.Event that states which button was pressed by user.
         """
-        if e.char == "w":
-            self._move_up()
-        elif e.char == "a":
-            self._move_left()
-        elif e.char == "s":
-            self._move_down()
-        elif e.char == "d":
-            self._move_right()
-        self._refresh()
+        if e.char == "h":
+            self._show_hint()
+        elif e.char == "p":
+            self._toggle_instrumentation()
+        elif e.char in (UP, LEFT, DOWN, RIGHT):
+            self._queue_move(e.char)
 
-    def _move_up(self) -> None:
-        """ When w is pressed the player moves up. """
-        self._model.move_player(MOVE_DELTAS[UP])
+    def _queue_move(self, move: Union[str, tuple[int, int]]) -> None:
+        """ Queues a move to be attempted along with any others made before the next frame.
 
-    def _move_down(self) -> None:
-        """ When s is pressed the player moves down. """
-        self._model.move_player(MOVE_DELTAS[DOWN])
+        Parameters:
+            move: The key of a move to make, or the (row, column) position of a cell to walk to.
+        """
+        if not self._pending_moves:
+            self._input_time = time.perf_counter()
+        self._pending_moves.append(move)
+        self._loop.request_render()
+
+    def _toggle_instrumentation(self) -> None:
+        """ Turns the timing hooks and the performance overlay on or off. Turning them off saves the recorded calls
+            to TRACE_FILE. """
+        if self._overlay is None:
+            self._overlay = PerformanceOverlay(self.root, self._instrumentation,
+                                               [self.interface.level_view, self.interface.stats_view])
+        if self._instrumentation.is_enabled():
+            self._instrumentation.disable()
+            self._loop.unsubscribe(self._overlay.update_stats)
+            self._overlay.hide()
+            self._instrumentation.export(TRACE_FILE)
+            self.root.title(f"MazeRunner (trace saved to {TRACE_FILE})")
+        else:
+            self._instrumentation.clear()
+            self._instrumentation.enable()
+            self._loop.subscribe_tick(self._overlay.update_stats)
+            self._overlay.show()
+
+    def _apply_moves(self) -> None:
+        """ Attempts every queued move. Moves queued after the level changes or the game ends are dropped. """
+        if not self._pending_moves:
+            return
+        while self._pending_moves:
+            move = self._pending_moves.popleft()
+            if isinstance(move, tuple):
+                # Walk to a clicked cell from wherever the moves queued before the click left the player
+                path = self._distances.get_path(self._model.get_level(), self._model.get_player().get_position(),
+                                                move)
+                self._report_latency("path")
+                self._pending_moves.extendleft(reversed(path or []))
+                continue
+            self._move(move)
+            if self._model.did_level_up() or self._model.has_won() or self._model.has_lost():
+                self._pending_moves.clear()
+        self._check_state()
+
+    def _record_input_latency(self) -> None:
+        """ Records the time from the oldest key applied in this frame being pressed until the frame was drawn. """
+        if self._input_time is not None:
+            self._input_latencies.append(time.perf_counter() - self._input_time)
+            self._input_time = None
+
+    def get_input_latencies(self) -> list[float]:
+        """ Returns the most recent input-to-frame latencies in seconds, oldest first. """
+        return list(self._input_latencies)
+
+    def _show_hint(self) -> None:
+        """ Draws the path towards the nearest coin, or to the door once every coin has been collected. """
+        position = self._model.get_player().get_position()
+        positions = [position]
+        for move in self._distances.get_hint(self._model.get_level(), position):
+            delta = MOVE_DELTAS[move]
+            positions.append((positions[-1][0] + delta[0], positions[-1][1] + delta[1]))
+        self.interface.level_view.draw_path(positions)
+        self._report_latency("hint")
+
+    def _walk_to(self, target: tuple[int, int]) -> None:
+        """ Queues a walk along the least damaging path to the clicked cell.
 
-    def _move_left(self) -> None:
-        """ When a is pressed the player moves left. """
-        self._model.move_player(MOVE_DELTAS[LEFT])
+        Parameters:
+            target: The (row, column) position of the clicked cell.
+        """
+        self._queue_move(target)
+
+    def _report_latency(self, query: str) -> None:
+        """ Shows how long the last distance field query took in the window title.
+
+        Parameters:
+            query: The kind of query which was made.
+        """
+        latency = self._distances.get_last_latency() * 1000
+        self.root.title(f"MazeRunner ({query} in {latency:.2f} ms)")
+
+    def _move(self, move: str) -> None:
+        """ Attempts a move, and records it in the autosave journal if the player moved.
 
-    def _move_right(self) -> None:
-        """ When d is pressed the player moves right. """
-        self._model.move_player(MOVE_DELTAS[RIGHT])
+        Parameters:
+            move: The key of the move to make.
+        """
+        num_moves = self._model.get_num_moves()
+        self._model.move_player(MOVE_DELTAS[move])
+        if self._model.get_num_moves() != num_moves or self._model.did_level_up():
+            self._journal.record(move)
 
     def buy_item(self, item_id):
         """ The item will be added to user inventory. and the respective price will be deducted from player.
@@ -756,28 +1263,11 @@ class GraphicalMazeRunner(MazeRunner):
         Parameters:
             item_id: The ID of the item that will be purchased.
         """
-        global ITEM_PRICE
-        price = ITEM_PRICE[item_id]
-        coins = self._model.get_player_inventory().get_items().get('Coin')
-        if coins is None:
-            coins = 0
-        else:
-            coins = len(coins)
-        if coins >= price:
-            while price:
-                self._model.get_player_inventory().get_items()['Coin'].pop(0)
-                price -= 1
-
-            if item_id == APPLE:
-                self._model.get_player_inventory().add_item(Apple((0, 0)))
-            elif item_id == WATER:
-                self._model.get_player_inventory().add_item(Water((0, 0)))
-            elif item_id == HONEY:
-                self._model.get_player_inventory().add_item(Honey((0, 0)))
-            elif item_id == POTION:
-                self._model.get_player_inventory().add_item(Potion((0, 0)))
-            elif item_id == CANDY:
-                self._model.get_player_inventory().add_item(Candy((0, 0)))
+        if self._model.get_player_inventory().spend(ITEM_PRICE[item_id]):
+            for name, (shop_id, item) in self.SHOP_ITEMS.items():
+                if shop_id == item_id:
+                    self._model.get_player_inventory().add_item(item((0, 0)))
+                    self._journal.record(f'b {name}')
             self._refresh()
         else:
             tk.messagebox.showinfo("Warning!", "You do not have enough coins to buy this!")
@@ -788,8 +1278,10 @@ class GraphicalMazeRunner(MazeRunner):
         Parameters:
             item_name: name of item that need be applies on the player
         """
-        self._model.get_player_inventory().get_items()[item_name][0].apply(self._model.get_player())
-        self._model.get_player_inventory().get_items()[item_name].pop(0)
+        item = self._model.get_player_inventory().remove_item(item_name)
+        if item is not None:
+            item.apply(self._model.get_player())
+            self._journal.record(f'i {item_name}')
         self._refresh()
 
     def _handle_callbacks(self) -> None:
@@ -803,15 +1295,23 @@ class GraphicalMazeRunner(MazeRunner):
     def _handle_controls(self) -> None:
         """ Assigns all the necessary keypress event callbacks to the respective classes. """
         self.interface.bind_keypress(self._handle_keypress)
+        self.interface.bind_click(self._walk_to)
 
     def _refresh(self) -> None:
         """ Refreshes all the components of the game """
+        self._check_state()
+        self._loop.request_render()
+
+    def _check_state(self) -> None:
+        """ Ends the game if it has been won or lost, and moves the view on to the next level after a level up. """
         if self._model.has_won():
+            self._journal.discard()
             if TASK > 1:
                 self.interface.controlFrame.stop_timer()
             tk.messagebox.showinfo("Congratulations", WIN_MESSAGE)
             exit(0)
         elif self._model.has_lost():
+            self._journal.discard()
             if TASK > 1:
                 self.interface.controlFrame.stop_timer()
             tk.messagebox.showinfo("Sorry!", LOSS_MESSAGE)
@@ -819,60 +1319,59 @@ class GraphicalMazeRunner(MazeRunner):
         elif self._model.did_level_up():
             tk.messagebox.showinfo("Congratulations", "Level Up!")
             if TASK > 1:
-                global INITIAL_PLAYER_INVENTORY
-                for item in self._model.get_player_inventory().get_items():
-                    INITIAL_PLAYER_INVENTORY[item] = self._model.get_player_inventory().get_items()[item].copy()
                 self.interface.level_view.set_dimensions(self._model.get_current_maze().get_dimensions())
                 self.interface.level_view.update_images()
 
-        self.interface.draw(self._model.get_current_maze(), self._model.get_current_items(),
-                            self._model.get_player().get_position(), self._model.get_player_inventory(),
-                            self._model.get_player_stats())
-
     def play(self) -> None:
         """ Called to cause gameplay to occur. """
         self.interface.create_interface(self._model.get_current_maze().get_dimensions())
         self._handle_controls()
         self._handle_callbacks()
-        self.interface.draw(self._model.get_current_maze(), self._model.get_current_items(),
-                            self._model.get_player().get_position(), self._model.get_player_inventory(),
-                            self._model.get_player_stats())
+        self._redraw()
 
         if TASK > 1:
+            self._loop.subscribe_tick(self.interface.controlFrame.update_timer)
             self.interface.controlFrame.start_timer()
+        self._loop.start()
 
         if TASK >= 2:
             self.interface.controlFrame.set_callback(self.buy_item, self.load_new_game)
 
     def load_new_game(self) -> None:
         """ Loads up a new game """
-        global INITIAL_PLAYER_INVENTORY
-        INITIAL_PLAYER_INVENTORY.clear()
-        self._model = Model(LOCAL_GAME_FILE)
+        global LOCAL_GAME_FILE
+        if TASK > 1 and CUSTOM_GAME_FILE:
+            try:
+                self._model = load_snapshot(SAVED_GAME_FILE, dict(self.SHOP_ITEMS.values()))
+            except (OSError, ValueError, KeyError):
+                tk.messagebox.showwarning("Alert", "Select Valid Saved Game!")
+                return
+            LOCAL_GAME_FILE = self._model.get_levels().get_filename()
+        else:
+            self._model = Model(LOCAL_GAME_FILE)
+        self._handle_callbacks()
         if TASK > 1:
             self.interface.level_view.set_dimensions(self._model.get_current_maze().get_dimensions())
             self.interface.level_view.update_images()
-        if TASK > 1 and CUSTOM_GAME_FILE:
-            self._update_player_stats()
         self._model.get_level().attempt_unlock_door()
+        self._journal.start(self._model)
         self._refresh()
 
     def restart(self) -> None:
-        """ Restarts the game """
-        global INITIAL_PLAYER_INVENTORY
-        level_count = self._model._level_num
-        self._model = Model(LOCAL_GAME_FILE)
-        while level_count:
-            self._model.level_up()
-            self._model._did_level_up = False
-            level_count -= 1
-        for item in INITIAL_PLAYER_INVENTORY:
-            self._model.get_player_inventory().get_items()[item] = INITIAL_PLAYER_INVENTORY[item].copy()
+        """ Restarts the current level, with the inventory the player started it with. """
+        self._model.restart()
+        self._journal.start(self._model)
         self._refresh()
 
+    def close(self) -> None:
+        """ Ends the game once its window has been closed normally. The autosave journal is discarded, so that a game
+            is only recovered after a crash. """
+        self._journal.discard()
+
 
 def is_game_valid(filename: str) -> bool:
-    """ Validating if the selected game file is valid or not
+    """ Validating if the selected game file is valid or not. Every level is parsed through the shared game cache,
+        so the templates built here are the ones a new game, load or restart of this file uses.
 
     Parameters:
         filename: The selected file by the user
@@ -881,61 +1380,27 @@ def is_game_valid(filename: str) -> bool:
         A boolean representing if the file is valid or not
     """
     global CUSTOM_GAME_FILE
-    levels = 0
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line.startswith('Maze'):
-                levels += 1
-    if levels > 0:
+    try:
+        levels = load_levels(filename)
+        for level_num in range(len(levels)):
+            levels.get_template(level_num)
+        num_levels = len(levels)
+    except (OSError, ValueError, IndexError):
+        num_levels = 0
+    if num_levels > 0:
         return True
     else:
         CUSTOM_GAME_FILE = False
         return False
 
 
-def get_maze_in_text(maze: 'Maze', items: dict[tuple[int, int], 'Item'], player_pos: tuple[int, int]) -> str:
-    """ A function to convert the instance of the maze to string
-
-     Parameters:
-         maze: The current maze instance
-         items: The available items on the maze
-         player_pos: Player's current position
-
-     Returns:
-         string representation of the current maze
-
-     Note:
-        In the a2_solution.py file's load_game function, when each line is read, the lines are stripped. And if for
-        a specific row the tile starts or ends with EMPTY tile (ID = " "), those tiles are also stripped. As I was not
-        allowed to manipulates the a2_solution.py file, here while saving the maze status, I replaced those EMPTY tiles
-        with WALL tiles, which are in the start or end except the EMPTY tiles which were actually a door first.
-    """
-    m = ""
-    for i in range(maze.get_dimensions()[0]):
-        for j in range(maze.get_dimensions()[1]):
-            if player_pos == (i, j):
-                m += PLAYER
-            elif (i, j) in items:
-                m += items[(i, j)].get_id()
-            else:
-                if (j == 0 or j == maze.get_dimensions()[1] - 1) and isinstance(maze.get_tile((i, j)), Empty):
-                    m += WALL
-                elif isinstance(maze.get_tile((i, j)), Door):
-                    m += DOOR
-                else:
-                    m += maze.get_tile((i, j)).get_id()
-
-        m += "\n"
-    return m + "\n"
-
-
 def play_game(root: tk.Tk) -> None:
     """ The initial function which start the game """
     global LOCAL_GAME_FILE
     game = GraphicalMazeRunner(LOCAL_GAME_FILE, root)
     game.play()
     root.mainloop()
+    game.close()
 
 
 def main() -> None:
@@ -947,9 +1412,8 @@ def main() -> None:
 # Some important global variables
 LOCAL_GAME_FILE = GAME_FILE
 CUSTOM_GAME_FILE = False
-CUSTOM_GAME_STATS = ""
-INITIAL_PLAYER_INVENTORY = {}
-ITEM_PRICE = {APPLE: 1, WATER: 1, HONEY: 2, POTION: 2, CANDY: 3}
+SAVED_GAME_FILE = ""
+IMAGE_CACHE = ImageCache(IMAGE_CACHE_SIZE)
 
 if __name__ == '__main__':
     main()
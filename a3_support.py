@@ -39,6 +39,10 @@ class AbstractGrid(tk.Canvas):
         """
         self._dimensions = dimensions
 
+    def get_dimensions(self) -> tuple[int, int]:
+        """ Returns the dimensions of the grid as (#rows, #columns). """
+        return self._dimensions
+
     def get_cell_size(self) -> tuple[int, int]:
         """ Returns the size of the cells (width, height) in pixels. """
         rows, cols = self._dimensions
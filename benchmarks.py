@@ -0,0 +1,639 @@
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+from collections import Counter
+from typing import Callable, Iterator, Optional, Union
+
+from PIL import Image
+
+from a2_solution import *
+from a3 import IMAGE_CACHE, ImageLevelView, LevelView, StatsView
+from generator import generate_rows, write_game
+from levelpack import LevelPack, pack_game
+
+
+class RecordingCanvas(tk.Canvas):
+    """ A stand-in for tk.Canvas which needs no display. It keeps track of
+        the items on the canvas and their tags, and counts the calls made to
+        it, but draws nothing.
+
+        Views are made to draw on it by listing it after the view as a base
+        class, so that it comes between the view and tk.Canvas, e.g.
+        class RecordingLevelView(LevelView, RecordingCanvas).
+    """
+
+    def __init__(self, master: Optional[tk.Misc] = None, **kwargs) -> None:
+        """ Sets up an empty canvas. The master and options are ignored. """
+        self._canvas_items = {}  # Maps item IDs to their tags
+        self._next_id = 1
+        self._calls = Counter()
+
+    def get_calls(self) -> Counter:
+        """ Returns the number of calls made to each canvas method. """
+        return self._calls
+
+    def _create(self, method: str, kwargs: dict) -> int:
+        """ Records the creation of an item and returns its ID. """
+        self._calls[method] += 1
+        tags = kwargs.get('tags', ())
+        item_id = self._next_id
+        self._next_id += 1
+        self._canvas_items[item_id] = {tags} if isinstance(tags, str) else set(tags)
+        return item_id
+
+    def _find(self, tag_or_id: Union[str, int]) -> list[int]:
+        """ Returns the IDs of the items matching a tag or item ID. """
+        if tag_or_id == 'all':
+            return list(self._canvas_items)
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self._canvas_items else []
+        return [item_id for item_id, tags in self._canvas_items.items()
+                if tag_or_id in tags]
+
+    def create_rectangle(self, *args, **kwargs) -> int:
+        """ Records the creation of a rectangle. """
+        return self._create('create_rectangle', kwargs)
+
+    def create_oval(self, *args, **kwargs) -> int:
+        """ Records the creation of an oval. """
+        return self._create('create_oval', kwargs)
+
+    def create_text(self, *args, **kwargs) -> int:
+        """ Records the creation of a text item. """
+        return self._create('create_text', kwargs)
+
+    def create_image(self, *args, **kwargs) -> int:
+        """ Records the creation of an image item. """
+        return self._create('create_image', kwargs)
+
+    def create_line(self, *args, **kwargs) -> int:
+        """ Records the creation of a line. """
+        return self._create('create_line', kwargs)
+
+    def delete(self, *tags_or_ids: Union[str, int]) -> None:
+        """ Removes the items matching any of the tags or IDs. """
+        self._calls['delete'] += 1
+        for tag_or_id in tags_or_ids:
+            for item_id in self._find(tag_or_id):
+                del self._canvas_items[item_id]
+
+    def itemconfig(self, tag_or_id: Union[str, int], **kwargs) -> None:
+        """ Records a change to the options of an item. """
+        self._calls['itemconfig'] += 1
+
+    itemconfigure = itemconfig
+
+    def move(self, tag_or_id: Union[str, int], x: int, y: int) -> None:
+        """ Records a move of the items matching a tag or ID. """
+        self._calls['move'] += 1
+
+    def tag_raise(self, *args) -> None:
+        """ Records raising items above others. """
+        self._calls['tag_raise'] += 1
+
+    def tag_lower(self, *args) -> None:
+        """ Records lowering items below others. """
+        self._calls['tag_lower'] += 1
+
+    def configure(self, **kwargs) -> None:
+        """ Records a change to the options of the canvas. """
+        self._calls['configure'] += 1
+
+    config = configure
+
+    def xview_moveto(self, fraction: float) -> None:
+        """ Records a horizontal scroll. """
+        self._calls['xview_moveto'] += 1
+
+    def yview_moveto(self, fraction: float) -> None:
+        """ Records a vertical scroll. """
+        self._calls['yview_moveto'] += 1
+
+    def canvasx(self, x: float) -> float:
+        """ Returns x unchanged, as the recording canvas is not displayed. """
+        return x
+
+    def canvasy(self, y: float) -> float:
+        """ Returns y unchanged, as the recording canvas is not displayed. """
+        return y
+
+    def find_all(self) -> tuple[int, ...]:
+        """ Returns the IDs of every item on the canvas. """
+        return tuple(self._canvas_items)
+
+    def find_withtag(self, tag_or_id: Union[str, int]) -> tuple[int, ...]:
+        """ Returns the IDs of the items matching a tag or ID. """
+        return tuple(self._find(tag_or_id))
+
+
+class RecordingLevelView(LevelView, RecordingCanvas):
+    """ A LevelView drawn on a RecordingCanvas. """
+
+
+class RecordingImageLevelView(ImageLevelView, RecordingCanvas):
+    """ An ImageLevelView drawn on a RecordingCanvas. The images are scaled
+        and composited as usual, but not converted to Tk images.
+    """
+
+    def update_images(self) -> None:
+        """ Scales the images without converting them to Tk images. """
+        self._images = {image_id: IMAGE_CACHE.get_image(image, self.get_cell_size())
+                        for image_id, image in self.LEVEL_IMAGES.items()}
+        self._maze = None
+
+    def _create_photo(self, image: Image.Image) -> Image.Image:
+        """ Returns the composited image itself. """
+        return image
+
+
+class RecordingStatsView(StatsView, RecordingCanvas):
+    """ A StatsView drawn on a RecordingCanvas. """
+
+
+def _random_walk(
+    game_file: str,
+    num_moves: int,
+    seed: int = 0
+) -> Iterator[Model]:
+    """ Plays random moves, restarting the level whenever the game is lost
+        and the game whenever it is won.
+
+    Parameters:
+        game_file: The game to play.
+        num_moves: Number of moves to make.
+        seed: Seed for the random moves.
+
+    Yields:
+        The game before each move, and once more after the last move.
+    """
+    rng = random.Random(seed)
+    moves = list(MOVE_DELTAS.values())
+    model = Model(game_file)
+    for _ in range(num_moves):
+        if model.has_won():
+            model = Model(game_file)
+        elif model.has_lost():
+            model.restart()
+        yield model
+        model.move_player(rng.choice(moves))
+    yield model
+
+
+def _list_of_lists_maze(rows: list[str]) -> list[list[Tile]]:
+    """ Builds the original list-of-lists maze with one Tile per cell. """
+    return [[Maze.TILES.get(tile, Empty)() for tile in row] for row in rows]
+
+
+def _compact_maze(rows: list[str]) -> Maze:
+    """ Builds a compact Maze from the given rows. """
+    maze = Maze((len(rows), len(rows[0])))
+    for row in rows:
+        maze.add_row(row)
+    return maze
+
+
+def _measure_memory(build: Callable[[], object]) -> tuple[object, int]:
+    """ Returns the result of build and the bytes still allocated by it. """
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def _time_lookups(
+    get_tile: Callable[[tuple[int, int]], Tile],
+    positions: list[tuple[int, int]],
+    repeats: int = 3
+) -> float:
+    """ Returns the fastest time in seconds taken to look up every position. """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for position in positions:
+            get_tile(position)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_maze(
+    dimensions: tuple[int, int] = (2000, 2000),
+    lookups: int = 1_000_000
+) -> dict[str, dict[str, float]]:
+    """ Compares memory use and get_tile lookup time of the compact Maze
+        against the original list-of-lists representation.
+
+    Parameters:
+        dimensions: (#rows, #columns) of the maze to benchmark.
+        lookups: Number of random tile lookups to time.
+
+    Returns:
+        A mapping from representation name to its measured 'memory_mb' and
+        'lookup_ns' (mean nanoseconds per lookup).
+    """
+    rows = list(generate_rows(dimensions))
+    rng = random.Random(1)
+    positions = [(rng.randrange(dimensions[0]), rng.randrange(dimensions[1]))
+                 for _ in range(lookups)]
+    results = {}
+
+    tiles, size = _measure_memory(lambda: _list_of_lists_maze(rows))
+
+    def get_tile(position: tuple[int, int]) -> Tile:
+        row, col = position
+        return tiles[row][col]
+
+    elapsed = _time_lookups(get_tile, positions)
+    results['list_of_lists'] = {
+        'memory_mb': size / 2 ** 20,
+        'lookup_ns': elapsed / lookups * 1e9,
+    }
+    del tiles, get_tile
+
+    maze, size = _measure_memory(lambda: _compact_maze(rows))
+    get_tile = maze.get_tile
+    elapsed = _time_lookups(get_tile, positions)
+    results['compact'] = {
+        'memory_mb': size / 2 ** 20,
+        'lookup_ns': elapsed / lookups * 1e9,
+    }
+    return results
+
+
+def benchmark_pack(
+    num_levels: int = 200,
+    dimensions: tuple[int, int] = (100, 100),
+    repeats: int = 5
+) -> dict[str, dict[str, float]]:
+    """ Compares loading a game from the text format with load_game against
+        loading it from a binary level pack.
+
+    Parameters:
+        num_levels: Number of levels in the benchmarked game.
+        dimensions: (#rows, #columns) of each level.
+        repeats: Number of times to open the pack, of which the fastest
+            counts towards 'first_ms'.
+
+    Returns:
+        A mapping from format name to its measured 'file_mb', 'first_ms' (time
+        until the first level is ready) and 'all_ms' (time to load every level).
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        game_file = os.path.join(directory, 'game.txt')
+        pack_file = os.path.join(directory, 'game.mzp')
+        write_game(game_file, num_levels, dimensions)
+        pack_game(game_file, pack_file)
+
+        start = time.perf_counter()
+        load_game(game_file)
+        elapsed = time.perf_counter() - start
+        results['text'] = {
+            'file_mb': os.path.getsize(game_file) / 2 ** 20,
+            'first_ms': elapsed * 1000,
+            'all_ms': elapsed * 1000,
+        }
+
+        first = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            pack = LevelPack(pack_file)
+            pack.load_level(0)
+            first = min(first, time.perf_counter() - start)
+            pack.close()
+
+        start = time.perf_counter()
+        pack = LevelPack(pack_file)
+        levels = [pack.load_level(level_num) for level_num in range(len(pack))]
+        elapsed = time.perf_counter() - start
+        results['pack'] = {
+            'file_mb': os.path.getsize(pack_file) / 2 ** 20,
+            'first_ms': first * 1000,
+            'all_ms': elapsed * 1000,
+        }
+        del levels
+        pack.close()
+    return results
+
+
+def _draw_level(view: LevelView, model: Model) -> None:
+    """ Redraws the current level of a game, as GraphicalMazeRunner does. """
+    dimensions = model.get_level().get_dimensions()
+    if dimensions != view.get_dimensions():
+        view.set_dimensions(dimensions)
+        if isinstance(view, ImageLevelView):
+            view.update_images()
+    view.redraw(model.get_current_maze(), model.get_current_items(),
+                model.get_player().get_position())
+
+
+def check_canvas_items(
+    game_file: str = GAME_FILE,
+    num_moves: int = 100_000,
+    seed: int = 0
+) -> dict[str, int]:
+    """ Plays random moves through the level and stats views and checks that
+        their canvases do not accumulate items.
+
+    Parameters:
+        game_file: The game to play.
+        num_moves: Number of moves to draw.
+        seed: Seed for the random moves.
+
+    Returns:
+        A mapping from view name to the most canvas items it gained over the
+        count drawn at the start of the level, which should be at most 0.
+    """
+    dimensions = Model(game_file).get_level().get_dimensions()
+    views = {
+        'level': RecordingLevelView(None, dimensions, (MAZE_WIDTH, MAZE_HEIGHT)),
+        'stats': RecordingStatsView(None, MAZE_WIDTH + INVENTORY_WIDTH),
+    }
+    baselines, growth = {}, dict.fromkeys(views, 0)
+    maze = None
+
+    for model in _random_walk(game_file, num_moves, seed):
+        if model.get_current_maze() is not maze:
+            # A new or restarted level is drawn from scratch
+            maze = model.get_current_maze()
+            baselines.clear()
+        _draw_level(views['level'], model)
+        views['stats'].draw_stats(model.get_player_stats())
+        views['stats'].draw_coins(model.get_player_inventory().count('Coin'))
+
+        for name, view in views.items():
+            num_items = len(view.find_all())
+            baselines.setdefault(name, num_items)
+            growth[name] = max(growth[name], num_items - baselines[name])
+    return growth
+
+
+def benchmark_load(
+    game_files: Optional[list[str]] = None,
+    repeats: int = 5
+) -> dict[str, float]:
+    """ Times load_game on each of the given game files.
+
+    Parameters:
+        game_files: The game files to load. Defaults to the bundled games.
+        repeats: Number of times to load each file, of which the fastest counts.
+
+    Returns:
+        A mapping from the name of each game file to its load time in ms.
+    """
+    if game_files is None:
+        game_files = sorted(glob.glob(os.path.join('games', '*.txt')))
+    results = {}
+    for game_file in game_files:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            load_game(game_file)
+            best = min(best, time.perf_counter() - start)
+        results[os.path.basename(game_file)] = best * 1000
+    return results
+
+
+def benchmark_moves(
+    game_files: Optional[list[str]] = None,
+    num_moves: int = 100_000,
+    seed: int = 0,
+    repeats: int = 3
+) -> dict[str, float]:
+    """ Times Model.move_player over a scripted random walk on each game.
+        The script is generated before timing starts, and the level is
+        restarted whenever the walk loses.
+
+    Parameters:
+        game_files: The games to play. Defaults to the bundled games.
+        num_moves: Number of moves in the script.
+        seed: Seed for the random moves.
+        repeats: Number of times to play the script, of which the fastest
+            counts.
+
+    Returns:
+        A mapping from the name of each game file to the mean time per move
+        in microseconds.
+    """
+    if game_files is None:
+        game_files = sorted(glob.glob(os.path.join('games', '*.txt')))
+    rng = random.Random(seed)
+    script = [rng.choice(list(MOVE_DELTAS.values())) for _ in range(num_moves)]
+    results = {}
+    for game_file in game_files:
+        best = float('inf')
+        for _ in range(repeats):
+            model = Model(game_file)
+            elapsed = 0.0
+            for delta in script:
+                if model.has_won():
+                    model = Model(game_file)
+                elif model.has_lost():
+                    model.restart()
+                start = time.perf_counter()
+                model.move_player(delta)
+                elapsed += time.perf_counter() - start
+            best = min(best, elapsed)
+        results[os.path.basename(game_file)] = best / num_moves * 1e6
+    return results
+
+
+def benchmark_render(
+    game_file: str = GAME_FILE,
+    num_moves: int = 2_000,
+    seed: int = 0,
+    repeats: int = 3
+) -> dict[str, dict[str, float]]:
+    """ Counts and times the canvas calls made by LevelView and ImageLevelView
+        while drawing a random walk on a RecordingCanvas.
+
+    Parameters:
+        game_file: The game to draw.
+        num_moves: Number of moves to draw after the first frame.
+        seed: Seed for the random moves.
+        repeats: Number of times to draw the walk, of which the fastest counts.
+
+    Returns:
+        A mapping from view name to its 'first_ms' and 'first_calls' (time and
+        canvas calls to draw the first frame) and 'frame_us' and
+        'frame_calls' (mean time and canvas calls for each later frame).
+    """
+    dimensions = Model(game_file).get_level().get_dimensions()
+    results = {}
+    for view_class in (RecordingLevelView, RecordingImageLevelView):
+        first = elapsed = float('inf')
+        for _ in range(repeats):
+            view = view_class(None, dimensions, (MAZE_WIDTH, MAZE_HEIGHT))
+            walk = _random_walk(game_file, num_moves, seed)
+            view.get_calls().clear()
+            start = time.perf_counter()
+            _draw_level(view, next(walk))
+            first = min(first, time.perf_counter() - start)
+            first_calls = sum(view.get_calls().values())
+
+            view.get_calls().clear()
+            start = time.perf_counter()
+            for model in walk:
+                _draw_level(view, model)
+            elapsed = min(elapsed, time.perf_counter() - start)
+            frame_calls = sum(view.get_calls().values())
+        results[view_class.__mro__[1].__name__] = {
+            'first_ms': first * 1000,
+            'first_calls': first_calls,
+            'frame_us': elapsed / num_moves * 1e6,
+            'frame_calls': frame_calls / num_moves,
+        }
+    return results
+
+
+def benchmark_camera(
+    sizes: tuple[int, ...] = (101, 1001),
+    repeats: int = 3
+) -> dict[str, dict[str, float]]:
+    """ Times LevelView and ImageLevelView following the player through the
+        camera on generated levels of increasing size. The player is moved
+        diagonally across the whole level, one cell per frame, so the camera
+        scrolls on every frame.
+
+    Parameters:
+        sizes: The number of rows and columns of each generated level.
+        repeats: Number of times to sweep each level, of which the fastest
+            counts.
+
+    Returns:
+        A mapping from '<size>.<view name>' to its 'first_ms' (time to draw
+        the first frame), 'frame_us' and 'frame_calls' (mean time and canvas
+        calls per frame) and 'max_items' (most canvas items at once).
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            game_file = os.path.join(directory, f'{size}.txt')
+            write_game(game_file, 1, (size, size))
+            model = Model(game_file)
+            player = model.get_player()
+            start_pos = player.get_position()
+            for view_class in (RecordingLevelView, RecordingImageLevelView):
+                first = elapsed = float('inf')
+                for _ in range(repeats):
+                    player.set_position(start_pos)
+                    view = view_class(None, (size, size), (MAZE_WIDTH, MAZE_HEIGHT))
+                    start = time.perf_counter()
+                    _draw_level(view, model)
+                    first = min(first, time.perf_counter() - start)
+
+                    view.get_calls().clear()
+                    max_items = 0
+                    start = time.perf_counter()
+                    for cell in range(1, size - 1):
+                        player.set_position((cell, cell))
+                        _draw_level(view, model)
+                        max_items = max(max_items, len(view.find_all()))
+                    elapsed = min(elapsed, time.perf_counter() - start)
+                results[f'{size}.{view_class.__mro__[1].__name__}'] = {
+                    'first_ms': first * 1000,
+                    'frame_us': elapsed / (size - 2) * 1e6,
+                    'frame_calls': sum(view.get_calls().values()) / (size - 2),
+                    'max_items': max_items,
+                }
+    return results
+
+
+def run_suite() -> dict[str, float]:
+    """ Runs every benchmark.
+
+    Returns:
+        A mapping from the name of each measurement to its value. Every
+        measurement is a time, size or count, so lower is better.
+    """
+    results = {}
+    for name, result in benchmark_maze().items():
+        for key, value in result.items():
+            results[f'maze.{name}.{key}'] = value
+    for name, value in benchmark_load().items():
+        results[f'load_game.{name}.ms'] = value
+    for name, result in benchmark_pack().items():
+        for key, value in result.items():
+            results[f'pack.{name}.{key}'] = value
+    for name, value in benchmark_moves().items():
+        results[f'move_player.{name}.us'] = value
+    for name, result in benchmark_render().items():
+        for key, value in result.items():
+            results[f'render.{name}.{key}'] = value
+    for name, result in benchmark_camera().items():
+        for key, value in result.items():
+            results[f'camera.{name}.{key}'] = value
+    for name, value in check_canvas_items().items():
+        results[f'canvas_growth.{name}'] = value
+    return results
+
+
+def find_regressions(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float = REGRESSION_THRESHOLD
+) -> dict[str, tuple[float, float]]:
+    """ Compares benchmark results against a baseline.
+
+    Parameters:
+        results: The results of run_suite.
+        baseline: Earlier results of run_suite.
+        threshold: The fraction by which a measurement may exceed its
+            baseline before it counts as a regression.
+
+    Returns:
+        A mapping from the name of each regressed measurement to its
+        (baseline, result).
+    """
+    return {name: (baseline[name], value) for name, value in results.items()
+            if name in baseline and value > baseline[name] * (1 + threshold)}
+
+
+def main() -> None:
+    """ Runs every benchmark, prints the results and compares them against a
+        saved baseline. Exits with status 1 if any measurement regressed.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark the model, loaders and views without a display.'
+    )
+    parser.add_argument('-b', '--baseline', default=BENCHMARK_BASELINE,
+                        help='baseline results file')
+    parser.add_argument('-s', '--save', action='store_true',
+                        help='save the results as the new baseline')
+    parser.add_argument('-t', '--threshold', type=float,
+                        default=REGRESSION_THRESHOLD,
+                        help='fraction a result may exceed its baseline by')
+    args = parser.parse_args()
+
+    results = run_suite()
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    regressions = find_regressions(results, baseline, args.threshold)
+    for name, value in results.items():
+        line = f'{name}: {value:.3f}'
+        if name in baseline:
+            line += f' (baseline {baseline[name]:.3f})'
+        if name in regressions:
+            line += ' REGRESSED'
+        print(line)
+
+    if args.save:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f'saved baseline to {args.baseline}')
+    elif regressions:
+        print(f'{len(regressions)} regressions beyond {args.threshold:.0%}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,9 @@ WATER = 'W'
 CANDY = 'S'
 LAVA_SHOES = 'J'
 
+# Number of coins each item costs in the shop
+ITEM_PRICE = {APPLE: 1, WATER: 1, HONEY: 2, POTION: 2, CANDY: 3}
+
 APPLE_AMOUNT = -1
 HONEY_AMOUNT = -5
 WATER_AMOUNT = -5
@@ -41,6 +44,23 @@ MAX_HUNGER = 10
 MAX_THIRST = 10
 LAVA_DAMAGE = 5
 
+# Binary level pack format
+PACK_MAGIC = b'MZPK'
+PACK_VERSION = 1
+
+# Number of game files, and of parsed levels per file, kept in memory
+GAME_CACHE_SIZE = 8
+LEVEL_CACHE_SIZE = 16
+
+# Saved game snapshot format
+SNAPSHOT_MAGIC = b'MZSV'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_EXTENSION = '.sav'
+
+# Autosave journal
+AUTOSAVE_DIRECTORY = '.autosave'
+AUTOSAVE_INTERVAL = 50
+
 WIN_MESSAGE = 'Congratulations! You have finished all levels and won the game!'
 LOSS_MESSAGE = 'You lose :('
 ITEM_UNAVAILABLE_MESSAGE = '\nYou don\'t have any of that item!\n'
@@ -68,6 +88,7 @@ ENTITY_COLOURS = {
 }
 
 THEME_COLOUR = '#C1E1C1'
+HINT_COLOUR = '#E42256'
 
 BANNER_FONT = ('Courier', 45)
 HEADING_FONT = ('Courier', 28)
@@ -77,6 +98,42 @@ MAZE_WIDTH = 600
 MAZE_HEIGHT = 600
 INVENTORY_WIDTH = 200
 STATS_HEIGHT = 100
+MIN_CELL_SIZE = 20  # Smallest cell size in pixels, below which the level is shown through a camera
+CAMERA_MARGIN = 5  # Cells drawn beyond each edge of the camera's window
+SHOP_IMAGE_SIZE = (200, 200)
+IMAGE_CACHE_SIZE = 64
+
+# Game loop
+SIMULATION_RATE = 10  # Fixed simulation ticks per second
+FRAME_RATE = 60  # Most frames rendered per second
+MAX_CATCH_UP_TICKS = 5  # Most simulation ticks run at once after falling behind
+INPUT_LATENCY_SAMPLES = 1000  # Number of recent input-to-frame latencies kept
+
+# Performance instrumentation
+TRACE_EVENTS = 100_000  # Number of most recent timed calls kept
+TRACE_FILE = 'trace.json'
+OVERLAY_INTERVAL = 0.5  # Seconds between updates of the performance overlay
+OVERLAY_FONT = ('Courier', 12)
+
+# Level generator: the fraction of maze cells holding each entity or tile.
+# Coins only go on the main path from the player to the door, and lava never does.
+GENERATOR_DENSITIES = {
+    COIN: 0.03,
+    APPLE: 0.005,
+    HONEY: 0.002,
+    WATER: 0.005,
+    POTION: 0.002,
+    LAVA: 0.03,
+}
+# Items placed on the main path, at these offsets within every
+# GENERATOR_SUPPLY_INTERVAL cells, so the player never runs out of health,
+# food or water walking it
+GENERATOR_SUPPLY_INTERVAL = 8
+GENERATOR_SUPPLIES = {1: POTION, 3: HONEY, 5: WATER}
+
+# Benchmarks
+BENCHMARK_BASELINE = 'benchmarks.json'
+REGRESSION_THRESHOLD = 0.2  # Fraction a result may exceed its baseline by
 
 TILE_IMAGES = {
     WALL: 'wall.png',
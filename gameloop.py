@@ -0,0 +1,132 @@
+import time
+import tkinter as tk
+from typing import Callable, Union
+
+from constants import FRAME_RATE, MAX_CATCH_UP_TICKS, SIMULATION_RATE
+
+
+class GameLoop:
+    """ The one scheduler for everything which happens over time in the game.
+
+        The simulation runs at a fixed timestep: each tick subscriber is called
+        with the same step, however late the tick fires, and ticks missed while
+        the loop fell behind are caught up (up to MAX_CATCH_UP_TICKS at once).
+        Rendering is a separate tick, which only runs after a render has been
+        requested and at most frame_rate times per second, so an idle game
+        draws nothing.
+    """
+    _tick_job = None
+    _render_job = None
+    _running = False
+
+    def __init__(
+        self,
+        master: Union[tk.Tk, tk.Widget],
+        tick_rate: int = SIMULATION_RATE,
+        frame_rate: int = FRAME_RATE
+    ) -> None:
+        """ Sets up a stopped loop which schedules its ticks on master.
+
+        Parameters:
+            master: The widget whose event loop runs the ticks.
+            tick_rate: The number of simulation ticks per second.
+            frame_rate: The most frames to render per second.
+        """
+        self._master = master
+        self._step = 1 / tick_rate
+        self._frame_time = 1 / frame_rate
+        self._tick_subscribers = []
+        self._render_subscribers = []
+        self._accumulator = 0.0
+        self._last_tick = 0.0
+        self._last_render = float('-inf')
+
+    def subscribe_tick(self, callback: Callable[[float], None]) -> None:
+        """ Registers a function to be called on every simulation tick.
+
+        Parameters:
+            callback: A function which takes the length of the step in seconds.
+        """
+        self._tick_subscribers.append(callback)
+        if self._running and self._tick_job is None:
+            self._last_tick = time.perf_counter()
+            self._schedule_tick()
+
+    def subscribe_render(self, callback: Callable[[], None]) -> None:
+        """ Registers a function to be called on every rendered frame.
+
+        Parameters:
+            callback: A function which draws (part of) the game.
+        """
+        self._render_subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """ Stops calling a tick or render subscriber.
+
+        Parameters:
+            callback: A function previously subscribed.
+        """
+        for subscribers in (self._tick_subscribers, self._render_subscribers):
+            if callback in subscribers:
+                subscribers.remove(callback)
+
+    def start(self) -> None:
+        """ Starts running the simulation ticks, ignored if running. """
+        if self._running:
+            return
+        self._running = True
+        self._accumulator = 0.0
+        self._last_tick = time.perf_counter()
+        if self._tick_subscribers:
+            self._schedule_tick()
+
+    def stop(self) -> None:
+        """ Stops the loop, cancelling any pending tick or render. """
+        self._running = False
+        for job in (self._tick_job, self._render_job):
+            if job is not None:
+                self._master.after_cancel(job)
+        self._tick_job = self._render_job = None
+
+    def is_running(self) -> bool:
+        """ Returns True iff the loop has been started and not stopped. """
+        return self._running
+
+    def request_render(self) -> None:
+        """ Asks for a frame to be rendered. Requests made before that frame is
+            rendered are merged into it.
+        """
+        if self._render_job is not None:
+            return
+        wait = max(0.0, self._last_render + self._frame_time - time.perf_counter())
+        self._render_job = self._master.after(round(wait * 1000), self._render)
+
+    def _schedule_tick(self) -> None:
+        """ Schedules the next simulation tick for when its step is due. """
+        wait = max(0.001, self._step - self._accumulator)
+        self._tick_job = self._master.after(round(wait * 1000), self._tick)
+
+    def _tick(self) -> None:
+        """ Runs every simulation step which has fallen due since the last tick. """
+        self._tick_job = None
+        now = time.perf_counter()
+        self._accumulator += now - self._last_tick
+        self._last_tick = now
+        num_ticks = 0
+        while self._accumulator >= self._step and num_ticks < MAX_CATCH_UP_TICKS:
+            for callback in list(self._tick_subscribers):
+                callback(self._step)
+            self._accumulator -= self._step
+            num_ticks += 1
+        if num_ticks == MAX_CATCH_UP_TICKS:
+            # Too far behind to catch up, so drop the missed steps
+            self._accumulator %= self._step
+        if self._running and self._tick_subscribers:
+            self._schedule_tick()
+
+    def _render(self) -> None:
+        """ Renders a frame by calling every render subscriber. """
+        self._render_job = None
+        self._last_render = time.perf_counter()
+        for callback in list(self._render_subscribers):
+            callback()
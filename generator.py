@@ -0,0 +1,256 @@
+import argparse
+import math
+import random
+from typing import Iterator, Optional, Union
+
+from constants import *
+
+
+class _EntityPlacer:
+    """ Scatters entities over the cells of a stream of maze rows.
+
+        Rather than drawing a random number for every cell, the number of
+        cells to skip before the next entity is drawn from a geometric
+        distribution, so the cost is proportional to the number of entities
+        placed rather than the size of the level.
+    """
+
+    def __init__(self, rng: random.Random, densities: dict[str, float]) -> None:
+        """ Sets up a placer for the given entity densities.
+
+        Parameters:
+            rng: The source of randomness.
+            densities: Maps entity and tile IDs to the fraction of maze cells
+                which should hold them.
+        """
+        self._rng = rng
+        self._ids = list(densities)
+        self._weights = list(densities.values())
+        total = sum(self._weights)
+        self._log_miss = math.log(1 - total) if 0 < total < 1 else None
+        self._skip = self._next_skip()
+
+    def _next_skip(self) -> float:
+        """ Returns the number of cells to skip before the next entity. """
+        if self._log_miss is None:
+            return math.inf
+        return int(math.log(1 - self._rng.random()) / self._log_miss)
+
+    def place(self, row: bytearray, num_cells: int, excluded: range = range(0)) -> None:
+        """ Places entities in some of the empty maze cells of a row.
+
+        Parameters:
+            row: The row of tile IDs to place entities in, with its maze cells
+                at the odd indices.
+            num_cells: The number of maze cells in the row.
+            excluded: The maze cells which must be left as they are.
+        """
+        cell = self._skip
+        while cell < num_cells:
+            index = 2 * cell + 1
+            if row[index] == ord(EMPTY) and cell not in excluded:
+                row[index] = ord(self._rng.choices(self._ids, self._weights)[0])
+            cell += 1 + self._next_skip()
+        self._skip = cell - num_cells
+
+
+def _eller_rows(
+    width: int,
+    height: int,
+    rng: random.Random
+) -> Iterator[tuple[list[bool], list[bool], tuple[int, int]]]:
+    """ Generates a maze one row of cells at a time with Eller's algorithm,
+        which only needs to remember the current row.
+
+        A main path is carved through the maze as it goes, from the first cell
+        of the top row to the bottom row, only ever moving right or down. The
+        rest of the maze is perfect, but the main path may close a few loops
+        where it joins cells which were already connected.
+
+    Parameters:
+        width: The number of cells in each row.
+        height: The number of rows of cells.
+        rng: The source of randomness.
+
+    Yields:
+        For each row, whether each cell is open to the cell on its right,
+        whether it is open to the cell below it, and the (first, last) columns
+        of the main path in the row, which leaves it downwards from the last.
+    """
+    labels = list(range(width))  # The set of cells each cell is connected to
+    next_label = width
+    path_end = 0
+    for row_num in range(height):
+        last = row_num == height - 1
+        parent = {}  # Union-find links between the sets merged in this row
+
+        def find(label: int) -> int:
+            root = label
+            while root in parent:
+                root = parent[root]
+            while label in parent and parent[label] != root:
+                parent[label], label = root, parent[label]
+            return root
+
+        path_start, path_end = path_end, min(width - 1, path_end + rng.randrange(3))
+        right = [False] * width
+        for col in range(width - 1):
+            left_set, right_set = find(labels[col]), find(labels[col + 1])
+            on_path = path_start <= col < path_end
+            # The last row joins every set left, so the maze is connected
+            if on_path or left_set != right_set and (last or rng.random() < 0.5):
+                if left_set != right_set:
+                    parent[right_set] = left_set
+                right[col] = True
+        labels = [find(label) for label in labels]
+
+        down = [False] * width
+        if not last:
+            down[path_end] = True
+            members = {}
+            for col, label in enumerate(labels):
+                members.setdefault(label, []).append(col)
+            # Each set must continue into the next row
+            for cols in members.values():
+                opened = [col for col in cols if down[col] or rng.random() < 0.5]
+                for col in opened or [rng.choice(cols)]:
+                    down[col] = True
+            for col in range(width):
+                if not down[col]:
+                    labels[col] = next_label
+                    next_label += 1
+        yield right, down, (path_start, path_end)
+
+
+def generate_rows(
+    dimensions: tuple[int, int],
+    seed: Union[int, str] = 0,
+    densities: Optional[dict[str, float]] = None
+) -> Iterator[str]:
+    """ Generates the rows of a random level, one at a time.
+
+        The level is a maze (every open cell is reachable) surrounded by
+        walls, with the player in the top left corner and a door in the bottom
+        wall. Only one row of the maze is held in memory at once.
+
+        Every generated level can be won. A main path leads from the player to
+        the door, and it is the only place coins are put, so walking it
+        collects every coin. Lava is never placed on it, and every
+        GENERATOR_SUPPLY_INTERVAL cells along it hold a potion, honey and
+        water, which give back more health, food and drink than walking that
+        far uses up. Other items and lava are scattered over the rest of the
+        maze.
+
+    Parameters:
+        dimensions: (#rows, #columns) of the level, each at least 3 and one
+            at least 5.
+        seed: Seed for the maze and the placement of entities.
+        densities: Maps entity and tile IDs to the fraction of maze cells
+            which should hold them. Defaults to GENERATOR_DENSITIES.
+
+    Yields:
+        Each row of tile and entity IDs in the game file format.
+    """
+    rows, cols = dimensions
+    # With a single maze cell, the player could never move to unlock the door
+    if min(rows, cols) < 3 or max(rows, cols) < 5:
+        raise ValueError(f'a level must be at least 3x5 or 5x3, not {rows}x{cols}')
+    densities = dict(GENERATOR_DENSITIES if densities is None else densities)
+    height, width = (rows - 1) // 2, (cols - 1) // 2
+    # The main path is roughly width + height cells long, so its coins are as
+    # many as there would be if they were scattered over the whole maze
+    coin_chance = densities.pop(COIN, 0) * width * height / (width + height)
+    rng = random.Random(seed)
+    placer = _EntityPlacer(rng, densities)
+    # Even dimensions leave an extra wall on the bottom or right
+    pad_bottom = rows % 2 == 0
+    pad_right = WALL if cols % 2 == 0 else ''
+
+    def border() -> str:
+        return WALL * (2 * width + 1) + pad_right
+
+    def with_tile(row: str, index: int, tile: str) -> str:
+        return row[:index] + tile + row[index + 1:]
+
+    yield border()
+
+    cells = (EMPTY + WALL, EMPTY + EMPTY)
+    passages = (WALL + WALL, EMPTY + WALL)
+    path_length = 0  # The number of main path cells before this row
+    for row_num, (right, down, (path_start, path_end)) in enumerate(
+        _eller_rows(width, height, rng)
+    ):
+        row = bytearray((WALL + ''.join([cells[open_] for open_ in right]) + pad_right).encode())
+        for step, col in enumerate(range(path_start, path_end + 1), path_length):
+            supply = GENERATOR_SUPPLIES.get(step % GENERATOR_SUPPLY_INTERVAL)
+            if step == 0:
+                row[2 * col + 1] = ord(PLAYER)
+            elif supply is not None:
+                row[2 * col + 1] = ord(supply)
+            elif rng.random() < coin_chance:
+                row[2 * col + 1] = ord(COIN)
+        path_length += path_end - path_start + 1
+        placer.place(row, width, range(path_start, path_end + 1))
+        yield row.decode()
+
+        if row_num < height - 1:
+            yield WALL + ''.join([passages[open_] for open_ in down]) + pad_right
+
+    door = 2 * path_end + 1
+    if pad_bottom:
+        # The door must be on the edge of the level, beyond the extra wall
+        yield with_tile(border(), door, EMPTY)
+        yield with_tile(WALL * cols, door, DOOR)
+    else:
+        yield with_tile(border(), door, DOOR)
+
+
+def write_game(
+    filename: str,
+    num_levels: int,
+    dimensions: tuple[int, int],
+    seed: int = 0,
+    densities: Optional[dict[str, float]] = None
+) -> None:
+    """ Writes a game file of generated levels, streaming each row to the
+        file as it is generated.
+
+    Parameters:
+        filename: The path to write the game file to.
+        num_levels: The number of levels to generate.
+        dimensions: (#rows, #columns) of each level.
+        seed: Seed for the game. Each level gets its own seed derived from it.
+        densities: Maps entity and tile IDs to the fraction of maze cells
+            which should hold them. Defaults to GENERATOR_DENSITIES.
+    """
+    with open(filename, 'w') as file:
+        for level_num in range(num_levels):
+            file.write(f'Maze {level_num + 1} - {dimensions[0]} {dimensions[1]}\n')
+            for row in generate_rows(dimensions, f'{seed}:{level_num}', densities):
+                file.write(row)
+                file.write('\n')
+            file.write('\n')
+
+
+def main() -> None:
+    """ Entry-point for generating game files from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Generate a game file of random maze levels.'
+    )
+    parser.add_argument('game_file', help='path to write the game file to')
+    parser.add_argument('-n', '--levels', type=int, default=1,
+                        help='number of levels (default 1)')
+    parser.add_argument('-d', '--dimensions', type=int, nargs=2,
+                        default=(101, 101), metavar=('ROWS', 'COLUMNS'),
+                        help='dimensions of each level (default 101 101)')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help='seed for the levels (default 0)')
+    args = parser.parse_args()
+
+    write_game(args.game_file, args.levels, tuple(args.dimensions), args.seed)
+    print(f'{args.game_file}: {args.levels} levels of '
+          f'{args.dimensions[0]}x{args.dimensions[1]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import sys
+import time
+from typing import Iterable, Iterator, Optional
+
+from a2_solution import *
+
+
+def parse_commands(lines: Iterable[str]) -> Iterator[str]:
+    """ Splits the lines of a move script into single commands.
+
+        Each line holds either a run of move keys (e.g. 'wwdsa'), a single
+        item use in the same form MazeRunner accepts (e.g. 'i Apple'), or a
+        shop purchase (e.g. 'b Water'). Blank lines and lines starting with ';'
+        are ignored.
+
+    Parameters:
+        lines: The lines of the move script.
+
+    Yields:
+        Each move key or item use command in order.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(';'):
+            continue
+        if line.startswith(('i ', 'b ')):
+            yield line
+        else:
+            yield from line
+
+
+def format_commands(commands: Iterable[str]) -> str:
+    """ Formats commands as a move script which parse_commands can read, with
+        runs of move keys on one line and each item use or purchase on its own
+        line.
+
+    Parameters:
+        commands: The move keys, item uses and purchases to format.
+    """
+    lines, moves = [], []
+    for command in commands:
+        if command in MOVE_DELTAS:
+            moves.append(command)
+            continue
+        if moves:
+            lines.append(''.join(moves))
+            moves = []
+        lines.append(command)
+    if moves:
+        lines.append(''.join(moves))
+    return '\n'.join(lines)
+
+
+class SimulationResult:
+    """ The outcome of running a move script on a game without a display. """
+
+    def __init__(
+        self,
+        model: Model,
+        num_commands: int,
+        elapsed: float
+    ) -> None:
+        """ Records the final state of the model.
+
+        Parameters:
+            model: The model the commands were applied to.
+            num_commands: The number of commands which were applied.
+            elapsed: The time taken to apply the commands, in seconds.
+        """
+        self._won = model.has_won()
+        self._lost = model.has_lost()
+        # A won game has moved past its last level, so report that one
+        self._level_num = min(model.get_level_num(), len(model.get_levels()) - 1)
+        self._num_moves = model.get_num_moves()
+        self._position = model.get_player().get_position()
+        self._stats = model.get_player_stats()
+        self._inventory = str(model.get_player_inventory())
+        self._num_commands = num_commands
+        self._elapsed = elapsed
+
+    def has_won(self) -> bool:
+        """ Returns True iff every level was completed. """
+        return self._won
+
+    def has_lost(self) -> bool:
+        """ Returns True iff the player ran out of HP or got too hungry or
+            thirsty.
+        """
+        return self._lost
+
+    def get_level_num(self) -> int:
+        """ Returns the index of the level the game finished on. """
+        return self._level_num
+
+    def get_num_moves(self) -> int:
+        """ Returns the number of successful moves made by the player. """
+        return self._num_moves
+
+    def get_position(self) -> tuple[int, int]:
+        """ Returns the final (row, column) position of the player. """
+        return self._position
+
+    def get_player_stats(self) -> tuple[int, int, int]:
+        """ Returns the final (HP, hunger, thirst) of the player. """
+        return self._stats
+
+    def get_num_commands(self) -> int:
+        """ Returns the number of commands which were applied. """
+        return self._num_commands
+
+    def get_commands_per_second(self) -> float:
+        """ Returns the rate at which commands were applied. """
+        return self._num_commands / self._elapsed if self._elapsed else 0.0
+
+    def __str__(self) -> str:
+        """ Returns a human readable summary of the result. """
+        outcome = 'won' if self._won else 'lost' if self._lost else 'unfinished'
+        hp, hunger, thirst = self._stats
+        inventory = self._inventory.replace('\n', ', ') or 'Empty'
+        return (f'Outcome: {outcome}\n'
+                f'Level: {self._level_num + 1}\n'
+                f'Position: {self._position}\n'
+                f'HP: {hp}, hunger: {hunger}, thirst: {thirst}\n'
+                f'Inventory: {inventory}\n'
+                f'Moves: {self._num_moves}\n'
+                f'Commands: {self._num_commands} '
+                f'({self.get_commands_per_second():,.0f}/s)')
+
+    def __repr__(self) -> str:
+        """ Returns a computer representation of this result. """
+        return (f'SimulationResult(won={self._won}, lost={self._lost}, '
+                f'moves={self._num_moves})')
+
+
+class HeadlessRunner:
+    """ Applies moves, item uses and purchases to a Model without rendering
+        anything.
+
+        A runner plays one game by the exact rules of Model, so its throughput
+        is that of Model.move_player (a few hundred thousand commands per
+        second), not millions. Each command depends on the state left by the
+        previous one, so a single script cannot be batched. To play many
+        games of a level at once, e.g. to search over move sequences, use
+        lockstep.LockstepEngine instead.
+    """
+    # Maps the names of the items which can be bought to their (ID, class)
+    SHOP_ITEMS = {item.__name__: (item_id, item)
+                  for item_id, item in Level.ENTITIES.items()}
+
+    def __init__(
+        self,
+        game: str | Model,
+        prices: Optional[dict[str, int]] = None,
+        shop_items: Optional[dict[str, tuple[str, type]]] = None
+    ) -> None:
+        """ Sets up a new game, or takes over an existing one.
+
+        Parameters:
+            game: Path to the file from which the game levels are loaded, or
+                a game already in progress.
+            prices: Maps item IDs to their price in coins, if items can be
+                bought from a shop (e.g. ITEM_PRICE).
+            shop_items: Maps the names of the items which can be bought to
+                their (ID, class), if not just SHOP_ITEMS.
+        """
+        self._model = Model(game) if isinstance(game, str) else game
+        self._prices = prices
+        self._shop_items = self.SHOP_ITEMS if shop_items is None else shop_items
+
+    def get_model(self) -> Model:
+        """ Returns the model being driven by this runner. """
+        return self._model
+
+    def apply(self, command: str) -> bool:
+        """ Applies a single move key or item use command to the model.
+
+        Parameters:
+            command: A move key (e.g. 'w'), an item use (e.g. 'i Apple') or a
+                purchase (e.g. 'b Water').
+
+        Returns:
+            True iff the command was valid and could be applied.
+        """
+        delta = MOVE_DELTAS.get(command)
+        if delta is not None:
+            self._model.move_player(delta)
+            return True
+
+        if command.startswith('i '):
+            player = self._model.get_player()
+            item = player.get_inventory().remove_item(command[2:].strip())
+            if item is not None:
+                item.apply(player)
+                return True
+
+        elif command.startswith('b ') and self._prices is not None:
+            return self._buy(command[2:].strip())
+        return False
+
+    def _buy(self, item_name: str) -> bool:
+        """ Buys an item from the shop with the player's coins.
+
+        Parameters:
+            item_name: The name of the item to buy.
+
+        Returns:
+            True iff the item exists in the shop and could be afforded.
+        """
+        item_id, item = self._shop_items.get(item_name, (None, None))
+        price = self._prices.get(item_id)
+        player = self._model.get_player()
+        inventory = player.get_inventory()
+        if price is None or not inventory.spend(price):
+            return False
+        inventory.add_item(item(player.get_position()))
+        return True
+
+    def run(self, commands: Iterable[str]) -> SimulationResult:
+        """ Applies commands until they run out or the game is won or lost.
+
+        Parameters:
+            commands: The move keys and item use commands to apply.
+
+        Returns:
+            The final state of the game.
+        """
+        model = self._model
+        move_player, deltas = model.move_player, MOVE_DELTAS
+        has_won, has_lost = model.has_won, model.has_lost
+        num_commands = 0
+        start = time.perf_counter()
+        for command in commands:
+            delta = deltas.get(command)
+            if delta is not None:
+                move_player(delta)
+            else:
+                self.apply(command)
+            num_commands += 1
+            if has_won() or has_lost():
+                break
+        elapsed = time.perf_counter() - start
+        return SimulationResult(model, num_commands, elapsed)
+
+
+def main() -> None:
+    """ Entry-point for running move scripts from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Run a move script against game files without a display.'
+    )
+    parser.add_argument('game_files', nargs='+', help='game files to play')
+    parser.add_argument(
+        '-s', '--script', default='-',
+        help="move script to apply to every game ('-' reads stdin)"
+    )
+    parser.add_argument('--shop', action='store_true',
+                        help='allow items to be bought with coins')
+    args = parser.parse_args()
+
+    if args.script == '-':
+        commands = list(parse_commands(sys.stdin))
+    else:
+        with open(args.script) as file:
+            commands = list(parse_commands(file))
+
+    for game_file in args.game_files:
+        prices = ITEM_PRICE if args.shop else None
+        result = HeadlessRunner(game_file, prices).run(commands)
+        print(f'{game_file}\n{result}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+import argparse
+import csv
+import functools
+import json
+import os
+import sys
+import time
+from collections import defaultdict, deque
+from typing import Callable, Optional
+
+import a2_solution
+from a2_solution import *
+from headless import HeadlessRunner, parse_commands
+from levelpack import LevelPack
+
+# The functions timed when playing without a display, as (owner, attribute).
+# Games are opened through load_levels, and each level is parsed by its
+# index's _parse_template the first time it is played.
+MODEL_TARGETS = [
+    (Model, 'move_player'),
+    (Model, 'attempt_collect_item'),
+    (a2_solution, 'load_levels'),
+    (LevelIndex, '_parse_template'),
+    (LevelPack, '_parse_template'),
+    (LevelTemplate, 'create_level'),
+]
+
+
+class Instrumentation:
+    """ Optional timing hooks around a set of functions and methods.
+
+        Nothing is changed until the hooks are enabled: enabling replaces each
+        target attribute with a wrapper which records how long every call took,
+        and disabling puts the originals back, so instrumentation costs nothing
+        while it is off.
+    """
+    _enabled = False
+
+    def __init__(
+        self,
+        targets: list[tuple[object, str]],
+        max_events: int = TRACE_EVENTS
+    ) -> None:
+        """ Sets up disabled hooks for the given targets.
+
+        Parameters:
+            targets: The (class or module, attribute name) of each function to time.
+            max_events: The number of most recent calls to keep.
+        """
+        self._targets = targets
+        self._originals = []
+        self._events = deque(maxlen=max_events)  # (name, start, duration) of each call
+
+    def enable(self) -> None:
+        """ Wraps every target in a timing hook, ignored if already enabled. """
+        if self._enabled:
+            return
+        for owner, attribute in self._targets:
+            self._originals.append((owner, attribute, vars(owner).get(attribute)))
+            name = f'{owner.__name__}.{attribute}'
+            setattr(owner, attribute, self._wrap(name, getattr(owner, attribute)))
+        self._enabled = True
+
+    def disable(self) -> None:
+        """ Restores every target to the original function. """
+        for owner, attribute, original in reversed(self._originals):
+            if original is None:
+                # The attribute was inherited, so removing the hook exposes it again
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+        self._originals.clear()
+        self._enabled = False
+
+    def is_enabled(self) -> bool:
+        """ Returns True iff the timing hooks are in place. """
+        return self._enabled
+
+    def _wrap(self, name: str, function: Callable) -> Callable:
+        """ Returns a function which calls function and records how long it took. """
+        events = self._events
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                events.append((name, start, clock() - start))
+        return timed
+
+    def clear(self) -> None:
+        """ Forgets every recorded call. """
+        self._events.clear()
+
+    def get_durations(self, name: str) -> list[float]:
+        """ Returns the recorded durations in seconds of the calls to the named
+            target, e.g. 'Model.move_player'.
+        """
+        return [duration for event, _, duration in self._events if event == name]
+
+    def get_percentile(self, name: str, percent: float) -> Optional[float]:
+        """ Returns a percentile of the recorded durations of the named target.
+
+        Parameters:
+            name: The name of the target, e.g. 'Model.move_player'.
+            percent: The percentile to return, from 0 to 100.
+
+        Returns:
+            The duration in seconds, or None if no calls have been recorded.
+        """
+        durations = sorted(self.get_durations(name))
+        if not durations:
+            return None
+        rank = min(len(durations) - 1, int(len(durations) * percent / 100))
+        return durations[rank]
+
+    def get_summary(self) -> dict[str, tuple[int, float, float]]:
+        """ Returns a mapping from the name of each target called to its number
+            of calls and median and 99th percentile durations in seconds.
+        """
+        names = dict.fromkeys(name for name, _, _ in self._events)
+        return {name: (len(self.get_durations(name)),
+                       self.get_percentile(name, 50),
+                       self.get_percentile(name, 99))
+                for name in names}
+
+    def export(self, filename: str) -> None:
+        """ Writes the recorded calls to a trace file. A .csv file gets one row
+            per call. Any other file gets JSON in the trace event format read
+            by chrome://tracing and Perfetto.
+
+        Parameters:
+            filename: The path of the trace file to write.
+        """
+        if filename.endswith('.csv'):
+            with open(filename, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['name', 'start_ms', 'duration_ms'])
+                for name, start, duration in self._events:
+                    writer.writerow([name, f'{start * 1000:.3f}', f'{duration * 1000:.3f}'])
+        else:
+            events = [{'name': name, 'ph': 'X', 'ts': start * 1e6,
+                       'dur': duration * 1e6, 'pid': 0, 'tid': 0}
+                      for name, start, duration in self._events]
+            with open(filename, 'w') as file:
+                json.dump({'traceEvents': events}, file)
+
+
+def get_rss() -> Optional[int]:
+    """ Returns the resident set size of this process in bytes. Where
+        /proc is unavailable this is the peak rather than the current size,
+        and None if neither can be read.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class StackProfiler:
+    """ Records how long is spent in every distinct call stack, for flame
+        graphs.
+
+        A profile hook sees every Python and built-in function call and
+        return, and charges the time since the previous event to the stack
+        which was running, so each stack's total is the time spent in its
+        innermost function while called along exactly that path.
+    """
+
+    def __init__(self) -> None:
+        """ Sets up a profiler which has recorded nothing. """
+        self._stacks = []  # The key of each stack, outermost call first
+        self._times = defaultdict(float)  # Maps stack keys to seconds
+        self._last = 0.0
+
+    def enable(self) -> None:
+        """ Starts recording calls made by this thread. """
+        self._last = time.perf_counter()
+        sys.setprofile(self._profile)
+
+    def disable(self) -> None:
+        """ Stops recording calls. """
+        sys.setprofile(None)
+        self._stacks.clear()
+
+    def _profile(self, frame, event: str, arg) -> None:
+        """ The profile hook, called on every call and return. """
+        now = time.perf_counter()
+        stacks = self._stacks
+        if stacks:
+            self._times[stacks[-1]] += now - self._last
+        if event == 'call':
+            code = frame.f_code
+            name = f'{os.path.basename(code.co_filename)}:{code.co_firstlineno}:{code.co_name}'
+        elif event == 'c_call':
+            name = getattr(arg, '__qualname__', repr(arg))
+        else:
+            # Returns from functions entered before recording began are ignored
+            if stacks:
+                stacks.pop()
+            self._last = time.perf_counter()
+            return
+        name = name.replace(' ', '_').replace(';', ':')
+        stacks.append(f'{stacks[-1]};{name}' if stacks else name)
+        self._last = time.perf_counter()
+
+    def write_collapsed(self, filename: str) -> None:
+        """ Writes the recorded stacks in the collapsed stack format read by
+            flamegraph.pl and speedscope, one stack per line with the time
+            spent in it in microseconds.
+
+        Parameters:
+            filename: The path of the file to write.
+        """
+        with open(filename, 'w') as file:
+            for stack, seconds in self._times.items():
+                microseconds = round(seconds * 1e6)
+                if microseconds > 0:
+                    file.write(f'{stack} {microseconds}\n')
+
+
+def main() -> None:
+    """ Entry-point for timing a move script from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Time the model while a move script is played.'
+    )
+    parser.add_argument('game_file', help='game file to play')
+    parser.add_argument('script', help='move script to apply')
+    parser.add_argument('-t', '--trace',
+                        help='write the calls to a .json or .csv trace file')
+    parser.add_argument('-c', '--collapsed',
+                        help='profile the run and write collapsed stacks')
+    args = parser.parse_args()
+
+    with open(args.script) as file:
+        commands = list(parse_commands(file))
+    instrumentation = Instrumentation(MODEL_TARGETS)
+    instrumentation.enable()
+    profiler = StackProfiler() if args.collapsed else None
+    if profiler is not None:
+        profiler.enable()
+    HeadlessRunner(args.game_file, ITEM_PRICE).run(commands)
+    if profiler is not None:
+        profiler.disable()
+        profiler.write_collapsed(args.collapsed)
+    instrumentation.disable()
+
+    for name, (calls, p50, p99) in instrumentation.get_summary().items():
+        print(f'{name}: {calls} calls, p50 {p50 * 1e6:.1f} us, p99 {p99 * 1e6:.1f} us')
+    if args.trace:
+        instrumentation.export(args.trace)
+
+
+if __name__ == '__main__':
+    main()
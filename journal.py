@@ -0,0 +1,182 @@
+import argparse
+import os
+import struct
+import time
+from typing import Optional
+
+from a2_solution import *
+from headless import HeadlessRunner, parse_commands
+from snapshot import dump_snapshot, restore_snapshot, write_atomically
+
+JOURNAL_FILE = 'journal.txt'
+CHECKPOINT_FILE = 'checkpoint.sav'
+
+# Checkpoint header: length of the journal when the checkpoint was taken
+_OFFSET = struct.Struct('<Q')
+
+
+class Journal:
+    """ Autosaves a game as an append-only journal of the commands applied to
+        it, plus periodic checkpoints of the whole game.
+
+        Commands are written in the move script format read by
+        parse_commands, so recovering is a matter of loading the latest
+        checkpoint and replaying the journal from the byte offset it records.
+        The journal is unbuffered, so each command reaches the operating
+        system as soon as it is recorded and survives the game crashing.
+    """
+    _model = None
+    _file = None
+
+    def __init__(
+        self,
+        directory: str,
+        checkpoint_interval: int = AUTOSAVE_INTERVAL
+    ) -> None:
+        """ Sets up a journal which keeps its files in the given directory.
+
+        Parameters:
+            directory: The directory to keep the journal and checkpoint in.
+            checkpoint_interval: The number of commands between checkpoints.
+        """
+        self._directory = directory
+        self._journal_file = os.path.join(directory, JOURNAL_FILE)
+        self._checkpoint_file = os.path.join(directory, CHECKPOINT_FILE)
+        self._checkpoint_interval = checkpoint_interval
+        self._num_commands = 0
+
+    def start(self, model: Model) -> None:
+        """ Starts journalling a game from its current state, replacing any
+            previous journal.
+
+        Parameters:
+            model: The game to journal.
+        """
+        self.close()
+        os.makedirs(self._directory, exist_ok=True)
+        self._model = model
+        self._file = open(self._journal_file, 'wb', buffering=0)
+        self.checkpoint()
+
+    def record(self, command: str) -> None:
+        """ Appends a command which has just been applied to the game.
+
+        Parameters:
+            command: A move key (e.g. 'w'), an item use (e.g. 'i Apple') or a
+                purchase (e.g. 'b Water').
+        """
+        if self._file is None:
+            return
+        if command in MOVE_DELTAS:
+            self._file.write(command.encode())
+        else:
+            self._file.write(f'\n{command}\n'.encode())
+        self._num_commands += 1
+        if self._num_commands >= self._checkpoint_interval \
+                and not self._model.has_won():
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """ Saves the whole game along with the current end of the journal. """
+        offset = self._file.tell()
+        data = dump_snapshot(self._model, self._checkpoint_file)
+        write_atomically(self._checkpoint_file, _OFFSET.pack(offset) + data)
+        self._num_commands = 0
+
+    def close(self) -> None:
+        """ Stops journalling, keeping the files so the game can be recovered. """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """ Stops journalling and deletes the files, e.g. once the game is over. """
+        self.close()
+        for filename in (self._checkpoint_file, self._journal_file):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+def recover(
+    directory: str,
+    prices: Optional[dict[str, int]] = None,
+    shop_items: Optional[dict[str, tuple[str, type]]] = None
+) -> Optional[Model]:
+    """ Rebuilds a journalled game by loading its latest checkpoint and
+        replaying the commands recorded after it.
+
+    Parameters:
+        directory: The directory the journal was kept in.
+        prices: Maps item IDs to their price in coins, to replay purchases.
+        shop_items: Maps the names of the items which can be bought or held
+            to their (ID, class), if not just HeadlessRunner.SHOP_ITEMS.
+
+    Returns:
+        The recovered game, or None if there is nothing to recover.
+    """
+    checkpoint_file = os.path.join(directory, CHECKPOINT_FILE)
+    journal_file = os.path.join(directory, JOURNAL_FILE)
+    if not os.path.exists(checkpoint_file):
+        return None
+    if shop_items is None:
+        shop_items = HeadlessRunner.SHOP_ITEMS
+
+    with open(checkpoint_file, 'rb') as file:
+        data = file.read()
+    try:
+        offset, = _OFFSET.unpack_from(data)
+        item_classes = dict(shop_items.values())
+        model = restore_snapshot(data[_OFFSET.size:], checkpoint_file,
+                                 item_classes)
+    except (OSError, ValueError, struct.error, KeyError):
+        return None
+
+    runner = HeadlessRunner(model, prices, shop_items)
+    if os.path.exists(journal_file):
+        with open(journal_file, 'rb') as file:
+            file.seek(offset)
+            lines = file.read().decode(errors='replace').splitlines()
+        runner.run(parse_commands(lines))
+    return model
+
+
+def main() -> None:
+    """ Entry-point for timing the journal against a move script. """
+    parser = argparse.ArgumentParser(
+        description='Journal a move script and check that it recovers.'
+    )
+    parser.add_argument('game_file', help='game file to play')
+    parser.add_argument('script', help='move script to apply')
+    parser.add_argument('-d', '--directory', default=AUTOSAVE_DIRECTORY,
+                        help='directory to keep the journal in')
+    parser.add_argument('-n', '--interval', type=int, default=AUTOSAVE_INTERVAL,
+                        help='number of commands between checkpoints')
+    args = parser.parse_args()
+
+    with open(args.script) as file:
+        commands = list(parse_commands(file))
+    runner = HeadlessRunner(args.game_file, ITEM_PRICE)
+    model = runner.get_model()
+    journal = Journal(args.directory, args.interval)
+    journal.start(model)
+    start = time.perf_counter()
+    for command in commands:
+        if model.has_won() or model.has_lost():
+            break
+        runner.apply(command)
+        journal.record(command)
+    elapsed = time.perf_counter() - start
+    journal.close()
+
+    recovered = recover(args.directory, ITEM_PRICE)
+    same = recovered is not None \
+        and recovered.get_level_num() == model.get_level_num() \
+        and recovered.get_player_stats() == model.get_player_stats() \
+        and recovered.get_num_moves() == model.get_num_moves()
+    print(f'{len(commands)} commands journalled in {elapsed * 1000:.1f} ms '
+          f'({elapsed / max(len(commands), 1) * 1e6:.1f} us each), '
+          f'recovery {"matches" if same else "differs"}')
+
+
+if __name__ == '__main__':
+    main()
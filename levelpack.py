@@ -0,0 +1,186 @@
+import argparse
+import mmap
+import struct
+
+from a2_solution import *
+from snapshot import write_atomically
+
+# Pack header: magic, format version, number of levels
+_HEADER = struct.Struct('<4sHI')
+# Offset table entry: byte offset of a level record from the start of the file
+_OFFSET = struct.Struct('<Q')
+# Level record header: #rows, #columns, #entities, #doors
+_LEVEL = struct.Struct('<IIII')
+# Entity entry: cell index (row * #columns + column), entity ID
+_ENTITY = struct.Struct('<Ic')
+# Door entry: cell index
+_DOOR = struct.Struct('<I')
+
+
+class LevelPack(LevelIndex):
+    """ A game file in the binary level pack format, read through mmap.
+
+        A pack holds a header, a table of level offsets, and one record per
+        level. Each record is the level's dimensions and entity and door
+        counts, followed by the raw tile IDs (one byte per cell, row by row),
+        the entities as (cell, ID) and the door cells. Storing tiles
+        one byte per cell rather than run-length encoded lets a Maze use its
+        slice of the mapped file directly, without copying or parsing it.
+
+        Levels are loaded on demand and cached as templates, like LevelIndex.
+    """
+    def _read_index(self) -> None:
+        """ Maps the pack into memory and reads its header and offset table. """
+        with open(self._filename, 'rb') as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._data)
+
+        magic, version, num_levels = _HEADER.unpack_from(self._view)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f'{self._filename} is not a version '
+                             f'{PACK_VERSION} level pack')
+        self._offsets = [
+            offset for offset, in _OFFSET.iter_unpack(
+                self._view[_HEADER.size:_HEADER.size + num_levels * _OFFSET.size]
+            )
+        ]
+        self._dimensions = [self.get_dimensions(level_num)
+                            for level_num in range(num_levels)]
+
+    def get_dimensions(self, level_num: int) -> tuple[int, int]:
+        """ Returns the (#rows, #columns) of the level at the given index. """
+        return tuple(_LEVEL.unpack_from(self._view, self._offsets[level_num])[:2])
+
+    def _parse_template(self, level_num: int) -> LevelTemplate:
+        """ Reads a single level from the pack. The template's grid refers
+            directly to the mapped tile IDs.
+        """
+        if not 0 <= level_num < len(self._offsets):
+            raise IndexError(f'level {level_num} is not in {self._filename}')
+        offset = self._offsets[level_num]
+        rows, cols, num_entities, num_doors = _LEVEL.unpack_from(self._view, offset)
+        offset += _LEVEL.size
+        grid = self._view[offset:offset + rows * cols]
+        offset += rows * cols
+        entities = self._view[offset:offset + num_entities * _ENTITY.size]
+        offset += num_entities * _ENTITY.size
+        doors = self._view[offset:offset + num_doors * _DOOR.size]
+
+        door_positions = tuple(divmod(cell, cols) for cell, in _DOOR.iter_unpack(doors))
+        items, player_start = [], None
+        for cell, entity_id in _ENTITY.iter_unpack(entities):
+            if entity_id == PLAYER.encode():
+                player_start = divmod(cell, cols)
+            else:
+                items.append((divmod(cell, cols), entity_id.decode('latin-1')))
+        return LevelTemplate((rows, cols), grid, door_positions, tuple(items),
+                             player_start)
+
+    def close(self) -> None:
+        """ Unmaps the pack. Levels loaded from it must no longer be used. """
+        self._templates.clear()
+        self._view.release()
+        self._data.close()
+
+    def __repr__(self) -> str:
+        """ Returns a computer representation of this pack. """
+        return f'LevelPack({self._filename!r})'
+
+
+def _pack_level(level: Level) -> bytes:
+    """ Returns the pack record for a single level. """
+    maze = level.get_maze()
+    rows, cols = maze.get_num_rows(), maze.get_dimensions()[1]
+    entities = [(position, item.get_id())
+                for position, item in level.get_items().items()]
+    if level.get_player_start() is not None:
+        entities.append((level.get_player_start(), PLAYER))
+    doors = maze.get_door_positions()
+
+    record = [_LEVEL.pack(rows, cols, len(entities), len(doors)), maze.get_grid()]
+    record.extend(_ENTITY.pack(row * cols + col, entity_id.encode('latin-1'))
+                  for (row, col), entity_id in entities)
+    record.extend(_DOOR.pack(row * cols + col) for row, col in doors)
+    return b''.join(record)
+
+
+def pack_game(game_file: str, pack_file: str) -> int:
+    """ Converts a game file to the binary level pack format.
+
+    Parameters:
+        game_file: The game file to convert, in either format
+        pack_file: The path to write the level pack to
+
+    Returns:
+        The number of levels written
+    """
+    levels = load_levels(game_file)
+    num_levels = len(levels)
+    records = [_pack_level(levels.load_level(level_num))
+               for level_num in range(num_levels)]
+    offsets, offset = [], _HEADER.size + num_levels * _OFFSET.size
+    for record in records:
+        offsets.append(offset)
+        offset += len(record)
+    data = [_HEADER.pack(PACK_MAGIC, PACK_VERSION, num_levels)]
+    data.extend(_OFFSET.pack(offset) for offset in offsets)
+    data.extend(records)
+    # An open LevelPack may have the destination mapped, so it must never be
+    # truncated in place
+    write_atomically(pack_file, b''.join(data))
+    return num_levels
+
+
+def _level_text(level: Level) -> str:
+    """ Returns the dimensions and rows of a level in the text format. """
+    rows, cols = level.get_dimensions()
+    cells = bytearray(level.get_maze().get_grid())
+    entities = [(position, item.get_id())
+                for position, item in level.get_items().items()]
+    entities.append((level.get_player_start(), PLAYER))
+    for position, entity_id in entities:
+        if position is not None:
+            cells[position[0] * cols + position[1]] = ord(entity_id)
+    text = cells.decode('latin-1')
+    lines = [f'{rows} {cols}']
+    lines.extend(text[start:start + cols] for start in range(0, len(text), cols))
+    return '\n'.join(lines) + '\n\n'
+
+
+def unpack_game(pack_file: str, game_file: str) -> int:
+    """ Converts a level pack back to the text game file format.
+
+    Parameters:
+        pack_file: The level pack to convert
+        game_file: The path to write the text game file to
+
+    Returns:
+        The number of levels written
+    """
+    pack = LevelPack(pack_file)
+    with open(game_file, 'w') as file:
+        for level_num in range(len(pack)):
+            file.write(f'Maze {level_num + 1} - ')
+            file.write(_level_text(pack.load_level(level_num)))
+    pack.close()
+    return len(pack)
+
+
+def main() -> None:
+    """ Entry-point for converting game files from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Convert game files to and from the binary level pack format.'
+    )
+    parser.add_argument('source', help='game file to convert')
+    parser.add_argument('destination', help='path of the converted file')
+    parser.add_argument('-u', '--unpack', action='store_true',
+                        help='convert a level pack back to the text format')
+    args = parser.parse_args()
+
+    convert = unpack_game if args.unpack else pack_game
+    num_levels = convert(args.source, args.destination)
+    print(f'{args.source} -> {args.destination}: {num_levels} levels')
+
+
+if __name__ == '__main__':
+    main()
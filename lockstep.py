@@ -0,0 +1,269 @@
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+
+from a2_solution import *
+
+# Move keys in the order of the direction indices used by the engine
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+_ROW_DELTAS = np.array([MOVE_DELTAS[key][0] for key in DIRECTIONS])
+_COL_DELTAS = np.array([MOVE_DELTAS[key][1] for key in DIRECTIONS])
+
+
+class LockstepEngine:
+    """ Simulates many independent games of one level at once.
+
+        The level grid is stored once, and the state of every game is held in
+        NumPy arrays indexed by game, so each step advances all of the games
+        with a handful of array operations. The rules follow Model.move_player:
+        moves cost 1 HP plus the tile's damage, hunger and thirst rise every
+        fifth move, coins are collected by stepping on them, the doors unlock
+        after a move once no coins remain, and stepping out of the maze from a
+        door exits the level.
+
+        Games stop advancing once they have exited the level or been lost.
+        Only moves are simulated; items other than coins are ignored.
+    """
+
+    def __init__(
+        self,
+        level: Level,
+        num_games: int,
+        player_stats: tuple[int, int, int] = (MAX_HEALTH, 0, 0),
+        num_moves: int = 0
+    ) -> None:
+        """ Sets up num_games games at the start of the given level.
+
+        Parameters:
+            level: The level to simulate.
+            num_games: The number of games to simulate at once.
+            player_stats: The starting (HP, hunger, thirst) of every player.
+            num_moves: The number of moves already made by every player, which
+                determines when hunger and thirst next rise.
+        """
+        maze = level.get_maze()
+        rows, cols = self._shape = (maze.get_num_rows(), maze.get_dimensions()[1])
+        grid = np.frombuffer(maze.get_grid(), dtype=np.uint8).reshape(rows, cols)
+        self._blocking = grid == ord(WALL)
+        self._is_door = grid == ord(DOOR)
+        self._damage = np.where(grid == ord(LAVA), LAVA_DAMAGE, 0)
+
+        # Each coin gets an index into the per-game collected arrays
+        self._coin_index = np.full((rows, cols), -1)
+        coins = [position for position, item in level.get_items().items()
+                 if item.get_id() == COIN]
+        for index, (row, col) in enumerate(coins):
+            self._coin_index[row, col] = index
+        self._num_coins = len(coins)
+
+        start_row, start_col = level.get_player_start()
+        hp, hunger, thirst = player_stats
+        self._row = np.full(num_games, start_row)
+        self._col = np.full(num_games, start_col)
+        self._hp = np.full(num_games, hp)
+        self._hunger = np.full(num_games, hunger)
+        self._thirst = np.full(num_games, thirst)
+        self._moves = np.full(num_games, num_moves)
+        self._collected = np.zeros((num_games, self._num_coins), dtype=bool)
+        self._remaining = np.full(num_games, self._num_coins)
+        self._door_unlocked = np.zeros(num_games, dtype=bool)
+        self._exited = np.zeros(num_games, dtype=bool)
+
+    def get_num_games(self) -> int:
+        """ Returns the number of games being simulated. """
+        return len(self._row)
+
+    def get_positions(self) -> np.ndarray:
+        """ Returns the (row, column) position of each player as an (n, 2)
+            array.
+        """
+        return np.stack([self._row, self._col], axis=1)
+
+    def get_player_stats(self) -> np.ndarray:
+        """ Returns the (HP, hunger, thirst) of each player as an (n, 3) array.
+        """
+        return np.stack([self._hp, self._hunger, self._thirst], axis=1)
+
+    def get_num_moves(self) -> np.ndarray:
+        """ Returns the number of successful moves made in each game. """
+        return self._moves.copy()
+
+    def get_collected(self) -> np.ndarray:
+        """ Returns an (n, #coins) array of which coins each game collected. """
+        return self._collected.copy()
+
+    def get_door_unlocked(self) -> np.ndarray:
+        """ Returns whether the doors have been unlocked in each game. """
+        return self._door_unlocked.copy()
+
+    def get_exited(self) -> np.ndarray:
+        """ Returns whether each game has exited the level through a door. """
+        return self._exited.copy()
+
+    def get_lost(self) -> np.ndarray:
+        """ Returns whether each game has been lost (HP too low or hunger or
+            thirst too high).
+        """
+        return (self._hp <= 0) | (self._hunger >= MAX_HUNGER) \
+            | (self._thirst >= MAX_THIRST)
+
+    def get_active(self) -> np.ndarray:
+        """ Returns whether each game is still being played. """
+        return ~(self._exited | self.get_lost())
+
+    def step(self, directions: np.ndarray) -> None:
+        """ Attempts one move in every active game.
+
+        Parameters:
+            directions: For each game, the index into DIRECTIONS of the move
+                to make, or -1 to skip that game for this step.
+        """
+        directions = np.asarray(directions)
+        rows, cols = self._shape
+        active = self.get_active() & (directions >= 0)
+        directions = np.where(active, directions, 0)
+        row, col = self._row, self._col
+        new_row = row + np.where(active, _ROW_DELTAS[directions], 0)
+        new_col = col + np.where(active, _COL_DELTAS[directions], 0)
+
+        # Leaving the maze is only possible from a door
+        outside = (new_row < 0) | (new_row >= rows) \
+            | (new_col < 0) | (new_col >= cols)
+        exits = active & outside & self._is_door[row % rows, col % cols]
+
+        # Like list indexing, negative positions wrap around to the other side
+        in_range = (new_row >= -rows) & (new_row < rows) \
+            & (new_col >= -cols) & (new_col < cols)
+        tile_row = np.where(in_range, new_row % rows, 0)
+        tile_col = np.where(in_range, new_col % cols, 0)
+        blocked = ~in_range | self._blocking[tile_row, tile_col] \
+            | (self._is_door[tile_row, tile_col] & ~self._door_unlocked)
+        moving = active & ~exits & ~blocked
+
+        self._moves += moving
+        tick = moving & (self._moves % 5 == 0)
+        self._hunger = np.minimum(self._hunger + tick, MAX_HUNGER)
+        self._thirst = np.minimum(self._thirst + tick, MAX_THIRST)
+        damage = moving * (1 + self._damage[tile_row, tile_col])
+        self._hp = np.clip(self._hp - damage, 0, MAX_HEALTH)
+        self._row = np.where(moving, new_row, row)
+        self._col = np.where(moving, new_col, col)
+
+        coin = self._coin_index[tile_row, tile_col]
+        games = np.flatnonzero(moving & (coin >= 0))
+        coins = coin[games]
+        new = ~self._collected[games, coins]
+        self._collected[games[new], coins[new]] = True
+        self._remaining[games[new]] -= 1
+
+        self._door_unlocked |= moving & (self._remaining == 0)
+        self._exited |= exits
+
+    def run(self, directions: np.ndarray) -> None:
+        """ Applies a sequence of steps.
+
+        Parameters:
+            directions: A (#steps, #games) array of direction indices, as
+                accepted by step.
+        """
+        for step in directions:
+            if not self.get_active().any():
+                break
+            self.step(step)
+
+
+def check_conformance(
+    game_file: str,
+    num_games: int = 64,
+    num_steps: int = 500,
+    seed: int = 0,
+    level_num: int = 0,
+    directions: Optional[np.ndarray] = None
+) -> list[int]:
+    """ Compares playthroughs of a level of a game in the engine against the
+        reference Model.
+
+    Parameters:
+        game_file: The game file to play.
+        num_games: The number of random playthroughs.
+        num_steps: The number of moves attempted in each playthrough.
+        seed: Seed for the random moves.
+        level_num: The index of the level to play.
+        directions: A (#steps, #games) array of the moves to make, as
+            accepted by LockstepEngine.run, instead of random ones.
+
+    Returns:
+        The indices of the playthroughs whose final states differ.
+    """
+    if directions is None:
+        rng = np.random.default_rng(seed)
+        directions = rng.integers(0, len(DIRECTIONS), size=(num_steps, num_games))
+    directions = np.asarray(directions)
+    num_games = directions.shape[1]
+    engine = LockstepEngine(load_levels(game_file).load_level(level_num), num_games)
+    engine.run(directions)
+
+    positions = engine.get_positions()
+    stats = engine.get_player_stats()
+    moves, exited = engine.get_num_moves(), engine.get_exited()
+    mismatches = []
+    for game in range(num_games):
+        model = Model(game_file)
+        if level_num > 0:
+            model.goto_level(level_num)
+        for direction in directions[:, game]:
+            if model.get_level_num() > level_num or model.has_lost():
+                break
+            if direction >= 0:
+                model.move_player(MOVE_DELTAS[DIRECTIONS[direction]])
+
+        same = (model.get_level_num() > level_num) == exited[game] \
+            and model.get_player_stats() == tuple(stats[game]) \
+            and model.get_num_moves() == moves[game]
+        if not exited[game]:
+            same = same and model.get_player().get_position() \
+                == tuple(positions[game])
+        if not same:
+            mismatches.append(game)
+    return mismatches
+
+
+def main() -> None:
+    """ Entry-point for timing random playthroughs from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Simulate random playthroughs of a level in lockstep.'
+    )
+    parser.add_argument('game_file', help='game file whose level to play')
+    parser.add_argument('-l', '--level', type=int, default=1,
+                        help='level number to play (default 1)')
+    parser.add_argument('-g', '--games', type=int, default=10_000,
+                        help='number of games to simulate')
+    parser.add_argument('-n', '--steps', type=int, default=500,
+                        help='number of moves to attempt in each game')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true',
+                        help='compare the engine against the reference Model')
+    args = parser.parse_args()
+
+    if args.check:
+        mismatches = check_conformance(args.game_file, seed=args.seed,
+                                       level_num=args.level - 1)
+        print('conformance:', 'ok' if not mismatches else
+              f'{len(mismatches)} mismatching games {mismatches}')
+
+    level = load_game(args.game_file)[args.level - 1]
+    engine = LockstepEngine(level, args.games)
+    rng = np.random.default_rng(args.seed)
+    directions = rng.integers(0, len(DIRECTIONS), size=(args.steps, args.games))
+    start = time.perf_counter()
+    engine.run(directions)
+    elapsed = time.perf_counter() - start
+    print(f'{args.games} games x {args.steps} steps in {elapsed:.3f}s '
+          f'({args.games * args.steps / elapsed:,.0f} moves/s), '
+          f'{engine.get_exited().sum()} exited, {engine.get_lost().sum()} lost')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+import argparse
+import os
+import struct
+import tempfile
+import time
+from typing import Optional
+
+from a2_solution import *
+
+# Snapshot header: magic, format version, length of the game file path
+_HEADER = struct.Struct('<4sHH')
+# Game file identity: modification time in nanoseconds, size in bytes
+_GAME = struct.Struct('<qQ')
+# Level index, #moves, HP, hunger, thirst, player row and column, doors unlocked
+_STATE = struct.Struct('<IIiiiiiB')
+# Length of the list which follows
+_COUNT = struct.Struct('<I')
+# Inventory entry: item ID, number held
+_STACK = struct.Struct('<cI')
+# Collected item entry: cell index (row * #columns + column)
+_CELL = struct.Struct('<I')
+
+
+def _game_path(game_file: str, snapshot_file: str) -> str:
+    """ Returns the path to game_file relative to the snapshot's directory, so
+        that a snapshot and its game file can be moved together.
+    """
+    directory = os.path.dirname(os.path.abspath(snapshot_file))
+    try:
+        return os.path.relpath(os.path.abspath(game_file), directory)
+    except ValueError:
+        # No relative path exists (e.g. they are on different drives)
+        return os.path.abspath(game_file)
+
+
+def _game_identity(game_file: str) -> tuple[int, int]:
+    """ Returns the modification time and size of a game file, which change
+        whenever the file is edited.
+    """
+    stat = os.stat(game_file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _pack_stacks(stacks: list[tuple[Item, int]]) -> list[bytes]:
+    """ Returns the encoded count and entries of a list of item stacks. """
+    data = [_COUNT.pack(len(stacks))]
+    data.extend(_STACK.pack(item.get_id().encode('latin-1'), count)
+                for item, count in stacks)
+    return data
+
+
+def _unpack_stacks(
+    data: bytes,
+    offset: int,
+    item_classes: dict[str, type],
+    position: tuple[int, int]
+) -> tuple[list[tuple[Item, int]], int]:
+    """ Decodes a list of item stacks written by _pack_stacks, recreating each
+        item at the given position. Returns the stacks and the offset of the
+        data which follows them.
+    """
+    num_stacks, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    stacks = [(item_classes[item_id.decode('latin-1')](position), count)
+              for item_id, count in _STACK.iter_unpack(
+                  data[offset:offset + num_stacks * _STACK.size])]
+    return stacks, offset + num_stacks * _STACK.size
+
+
+def dump_snapshot(model: Model, snapshot_file: str) -> bytes:
+    """ Encodes the state of a game as a delta against its game file.
+
+        Only what differs from the start of the current level is stored: the
+        level index, the player's stats, position, inventory and number of
+        moves, the inventory the level was started with, the items already
+        collected from the level, and whether its doors have been unlocked.
+        The game file's modification time and size are stored too, so that a
+        snapshot is not applied to a game file which has since been edited.
+
+    Parameters:
+        model: The game to encode.
+        snapshot_file: The path the snapshot will be written to, which the
+            stored game file path is relative to.
+
+    Returns:
+        The encoded snapshot.
+    """
+    game_file = model.get_levels().get_filename()
+    path = _game_path(game_file, snapshot_file).encode()
+    level_num = model.get_level_num()
+    level = model.get_level()
+    cols = level.get_dimensions()[1]
+    row, col = model.get_player().get_position()
+    hp, hunger, thirst = model.get_player_stats()
+
+    stacks = [(items[0], len(items))
+              for items in model.get_player_inventory().get_items().values()
+              if items]
+    start_items = model.get_levels().load_level(level_num).get_items()
+    collected = [row * cols + col for row, col in start_items
+                 if (row, col) not in level.get_items()]
+
+    data = [
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(path)),
+        path,
+        _GAME.pack(*_game_identity(game_file)),
+        _STATE.pack(level_num, model.get_num_moves(), hp, hunger, thirst,
+                    row, col, level.get_maze().is_unlocked()),
+    ]
+    data.extend(_pack_stacks(stacks))
+    data.extend(_pack_stacks(model.get_start_inventory()))
+    data.append(_COUNT.pack(len(collected)))
+    data.extend(_CELL.pack(cell) for cell in collected)
+    return b''.join(data)
+
+
+def save_snapshot(model: Model, snapshot_file: str) -> None:
+    """ Saves the state of a game. The snapshot is written to a temporary file
+        first and then moved into place, so an existing snapshot is never left
+        half written.
+
+    Parameters:
+        model: The game to save.
+        snapshot_file: The path to save the snapshot to.
+    """
+    write_atomically(snapshot_file, dump_snapshot(model, snapshot_file))
+
+
+def write_atomically(filename: str, data: bytes) -> None:
+    """ Replaces the contents of a file in one step, by writing to a
+        temporary file in the same directory and moving it into place.
+
+    Parameters:
+        filename: The path of the file to write.
+        data: The new contents of the file.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+    try:
+        with file:
+            file.write(data)
+        os.replace(file.name, filename)
+    except BaseException:
+        os.remove(file.name)
+        raise
+
+
+def load_snapshot(
+    snapshot_file: str,
+    item_classes: Optional[dict[str, type]] = None
+) -> Model:
+    """ Restores a game saved with save_snapshot.
+
+    Parameters:
+        snapshot_file: The path of the snapshot to load.
+        item_classes: Maps item IDs to the classes used to recreate the
+            player's inventory. Defaults to Level.ENTITIES.
+
+    Returns:
+        A model in the saved state.
+    """
+    with open(snapshot_file, 'rb') as file:
+        return restore_snapshot(file.read(), snapshot_file, item_classes)
+
+
+def restore_snapshot(
+    data: bytes,
+    snapshot_file: str,
+    item_classes: Optional[dict[str, type]] = None
+) -> Model:
+    """ Rebuilds the game described by an encoded snapshot.
+
+    Parameters:
+        data: The snapshot, as returned by dump_snapshot.
+        snapshot_file: The path the snapshot was read from, which the stored
+            game file path is relative to.
+        item_classes: Maps item IDs to the classes used to recreate the
+            player's inventory. Defaults to Level.ENTITIES.
+
+    Returns:
+        A model in the saved state.
+    """
+    if item_classes is None:
+        item_classes = Level.ENTITIES
+    try:
+        return _restore(data, snapshot_file, item_classes)
+    except struct.error as error:
+        raise ValueError(f'{snapshot_file} is truncated') from error
+
+
+def _restore(
+    data: bytes,
+    snapshot_file: str,
+    item_classes: dict[str, type]
+) -> Model:
+    """ Rebuilds the model described by the contents of a snapshot file. """
+    magic, version, path_length = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f'{snapshot_file} is not a version '
+                         f'{SNAPSHOT_VERSION} snapshot')
+    offset = _HEADER.size
+    path = data[offset:offset + path_length]
+    offset += path_length
+    if len(path) < path_length:
+        raise struct.error('game file path is incomplete')
+    directory = os.path.dirname(os.path.abspath(snapshot_file))
+    game_file = os.path.normpath(os.path.join(directory, path.decode()))
+    identity = _GAME.unpack_from(data, offset)
+    offset += _GAME.size
+    if _game_identity(game_file) != identity:
+        raise ValueError(f'{game_file} has changed since {snapshot_file} '
+                         f'was saved')
+    model = Model(game_file)
+
+    level_num, num_moves, hp, hunger, thirst, row, col, unlocked = \
+        _STATE.unpack_from(data, offset)
+    offset += _STATE.size
+    model.goto_level(level_num)
+    model.set_num_moves(num_moves)
+    player = model.get_player()
+    player.set_position((row, col))
+    player.change_health(hp - player.get_health())
+    player.change_hunger(hunger - player.get_hunger())
+    player.change_thirst(thirst - player.get_thirst())
+
+    stacks, offset = _unpack_stacks(data, offset, item_classes, (row, col))
+    for item, count in stacks:
+        player.get_inventory().add_item(item, count)
+    # goto_level took the start inventory from the empty new player
+    start_stacks, offset = _unpack_stacks(data, offset, item_classes,
+                                          (row, col))
+    model.set_start_inventory(start_stacks)
+
+    num_collected, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    level = model.get_level()
+    cols = level.get_dimensions()[1]
+    for cell, in _CELL.iter_unpack(
+        data[offset:offset + num_collected * _CELL.size]
+    ):
+        level.remove_item(divmod(cell, cols))
+    if unlocked:
+        level.get_maze().unlock_door()
+    return model
+
+
+def main() -> None:
+    """ Entry-point for timing snapshots of a game from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Time saving and loading a snapshot of a game.'
+    )
+    parser.add_argument('game_file', help='game file to snapshot')
+    parser.add_argument('snapshot_file', help='path to save the snapshot to')
+    parser.add_argument('-l', '--level', type=int, default=1,
+                        help='level number to snapshot (default 1)')
+    args = parser.parse_args()
+
+    model = Model(args.game_file)
+    model.goto_level(args.level - 1)
+    start = time.perf_counter()
+    save_snapshot(model, args.snapshot_file)
+    saved = time.perf_counter()
+    load_snapshot(args.snapshot_file)
+    loaded = time.perf_counter()
+    print(f'{os.path.getsize(args.snapshot_file)} bytes, '
+          f'saved in {(saved - start) * 1000:.2f} ms, '
+          f'loaded in {(loaded - saved) * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
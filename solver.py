@@ -0,0 +1,697 @@
+import argparse
+import heapq
+import time
+from collections import OrderedDict, deque
+from multiprocessing import Pool
+from typing import Callable, Iterable, Optional, Sequence
+
+from a2_solution import *
+from headless import HeadlessRunner, format_commands
+
+# Objectives which a solution can minimise
+MIN_MOVES = 'moves'
+MIN_DAMAGE = 'damage'
+
+# Effect of each usable item on the player's (HP, hunger, thirst)
+ITEM_EFFECTS = {
+    'Potion': (POTION_AMOUNT, 0, 0),
+    'Apple': (0, APPLE_AMOUNT, 0),
+    'Honey': (0, HONEY_AMOUNT, 0),
+    'Water': (0, 0, WATER_AMOUNT),
+}
+
+_DIRECTIONS = tuple(MOVE_DELTAS.items())
+
+
+def cell_costs(
+    maze: Maze,
+    damage_cost: bool = True,
+    doors_open: bool = False
+) -> list[Optional[int]]:
+    """ Returns the cost of stepping onto each cell of a maze, row by row.
+
+    Parameters:
+        maze: The maze to find the costs for.
+        damage_cost: If True, a step costs the damage it does to the player
+            (1 plus the tile's damage), otherwise every step costs 1.
+        doors_open: If True, doors are treated as walkable.
+
+    Returns:
+        The cost of stepping onto each cell, or None for blocking cells.
+    """
+    costs = {
+        ord(tile_id): 1 + (tile().damage() if damage_cost else 0)
+        for tile_id, tile in Maze.TILES.items() if tile not in (Wall, Door)
+    }
+    costs[ord(DOOR)] = 1 if doors_open else None
+    return [costs.get(code) for code in maze.get_grid()]
+
+
+def distance_field(
+    costs: Sequence[Optional[int]],
+    width: int,
+    targets: Iterable[int]
+) -> list[float]:
+    """ Finds the cheapest cost of reaching any of the targets from every cell.
+
+    Parameters:
+        costs: The cost of stepping onto each cell, None if it is blocking.
+        width: The number of columns in the grid.
+        targets: The cell indices (row * width + column) to reach.
+
+    Returns:
+        For each cell index, the cost of the cheapest path to a target, or
+        infinity if none is reachable.
+    """
+    size = len(costs)
+    distances = [float('inf')] * size
+    queue = [(0, target) for target in targets]
+    for _, target in queue:
+        distances[target] = 0
+    unit = all(cost in (None, 1) for cost in costs)
+    if unit:
+        queue = deque(target for _, target in queue)
+    else:
+        heapq.heapify(queue)
+
+    while queue:
+        if unit:
+            cell = queue.popleft()
+            distance = distances[cell]
+        else:
+            distance, cell = heapq.heappop(queue)
+            if distance > distances[cell]:
+                continue
+        # Paths are searched backwards: the cost is paid on entering cell
+        step = distance + costs[cell] if costs[cell] is not None else None
+        if step is None:
+            continue
+        row, col = divmod(cell, width)
+        for neighbour in (cell - width if row > 0 else -1,
+                          cell + width if cell + width < size else -1,
+                          cell - 1 if col > 0 else -1,
+                          cell + 1 if col < width - 1 else -1):
+            if neighbour >= 0 and costs[neighbour] is not None \
+                    and step < distances[neighbour]:
+                distances[neighbour] = step
+                if unit:
+                    queue.append(neighbour)
+                else:
+                    heapq.heappush(queue, (step, neighbour))
+    return distances
+
+
+class DistanceFieldCache:
+    """ Caches distance fields over the current level, so that paths to the
+        door, the coins or any other cell can be found by walking downhill in
+        time proportional to the path length.
+
+        The fields weight each step by the damage it does to the player, so
+        paths avoid lava where they can. Every field is dropped when the level
+        changes or its doors unlock, and a coin's field is dropped once the
+        coin has been collected.
+    """
+    # Keys of the door and coin fields; fields to other cells are keyed by the
+    # cell's index
+    DOOR = 'door'
+    COIN = 'coin'
+
+    def __init__(self, capacity: int = 16) -> None:
+        """ Sets up an empty cache.
+
+        Parameters:
+            capacity: The maximum number of fields kept for cells which are not
+                coins or doors.
+        """
+        self._capacity = capacity
+        self._maze = None
+        self._unlocked = False
+        self._costs = []
+        self._width = 0
+        self._door_fields = {}  # Maps DOOR or (COIN, cell) to a field
+        self._cell_fields = OrderedDict()  # Maps cell indices to a field
+        self._latency = 0.0
+
+    def _update(self, level: Level) -> None:
+        """ Drops the fields which no longer match the given level. """
+        maze = level.get_maze()
+        if maze is not self._maze or maze.is_unlocked() != self._unlocked:
+            self._maze, self._unlocked = maze, maze.is_unlocked()
+            self._costs = cell_costs(maze, doors_open=self._unlocked)
+            self._width = maze.get_dimensions()[1]
+            self._door_fields.clear()
+            self._cell_fields.clear()
+            return
+
+        items, width = level.get_items(), self._width
+        for key in list(self._door_fields):
+            if key != self.DOOR:
+                item = items.get(divmod(key[1], width))
+                if item is None or item.get_id() != COIN:
+                    del self._door_fields[key]
+
+    def _get_field(self, key, targets: Callable[[], list[int]]) -> list[float]:
+        """ Returns the cached field for key, computing it towards the cells
+            returned by targets on a miss.
+        """
+        fields = self._cell_fields if isinstance(key, int) else self._door_fields
+        field = fields.get(key)
+        if field is None:
+            field = fields[key] = distance_field(self._costs, self._width,
+                                                 targets())
+            if fields is self._cell_fields \
+                    and len(fields) > self._capacity:
+                fields.popitem(last=False)
+        elif fields is self._cell_fields:
+            fields.move_to_end(key)
+        return field
+
+    def _walk(self, field: list[float], cell: int) -> Optional[list[str]]:
+        """ Follows a field downhill from cell to its target.
+
+        Returns:
+            The move keys along the cheapest path, or None if the target cannot
+            be reached from cell.
+        """
+        if field[cell] == float('inf'):
+            return None
+        costs, width, size = self._costs, self._width, len(self._costs)
+        moves = []
+        while field[cell] > 0:
+            row, col = divmod(cell, width)
+            for move, (row_delta, col_delta) in _DIRECTIONS:
+                if not (0 <= row + row_delta and 0 <= col + col_delta < width):
+                    continue
+                neighbour = cell + row_delta * width + col_delta
+                if neighbour < size and costs[neighbour] is not None \
+                        and costs[neighbour] + field[neighbour] == field[cell]:
+                    moves.append(move)
+                    cell = neighbour
+                    break
+        return moves
+
+    def get_path(
+        self,
+        level: Level,
+        position: tuple[int, int],
+        target: tuple[int, int]
+    ) -> Optional[list[str]]:
+        """ Finds the path which does the least damage from position to target.
+
+        Parameters:
+            level: The level the player is in.
+            position: The (row, column) position of the player.
+            target: The (row, column) position to walk to.
+
+        Returns:
+            The move keys along the path, or None if target cannot be reached.
+        """
+        start = time.perf_counter()
+        self._update(level)
+        (row, col), (target_row, target_col) = position, target
+        rows, width = self._maze.get_num_rows(), self._width
+        if not (0 <= row < rows and 0 <= col < width
+                and 0 <= target_row < rows and 0 <= target_col < width):
+            return None
+
+        target_cell = target_row * width + target_col
+        item = level.get_items().get(target)
+        if item is not None and item.get_id() == COIN:
+            key = (self.COIN, target_cell)
+        else:
+            key = target_cell
+        field = self._get_field(key, lambda: [target_cell])
+        moves = self._walk(field, row * width + col)
+        self._latency = time.perf_counter() - start
+        return moves
+
+    def _get_doors(self) -> list[int]:
+        """ Returns the cell indices of the doors in the current maze. """
+        return [row * self._width + col
+                for row, col in self._maze.get_door_positions()]
+
+    def get_hint(self, level: Level, position: tuple[int, int]) -> list[str]:
+        """ Finds the moves towards the nearest remaining coin or, once every
+            coin has been collected, out through the door.
+
+        Parameters:
+            level: The level the player is in.
+            position: The (row, column) position of the player.
+
+        Returns:
+            The move keys to make, which are empty if there is nowhere to go.
+        """
+        start = time.perf_counter()
+        self._update(level)
+        row, col = position
+        rows, width = self._maze.get_num_rows(), self._width
+        if not (0 <= row < rows and 0 <= col < width):
+            return []
+        cell = row * width + col
+
+        coins = [(item_row * width + item_col)
+                 for (item_row, item_col), item in level.get_items().items()
+                 if item.get_id() == COIN]
+        if coins:
+            fields = [self._get_field((self.COIN, coin), lambda: [coin])
+                      for coin in coins]
+        else:
+            fields = [self._get_field(self.DOOR, self._get_doors)]
+        field = min(fields, key=lambda field: field[cell])
+        moves = self._walk(field, cell) or []
+
+        if not coins and field[cell] != float('inf'):
+            # Finish by stepping out of the maze from the door
+            end_row, end_col = row, col
+            for step in moves:
+                end_row += MOVE_DELTAS[step][0]
+                end_col += MOVE_DELTAS[step][1]
+            for move, (row_delta, col_delta) in _DIRECTIONS:
+                if not (0 <= end_row + row_delta < rows
+                        and 0 <= end_col + col_delta < width):
+                    moves.append(move)
+                    break
+        self._latency = time.perf_counter() - start
+        return moves
+
+    def get_last_latency(self) -> float:
+        """ Returns the time taken by the last query, in seconds. """
+        return self._latency
+
+
+def _effective_stats(player: Player) -> tuple[int, int, int]:
+    """ Returns the player's (HP, hunger, thirst) as if every usable item in
+        their inventory had already been applied, without any capping.
+    """
+    hp, hunger, thirst = (player.get_health(), player.get_hunger(),
+                          player.get_thirst())
+    for name, items in player.get_inventory().get_items().items():
+        hp_change, hunger_change, thirst_change = ITEM_EFFECTS.get(name, (0, 0, 0))
+        hp += hp_change * len(items)
+        hunger += hunger_change * len(items)
+        thirst += thirst_change * len(items)
+    return hp, hunger, thirst
+
+
+def _shop_prices(prices: Optional[dict[str, int]]) -> dict[str, int]:
+    """ Maps the names of the usable items which can be bought to their price.
+
+    Parameters:
+        prices: Maps item IDs to their price in coins, or None if there is no
+            shop.
+    """
+    if prices is None:
+        return {}
+    return {item.__name__: prices[item_id]
+            for item_id, item in Level.ENTITIES.items()
+            if item_id in prices and item.__name__ in ITEM_EFFECTS}
+
+
+def _restock(
+    stats: tuple[int, int, int, int],
+    shop: dict[str, int]
+) -> list[tuple[tuple[int, int, int, int], tuple[str, ...]]]:
+    """ Finds the ways of buying just enough items to survive a move.
+
+        A single move costs at most 1 + LAVA_DAMAGE HP and raises hunger and
+        thirst by at most 1, so one item per stat is always enough.
+
+    Parameters:
+        stats: The (HP, hunger, thirst, coins) after the move, with every held
+            item already applied.
+        shop: Maps the names of the items which can be bought to their price.
+
+    Returns:
+        The (stats, names of the items bought) for each way of surviving,
+        which is empty if the move cannot be survived.
+    """
+    hp, hunger, thirst, wallet = stats
+    needed = (['Potion'] if hp <= 0 else []) \
+        + (['Water'] if thirst >= MAX_THIRST else [])
+    foods = [food for food in ('Honey', 'Apple') if food in shop] \
+        if hunger >= MAX_HUNGER else [None]
+
+    options = []
+    for food in foods:
+        purchases = needed + [food] if food else needed
+        if any(name not in shop for name in purchases) \
+                or sum(shop[name] for name in purchases) > wallet:
+            continue
+        new_hp, new_hunger, new_thirst = hp, hunger, thirst
+        for name in purchases:
+            hp_change, hunger_change, thirst_change = ITEM_EFFECTS[name]
+            new_hp += hp_change
+            new_hunger += hunger_change
+            new_thirst += thirst_change
+        new_wallet = wallet - sum(shop[name] for name in purchases)
+        options.append(((new_hp, new_hunger, new_thirst, new_wallet),
+                        tuple(purchases)))
+    return options
+
+
+def _search(
+    level: Level,
+    player: Player,
+    num_moves: int,
+    objective: str,
+    shop: dict[str, int]
+) -> Optional[list[tuple[str, tuple[str, ...]]]]:
+    """ Finds the optimal sequence of moves which exits the level.
+
+        Items are never used or bought early: an item's effect is only needed
+        at the move which would otherwise lose the game, and applying it then
+        never wastes any of it to capping. So the search tracks the player's
+        stats with every held item already applied (see _effective_stats),
+        buys items only when a move cannot otherwise be survived, and
+        _add_item_uses later inserts the uses where they are needed.
+
+        The search is A* over (cell, coins left, items left, move count mod 5,
+        door unlocked), where a state is pruned if an already expanded state
+        with the same key has at least the HP and coins and at most the hunger
+        and thirst.
+
+    Returns:
+        The move keys paired with the names of the items bought just before
+        each move, or None if the level cannot be survived.
+    """
+    maze = level.get_maze()
+    rows, width = maze.get_num_rows(), maze.get_dimensions()[1]
+    grid = maze.get_grid()
+    damage_cost = objective == MIN_DAMAGE
+    damages = cell_costs(maze, doors_open=True)
+    door, wall = ord(DOOR), ord(WALL)
+
+    coins, items = {}, {}
+    for (row, col), item in level.get_items().items():
+        if item.get_id() == COIN:
+            coins[row * width + col] = 1 << len(coins)
+        elif item.get_name() in ITEM_EFFECTS:
+            items[row * width + col] = (1 << len(items),
+                                        ITEM_EFFECTS[item.get_name()])
+    all_coins = (1 << len(coins)) - 1
+
+    # Lower bounds on the remaining cost, from fields with every door open
+    relaxed = cell_costs(maze, damage_cost, doors_open=True)
+    doors = [cell for cell, code in enumerate(grid) if code == door]
+    to_door = distance_field(relaxed, width, doors)
+    to_coin = [(bit, distance_field(relaxed, width, [cell]), to_door[cell])
+               for cell, bit in coins.items()]
+
+    estimates = {}  # The search reaches each (cell, coins left) many times
+
+    def estimate(cell: int, coins_left: int) -> float:
+        best = estimates.get((cell, coins_left))
+        if best is None:
+            best = to_door[cell]
+            for bit, field, coin_to_door in to_coin:
+                if coins_left & bit:
+                    best = max(best, field[cell] + coin_to_door)
+            estimates[(cell, coins_left)] = best
+        return best
+
+    row, col = level.get_player_start()
+    start_cell = row * width + col
+    start = (start_cell, all_coins, (1 << len(items)) - 1, num_moves % 5, False)
+    wallet = player.get_inventory().count('Coin') if shop else 0
+    # Queue entries are (f, -g, tie, g, state, stats, parent entry, step)
+    counter = 0
+    queue = [(estimate(start_cell, all_coins), 0, counter, 0, start,
+              _effective_stats(player) + (wallet,), None, None)]
+    expanded = {}
+
+    while queue:
+        entry = heapq.heappop(queue)
+        _, _, _, cost, state, stats, _, _ = entry
+        cell, coins_left, items_left, phase, unlocked = state
+        hp, hunger, thirst, wallet = stats
+        front = expanded.setdefault(state, [])
+        if any(other[0] >= hp and other[1] <= hunger and other[2] <= thirst
+               and other[3] >= wallet for other in front):
+            continue
+        front.append(stats)
+
+        row, col = divmod(cell, width)
+        for move, (row_delta, col_delta) in _DIRECTIONS:
+            new_row, new_col = row + row_delta, col + col_delta
+            if not (0 <= new_row < rows and 0 <= new_col < width):
+                if grid[cell] == door:
+                    # Stepping out of the maze from a door finishes the level
+                    steps = [(move, ())]
+                    while entry[7] is not None:
+                        steps.append(entry[7])
+                        entry = entry[6]
+                    return steps[::-1]
+                continue
+
+            new_cell = new_row * width + new_col
+            code = grid[new_cell]
+            if code == wall or (code == door and not unlocked):
+                continue
+            new_phase = (phase + 1) % 5
+            tick = new_phase == 0
+            new_stats = (hp - damages[new_cell], hunger + tick, thirst + tick,
+                         wallet)
+            if new_stats[0] > 0 and new_stats[1] < MAX_HUNGER \
+                    and new_stats[2] < MAX_THIRST:
+                options = [(new_stats, ())]
+            else:
+                options = _restock(new_stats, shop)
+
+            # Items picked up by the move can only be used on later moves
+            new_coins, new_items = coins_left, items_left
+            bit = coins.get(new_cell, 0)
+            picked_coin = 1 if shop and coins_left & bit else 0
+            new_coins &= ~bit
+            bit, effect = items.get(new_cell, (0, (0, 0, 0)))
+            if not items_left & bit:
+                effect = (0, 0, 0)
+            new_items &= ~bit
+
+            new_cost = cost + (damages[new_cell] if damage_cost else 1)
+            new_state = (new_cell, new_coins, new_items, new_phase,
+                         unlocked or new_coins == 0)
+            for (new_hp, new_hunger, new_thirst, new_wallet), bought in options:
+                counter += 1
+                heapq.heappush(queue, (
+                    new_cost + estimate(new_cell, new_coins), -new_cost,
+                    counter, new_cost, new_state,
+                    (new_hp + effect[0], new_hunger + effect[1],
+                     new_thirst + effect[2], new_wallet + picked_coin),
+                    entry, (move, bought)
+                ))
+    return None
+
+
+def _add_item_uses(
+    level: Level,
+    player: Player,
+    num_moves: int,
+    steps: list[tuple[str, tuple[str, ...]]]
+) -> list[str]:
+    """ Inserts the item uses and purchases needed to survive a sequence of
+        moves.
+
+    Parameters:
+        level: The level the moves are made in.
+        player: The player at the start of the level.
+        num_moves: The number of moves made before the level started.
+        steps: The moves and purchases found by the search.
+
+    Returns:
+        The move keys, with item use commands (e.g. 'i Honey') and purchases
+        (e.g. 'b Water') added before each move that would otherwise lose the
+        game.
+    """
+    hp, hunger, thirst = (player.get_health(), player.get_hunger(),
+                          player.get_thirst())
+    held = {name: len(items)
+            for name, items in player.get_inventory().get_items().items()
+            if name in ITEM_EFFECTS}
+    items = dict(level.get_items())
+    maze = level.get_maze()
+    rows, cols = level.get_dimensions()
+    position = level.get_player_start()
+    commands = []
+
+    def use(name: str) -> None:
+        nonlocal hp, hunger, thirst
+        held[name] -= 1
+        commands.append(f'i {name}')
+        hp_change, hunger_change, thirst_change = ITEM_EFFECTS[name]
+        hp = min(hp + hp_change, MAX_HEALTH)
+        hunger = max(hunger + hunger_change, 0)
+        thirst = max(thirst + thirst_change, 0)
+
+    for move, bought in steps:
+        row, col = position[0] + MOVE_DELTAS[move][0], \
+            position[1] + MOVE_DELTAS[move][1]
+        if 0 <= row < rows and 0 <= col < cols:
+            num_moves += 1
+            tick = num_moves % 5 == 0
+            cost = 1 + maze.get_tile((row, col)).damage()
+            while hp - cost <= 0 and held.get('Potion'):
+                use('Potion')
+            while tick and hunger + 1 >= MAX_HUNGER \
+                    and (held.get('Honey') or held.get('Apple')):
+                use('Honey' if held.get('Honey') else 'Apple')
+            while tick and thirst + 1 >= MAX_THIRST and held.get('Water'):
+                use('Water')
+            for name in bought:
+                commands.append(f'b {name}')
+                held[name] = held.get(name, 0) + 1
+                use(name)
+            hp, hunger, thirst = hp - cost, hunger + tick, thirst + tick
+            position = (row, col)
+            item = items.pop(position, None)
+            if item is not None and item.get_name() in ITEM_EFFECTS:
+                held[item.get_name()] = held.get(item.get_name(), 0) + 1
+        commands.append(move)
+    return commands
+
+
+def solve_level(
+    level: Level,
+    player: Player,
+    num_moves: int = 0,
+    objective: str = MIN_MOVES,
+    prices: Optional[dict[str, int]] = None
+) -> Optional[list[str]]:
+    """ Finds a winning sequence of commands for a level.
+
+    Parameters:
+        level: The level to solve, with its items and doors as they are at the
+            start of the level.
+        player: The player at the start of the level, whose stats and
+            inventory are used.
+        num_moves: The number of moves made before the level started, which
+            determines when hunger and thirst next rise.
+        objective: MIN_MOVES to minimise the number of moves, or MIN_DAMAGE to
+            minimise the damage taken.
+        prices: Maps item IDs to their price in coins if items can be bought
+            with coins (e.g. ITEM_PRICE), or None if there is no shop.
+
+    Returns:
+        The move keys, item uses and purchases (as accepted by HeadlessRunner)
+        which exit the level, or None if the level cannot be survived.
+    """
+    steps = _search(level, player, num_moves, objective, _shop_prices(prices))
+    if steps is None:
+        return None
+    return _add_item_uses(level, player, num_moves, steps)
+
+
+def solve_game(
+    game_file: str,
+    objective: str = MIN_MOVES,
+    prices: Optional[dict[str, int]] = None
+) -> Optional[list[str]]:
+    """ Finds a winning sequence of commands for every level of a game. The
+        player's stats, inventory and move count carry over from one level to
+        the next, as they do in Model.
+
+    Parameters:
+        game_file: Path to the game file.
+        objective: MIN_MOVES or MIN_DAMAGE, minimised level by level.
+        prices: Maps item IDs to their price in coins if items can be bought,
+            or None if there is no shop.
+
+    Returns:
+        The commands which win the game, or None if a level cannot be solved.
+    """
+    runner = HeadlessRunner(game_file, prices)
+    model = runner.get_model()
+    commands = []
+    while not model.has_won():
+        solution = solve_level(model.get_level(), model.get_player(),
+                               model.get_num_moves(), objective, prices)
+        if solution is None:
+            return None
+        level_num = model.get_level_num()
+        for command in solution:
+            runner.apply(command)
+        if model.has_lost():
+            raise RuntimeError(f'solution for {game_file} loses the game')
+        if model.get_level_num() == level_num:
+            raise RuntimeError(f'solution for level {level_num + 1} of '
+                               f'{game_file} does not finish the level')
+        commands.extend(solution)
+    return commands
+
+
+def _solve_game_file(
+    args: tuple[str, str, Optional[dict[str, int]]]
+) -> tuple[str, Optional[list[str]], float]:
+    """ Solves a game file, returning the file, its solution and the time
+        taken. Used as the worker function for solve_games.
+    """
+    game_file, objective, prices = args
+    start = time.perf_counter()
+    solution = solve_game(game_file, objective, prices)
+    return game_file, solution, time.perf_counter() - start
+
+
+def _solve_in_parallel(
+    game_files: Sequence[str],
+    objective: str,
+    prices: Optional[dict[str, int]],
+    processes: Optional[int]
+) -> list[tuple[str, Optional[list[str]], float]]:
+    """ Solves game files across worker processes, returning the results of
+        _solve_game_file in the same order as the files.
+    """
+    with Pool(processes) as pool:
+        return pool.map(_solve_game_file,
+                        [(game_file, objective, prices)
+                         for game_file in game_files])
+
+
+def solve_games(
+    game_files: Sequence[str],
+    objective: str = MIN_MOVES,
+    prices: Optional[dict[str, int]] = None,
+    processes: Optional[int] = None
+) -> dict[str, Optional[list[str]]]:
+    """ Solves several game files in parallel, one per worker process.
+
+    Parameters:
+        game_files: Paths to the game files to solve.
+        objective: MIN_MOVES or MIN_DAMAGE.
+        prices: Maps item IDs to their price in coins if items can be bought,
+            or None if there is no shop.
+        processes: The number of worker processes (defaults to the number of
+            CPUs).
+
+    Returns:
+        A mapping from each game file to its solution, or None if unsolvable.
+    """
+    results = _solve_in_parallel(game_files, objective, prices, processes)
+    return {game_file: solution for game_file, solution, _ in results}
+
+
+def main() -> None:
+    """ Entry-point for solving game files from the command line. """
+    parser = argparse.ArgumentParser(
+        description='Find winning move sequences for game files.'
+    )
+    parser.add_argument('game_files', nargs='+', help='game files to solve')
+    parser.add_argument('-o', '--objective', choices=(MIN_MOVES, MIN_DAMAGE),
+                        default=MIN_MOVES, help='what to minimise per level')
+    parser.add_argument('--shop', action='store_true',
+                        help='allow items to be bought with coins')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='number of worker processes')
+    args = parser.parse_args()
+
+    prices = ITEM_PRICE if args.shop else None
+    results = _solve_in_parallel(args.game_files, args.objective, prices,
+                                 args.processes)
+    for game_file, solution, elapsed in results:
+        if solution is None:
+            print(f'{game_file}: no solution ({elapsed:.3f}s)')
+        else:
+            print(f'{game_file}: {len(solution)} commands ({elapsed:.3f}s)\n'
+                  f'{format_commands(solution)}\n')
+
+
+if __name__ == '__main__':
+    main()
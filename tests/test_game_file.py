@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from a2_solution import *
+
+tk = pytest.importorskip('tkinter')
+import a3
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+BAD_GAMES = {
+    'no levels': 'not a game\n',
+    'short row': 'Maze 1 - 3 4\n####\n#PD\n####\n',
+    'missing row': 'Maze 1 - 3 4\n####\n#PD#\n',
+    'no player': 'Maze 1 - 3 4\n####\n# D#\n####\n',
+    'bad second level': 'Maze 1 - 3 4\n####\n#PD#\n####\n\nMaze 2 - 3 4\n####\n#  #\n',
+}
+
+
+@pytest.mark.parametrize('game', sorted(os.listdir(GAMES_DIR)))
+def test_games_are_valid(game: str) -> None:
+    assert a3.is_game_valid(os.path.join(GAMES_DIR, game))
+
+
+@pytest.mark.parametrize('name', sorted(BAD_GAMES))
+def test_unplayable_games_are_invalid(name: str, tmp_path) -> None:
+    game_file = tmp_path / 'game.txt'
+    game_file.write_text(BAD_GAMES[name])
+    assert not a3.is_game_valid(str(game_file))
+
+
+def test_validation_parse_is_shared(tmp_path, monkeypatch) -> None:
+    game_file = tmp_path / 'game.txt'
+    game_file.write_text('Maze 1 - 3 4\n####\n#PD#\n####\n')
+    parsed = []
+    parse = LevelIndex._parse_template
+
+    def counted_parse(index: LevelIndex, level_num: int) -> LevelTemplate:
+        parsed.append(level_num)
+        return parse(index, level_num)
+
+    monkeypatch.setattr(LevelIndex, '_parse_template', counted_parse)
+    assert a3.is_game_valid(str(game_file))
+    model = Model(str(game_file))
+    model.restart()
+    assert parsed == [0]
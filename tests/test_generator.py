@@ -0,0 +1,42 @@
+import pytest
+
+from a2_solution import *
+from generator import generate_rows, write_game
+from solver import MIN_MOVES, solve_game
+
+SIZES = [(5, 3), (3, 9), (15, 15), (21, 21), (22, 21), (21, 22), (41, 41)]
+SEEDS = range(10)
+
+
+@pytest.mark.parametrize('dimensions', SIZES, ids=lambda size: f'{size[0]}x{size[1]}')
+def test_rows_have_dimensions(dimensions: tuple[int, int]) -> None:
+    rows = list(generate_rows(dimensions))
+    assert len(rows) == dimensions[0]
+    assert all(len(row) == dimensions[1] for row in rows)
+    text = ''.join(rows)
+    assert text.count(PLAYER) == 1 and text.count(DOOR) == 1
+
+
+@pytest.mark.parametrize('dimensions', [(3, 3), (4, 4), (2, 9)])
+def test_too_small_raises(dimensions: tuple[int, int]) -> None:
+    with pytest.raises(ValueError):
+        list(generate_rows(dimensions))
+
+
+@pytest.mark.parametrize('dimensions', SIZES, ids=lambda size: f'{size[0]}x{size[1]}')
+@pytest.mark.parametrize('prices', [None, ITEM_PRICE], ids=['no_shop', 'shop'])
+def test_levels_can_be_won(
+    tmp_path,
+    dimensions: tuple[int, int],
+    prices: Optional[dict[str, int]]
+) -> None:
+    for seed in SEEDS:
+        game_file = str(tmp_path / f'game{seed}.txt')
+        write_game(game_file, 2, dimensions, seed)
+        assert solve_game(game_file, MIN_MOVES, prices) is not None, seed
+
+
+def test_large_level_can_be_won(tmp_path) -> None:
+    game_file = str(tmp_path / 'game.txt')
+    write_game(game_file, 1, (101, 101))
+    assert solve_game(game_file) is not None
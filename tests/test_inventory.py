@@ -0,0 +1,31 @@
+import pytest
+
+from a2_solution import *
+
+
+def test_spend_removes_exact_stack() -> None:
+    inventory = Inventory([Coin((1, 1)), Coin((2, 2)), Apple((3, 3))])
+    assert inventory.spend(2)
+    assert inventory.count('Coin') == 0
+    assert 'Coin' not in inventory.get_items()
+    assert not inventory.spend(1)
+
+
+def test_spend_nothing_changes_nothing() -> None:
+    inventory = Inventory([Apple((3, 3))])
+    assert inventory.spend(0, 'Water')
+    assert inventory.spend(0, 'Apple')
+    assert str(inventory) == 'Apple: 1'
+
+
+def test_spend_negative_amount_is_rejected() -> None:
+    inventory = Inventory([Coin((1, 1))])
+    with pytest.raises(ValueError):
+        inventory.spend(-1)
+    assert inventory.count('Coin') == 1
+
+
+def test_repr_has_no_shared_positions() -> None:
+    inventory = Inventory([Coin((1, 1)), Coin((2, 2))])
+    assert repr(inventory) == "Inventory(counts={'Coin': 2})"
+    assert repr(inventory.get_items()['Coin']) == "ItemStack('Coin', 2)"
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from a2_solution import *
+from headless import HeadlessRunner, parse_commands
+from journal import CHECKPOINT_FILE, JOURNAL_FILE, Journal, recover
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+# Finishes the first level of game1.txt, then uses an item bought in the shop
+COMMANDS = list(parse_commands(['ddwwddd', 'b Apple', 'i Apple', 'dd', 'b Water', 'ss']))
+
+
+def model_state(model: Model) -> tuple:
+    """ Returns everything about a game which recovery must keep. """
+    return (model.get_level_num(), model.get_num_moves(), model.get_player_stats(),
+            model.get_player().get_position(), str(model.get_player_inventory()),
+            sorted(model.get_current_items()))
+
+
+@pytest.mark.parametrize('interval', [1, 3, 8, 100])
+def test_recover_matches_game(interval: int, tmp_path) -> None:
+    runner = HeadlessRunner(os.path.join(GAMES_DIR, 'game1.txt'), ITEM_PRICE)
+    journal = Journal(str(tmp_path), interval)
+    journal.start(runner.get_model())
+    for command in COMMANDS:
+        runner.apply(command)
+        journal.record(command)
+    # Recover without closing the journal, as after a crash
+    recovered = recover(str(tmp_path), ITEM_PRICE)
+    assert recovered is not None
+    assert model_state(recovered) == model_state(runner.get_model())
+    journal.close()
+
+
+def test_discard_leaves_nothing_to_recover(tmp_path) -> None:
+    journal = Journal(str(tmp_path))
+    journal.start(Model(os.path.join(GAMES_DIR, 'game1.txt')))
+    journal.record('d')
+    journal.discard()
+    assert not os.path.exists(tmp_path / JOURNAL_FILE)
+    assert not os.path.exists(tmp_path / CHECKPOINT_FILE)
+    assert recover(str(tmp_path)) is None
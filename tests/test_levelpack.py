@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from a2_solution import *
+from levelpack import LevelPack, pack_game, unpack_game
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+
+# Rows 1 and 3 start and end with Empty tiles, which a stripping loader loses
+EDGE_GAME = '''Maze 1 - 5 7
+#######
+ P C  D
+## ## #
+ W   C 
+#######
+
+'''
+
+
+def level_state(level: Level) -> tuple:
+    """ Returns everything about a level which a conversion must keep. """
+    maze = level.get_maze()
+    items = {position: item.get_id() for position, item in level.get_items().items()}
+    return (tuple(level.get_dimensions()), bytes(maze.get_grid()),
+            sorted(maze.get_door_positions()), items, level.get_player_start())
+
+
+def game_state(game_file: str) -> list[tuple]:
+    """ Returns the state of every level in a game file, in either format. """
+    levels = load_levels(game_file)
+    return [level_state(levels.load_level(level_num)) for level_num in range(len(levels))]
+
+
+@pytest.fixture
+def edge_game(tmp_path) -> str:
+    game_file = tmp_path / 'edge.txt'
+    game_file.write_text(EDGE_GAME)
+    return str(game_file)
+
+
+def test_text_loader_keeps_edge_empty_tiles(edge_game: str) -> None:
+    level = load_levels(edge_game).load_level(0)
+    assert level.get_player_start() == (1, 1)
+    assert level.get_items()[(1, 3)].get_id() == COIN
+    assert level.get_items()[(3, 1)].get_id() == WATER
+    assert level.get_items()[(3, 5)].get_id() == COIN
+    assert isinstance(level.get_maze().get_tile((1, 6)), Door)
+    assert [level_state(level) for level in load_game(edge_game)] == game_state(edge_game)
+
+
+@pytest.mark.parametrize('game', sorted(os.listdir(GAMES_DIR)) + ['edge'])
+def test_round_trip(game: str, edge_game: str, tmp_path) -> None:
+    game_file = edge_game if game == 'edge' else os.path.join(GAMES_DIR, game)
+    pack_file, text_file = str(tmp_path / 'game.pack'), str(tmp_path / 'game.txt')
+    pack_game(game_file, pack_file)
+    unpack_game(pack_file, text_file)
+    assert game_state(pack_file) == game_state(game_file)
+    assert game_state(text_file) == game_state(game_file)
+
+
+def test_repack_over_open_pack(edge_game: str, tmp_path) -> None:
+    pack_file = str(tmp_path / 'game.pack')
+    pack_game(edge_game, pack_file)
+    pack = LevelPack(pack_file)
+    level = pack.load_level(0)
+    pack_game(os.path.join(GAMES_DIR, 'game1.txt'), pack_file)
+    # The open pack still maps the file it was opened with
+    assert level_state(level) == game_state(edge_game)[0]
+    assert len(LevelPack(pack_file)) == 2
+    del level
+    pack.close()
+
+
+def test_pack_sets_up_index_attributes(edge_game: str, tmp_path) -> None:
+    pack_file = str(tmp_path / 'game.pack')
+    pack_game(edge_game, pack_file)
+    pack = LevelPack(pack_file)
+    assert pack.get_filename() == pack_file
+    assert len(pack) == 1
+    assert pack.get_dimensions(0) == (5, 7)
+    pack.close()
+
+
+def test_wrong_row_length_is_rejected(tmp_path) -> None:
+    game_file = tmp_path / 'bad.txt'
+    game_file.write_text('Maze 1 - 3 3\n###\n#P\n###\n')
+    with pytest.raises(ValueError):
+        load_levels(str(game_file)).load_level(0)
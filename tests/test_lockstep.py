@@ -0,0 +1,87 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from a2_solution import *
+from lockstep import DIRECTIONS, LockstepEngine, check_conformance
+from solver import MIN_MOVES, solve_level
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+GAME_FILES = sorted(glob.glob(os.path.join(GAMES_DIR, '*.txt')))
+LEVELS = [(game_file, level_num) for game_file in GAME_FILES
+          for level_num in range(len(load_levels(game_file)))]
+SEEDS = (0, 1, 2)
+
+
+def level_id(level: tuple[str, int]) -> str:
+    """ Returns a readable test ID for a (game file, level index) pair. """
+    game_file, level_num = level
+    return f'{os.path.basename(game_file)}:{level_num + 1}'
+
+
+def solution_directions(game_file: str, level_num: int) -> np.ndarray:
+    """ Returns a winning route through a level from a fresh player as a
+        (#steps, 1) array of direction indices, skipping the test if the
+        level cannot be won by moves alone.
+    """
+    level = load_levels(game_file).load_level(level_num)
+    solution = solve_level(level, Player(level.get_player_start()), 0, MIN_MOVES)
+    if solution is None or any(command not in MOVE_DELTAS for command in solution):
+        pytest.skip('level cannot be won from a fresh player by moves alone')
+    directions = [DIRECTIONS.index(command) for command in solution]
+    return np.array(directions).reshape(-1, 1)
+
+
+@pytest.mark.parametrize('level', LEVELS, ids=level_id)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_random_walks_match_model(level: tuple[str, int], seed: int) -> None:
+    game_file, level_num = level
+    assert check_conformance(game_file, seed=seed, level_num=level_num) == []
+
+
+@pytest.mark.parametrize('level', LEVELS, ids=level_id)
+def test_solutions_match_model(level: tuple[str, int]) -> None:
+    game_file, level_num = level
+    directions = solution_directions(game_file, level_num)
+    engine = LockstepEngine(load_levels(game_file).load_level(level_num), 1)
+    engine.run(directions)
+    assert engine.get_exited().all()
+    assert check_conformance(game_file, level_num=level_num, directions=directions) == []
+
+
+def test_skipped_moves_match_model() -> None:
+    game_file = os.path.join(GAMES_DIR, 'game2.txt')
+    rng = np.random.default_rng(0)
+    directions = rng.integers(-1, len(DIRECTIONS), size=(500, 64))
+    assert check_conformance(game_file, directions=directions) == []
+
+
+def test_rules_are_exercised() -> None:
+    """ The random walks and solutions must reach the rules under test, or
+        matching the model would prove little.
+    """
+    ticked = burnt = exited = False
+    for game_file, level_num in LEVELS:
+        level = load_levels(game_file).load_level(level_num)
+        for seed in SEEDS:
+            rng = np.random.default_rng(seed)
+            directions = rng.integers(0, len(DIRECTIONS), size=(500, 64))
+            engine = LockstepEngine(level, 64)
+            engine.run(directions)
+            hp, hunger, _ = engine.get_player_stats().T
+            alive = hp > 0
+            ticked |= bool((hunger > 0).any())
+            # Every move costs 1 HP, so any more lost came from lava
+            burnt |= bool((alive & (MAX_HEALTH - hp > engine.get_num_moves())).any())
+            exited |= bool(engine.get_exited().any())
+    for game_file, level_num in LEVELS:
+        try:
+            directions = solution_directions(game_file, level_num)
+        except pytest.skip.Exception:
+            continue
+        engine = LockstepEngine(load_levels(game_file).load_level(level_num), 1)
+        engine.run(directions)
+        exited |= bool(engine.get_exited().all())
+    assert ticked and burnt and exited
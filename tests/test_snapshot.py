@@ -0,0 +1,55 @@
+import os
+import shutil
+
+import pytest
+
+from a2_solution import *
+from headless import HeadlessRunner
+from snapshot import load_snapshot, save_snapshot
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+# Finishes the first level of game1.txt, collecting its 3 coins
+LEVEL_ONE = 'ddwwddd'
+
+
+@pytest.fixture
+def runner(tmp_path) -> HeadlessRunner:
+    game_file = tmp_path / 'game1.txt'
+    shutil.copy(os.path.join(GAMES_DIR, 'game1.txt'), game_file)
+    runner = HeadlessRunner(str(game_file))
+    for command in LEVEL_ONE:
+        runner.apply(command)
+    assert runner.get_model().get_level_num() == 1
+    runner.apply('d')
+    return runner
+
+
+def model_state(model: Model) -> tuple:
+    """ Returns everything about a game which a snapshot must keep. """
+    return (model.get_level_num(), model.get_num_moves(), model.get_player_stats(),
+            model.get_player().get_position(), str(model.get_player_inventory()),
+            sorted(model.get_current_items()), model.get_current_maze().is_unlocked())
+
+
+def test_round_trip(runner: HeadlessRunner, tmp_path) -> None:
+    model = runner.get_model()
+    save_snapshot(model, str(tmp_path / 'game.sav'))
+    assert model_state(load_snapshot(str(tmp_path / 'game.sav'))) == model_state(model)
+
+
+def test_restart_after_load_keeps_start_inventory(runner: HeadlessRunner, tmp_path) -> None:
+    model = runner.get_model()
+    save_snapshot(model, str(tmp_path / 'game.sav'))
+    loaded = load_snapshot(str(tmp_path / 'game.sav'))
+    model.restart()
+    loaded.restart()
+    assert str(loaded.get_player_inventory()) == 'Coin: 3'
+    assert model_state(loaded) == model_state(model)
+
+
+def test_edited_game_file_is_rejected(runner: HeadlessRunner, tmp_path) -> None:
+    save_snapshot(runner.get_model(), str(tmp_path / 'game.sav'))
+    with open(tmp_path / 'game1.txt', 'a') as file:
+        file.write('\n')
+    with pytest.raises(ValueError):
+        load_snapshot(str(tmp_path / 'game.sav'))
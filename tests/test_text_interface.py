@@ -0,0 +1,109 @@
+import io
+import os
+import random
+import re
+
+import pytest
+
+from a2_solution import *
+from a2_support import TextInterface
+from headless import HeadlessRunner
+from solver import solve_game
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+CONTROL = re.compile(r'\x1b\[(?:(\d+);(\d+))?([HJK])|\x1b\[2J|\n|[^\x1b\n]')
+
+
+class Terminal(io.StringIO):
+    """ A stand-in terminal which applies the output's cursor movement to a
+        grid of characters.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.screen = {}
+        self.row = self.col = 0
+        self.written = []
+
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.written.append(text)
+        for match in CONTROL.finditer(text):
+            token = match.group(0)
+            if token == '\x1b[2J':
+                self.screen.clear()
+            elif token == '\n':
+                self.row, self.col = self.row + 1, 0
+            elif match.group(3) == 'H':
+                self.row = int(match.group(1) or 1) - 1
+                self.col = int(match.group(2) or 1) - 1
+            elif match.group(3) == 'K':
+                for position in [p for p in self.screen if p[0] == self.row and p[1] >= self.col]:
+                    del self.screen[position]
+            elif match.group(3) == 'J':
+                for position in [p for p in self.screen if p >= (self.row, self.col)]:
+                    del self.screen[position]
+            else:
+                self.screen[(self.row, self.col)] = token
+                self.col += 1
+        return len(text)
+
+    def get_lines(self) -> list[str]:
+        num_rows = max(row for row, _ in self.screen) + 1
+        return [''.join(self.screen.get((row, col), ' ')
+                        for col in range(max([c + 1 for r, c in self.screen if r == row], default=0)))
+                for row in range(num_rows)]
+
+
+def full_frame(model: Model) -> list[str]:
+    """ Returns the lines the text interface prints for a model without a terminal. """
+    output = io.StringIO()
+    interface = TextInterface(output)
+    interface.draw(model.get_current_maze(), model.get_current_items(),
+                   model.get_player().get_position(), model.get_player_inventory(),
+                   model.get_player_stats())
+    return output.getvalue().splitlines()
+
+
+@pytest.mark.parametrize('game', sorted(os.listdir(GAMES_DIR)))
+def test_terminal_matches_full_frames(game: str, monkeypatch) -> None:
+    monkeypatch.setattr('shutil.get_terminal_size', lambda: os.terminal_size((200, 200)))
+    rng = random.Random(0)
+    model = Model(os.path.join(GAMES_DIR, game))
+    terminal = Terminal()
+    interface = TextInterface(terminal)
+    for _ in range(300):
+        interface.draw(model.get_current_maze(), model.get_current_items(),
+                       model.get_player().get_position(), model.get_player_inventory(),
+                       model.get_player_stats())
+        assert [line.rstrip() for line in terminal.get_lines()] \
+            == [line.rstrip() for line in full_frame(model)]
+        if model.has_won() or model.has_lost():
+            break
+        model.move_player(MOVE_DELTAS[rng.choice(list(MOVE_DELTAS))])
+
+
+@pytest.mark.parametrize('game', ['game1.txt', 'game3.txt', 'masters2.txt'])
+def test_terminal_matches_full_frames_through_levels(game: str, monkeypatch) -> None:
+    monkeypatch.setattr('shutil.get_terminal_size', lambda: os.terminal_size((200, 200)))
+    game_file = os.path.join(GAMES_DIR, game)
+    runner = HeadlessRunner(game_file, ITEM_PRICE)
+    model = runner.get_model()
+    terminal = Terminal()
+    interface = TextInterface(terminal)
+    num_clears = 0
+    for command in solve_game(game_file, prices=ITEM_PRICE):
+        runner.apply(command)
+        if model.has_won():
+            break
+        terminal.written.clear()
+        interface.draw(model.get_current_maze(), model.get_current_items(),
+                       model.get_player().get_position(), model.get_player_inventory(),
+                       model.get_player_stats())
+        num_clears += '\x1b[2J' in ''.join(terminal.written)
+        assert [line.rstrip() for line in terminal.get_lines()] \
+            == [line.rstrip() for line in full_frame(model)]
+    # The screen is only cleared when a level starts
+    assert num_clears == len(model.get_levels())